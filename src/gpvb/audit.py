@@ -5,51 +5,113 @@ import logging
 import re
 import time
 from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 from urllib import robotparser
 
-from gpvb.crawl.canonicalize import canonicalize_url
-from gpvb.crawl.sitemap import expand_sitemaps, extract_links
+from gpvb.crawl.canonicalize import URLNormalizer
+from gpvb.crawl.patterns import PatternSampler, estimate_patterns
+from gpvb.crawl.resolve import ResolvedURL, resolve_url, resolved_from_response
+from gpvb.crawl.frontier import CostModel, PriorityFrontier
+from gpvb.crawl.sitemap import expand_sitemap_entries, extract_links
+from gpvb.crawl.soft404 import PROBE_PREFIX, content_key, not_found_reason, probe_not_found
 from gpvb.detect.ads_txt import fetch_ads_txt
 from gpvb.detect.detectors import (
     detect_ads_txt,
     detect_privacy_policy,
     detect_replicated_content,
-    merge_page_findings,
 )
-from gpvb.detect.program_policy import (
-    apply_autogenerated_findings,
-    build_context,
-    calculate_account_risk_score,
-    run_program_policy_detectors,
+from gpvb.detect.catalog import DetectorCatalog
+from gpvb.detect.fragments import default_fragment_cache
+from gpvb.detect.program_policy import apply_autogenerated_findings, calculate_account_risk_score
+from gpvb.detect.program_policy.risk import RiskTracker, StopCondition
+from gpvb.detect.registry import (
+    DetectionInputs,
+    DetectorRegistry,
+    DetectorSpec,
+    default_catalog,
+    default_registry,
+    run_detectors_by_id,
 )
-from gpvb.detect.text import extract_visible_text
-from gpvb.models import AdElement, CrawlConfig, DuplicateCluster, FindingsReport, PageResult
-from gpvb.render.browser import BrowserPool
+from gpvb.detect.text import extract_text
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import (
+    AdElement,
+    CrawlConfig,
+    DuplicateCluster,
+    Finding,
+    FindingsReport,
+    PageResult,
+    UrlAlias,
+)
+from gpvb.render.adstub import AdStubber
+from gpvb.render.archive import NetworkArchive
+from gpvb.render.assets import AssetCache
+from gpvb.render.browser import BrowserCrashedError, BrowserPool, RenderError
+from gpvb.render.concurrency import AdaptiveLimiter, outcome_for_error, outcome_for_status
+from gpvb.render.static import fetch_static
+from gpvb.report.aggregate import collapse_template_findings
 from gpvb.report.writer import write_html, write_json
+from gpvb.snapshots import SNAPSHOT_FILE, PageSnapshot, SnapshotStore, new_run
 from gpvb.storage import Storage
 
 
-async def audit_site(config: CrawlConfig) -> FindingsReport:
+# Share of --time-budget (capped) kept back for the post-crawl checks and writing the report.
+REPORT_RESERVE_SHARE = 0.05
+REPORT_RESERVE_S = 30.0
+
+
+async def audit_site(
+    config: CrawlConfig, metrics: Optional[MetricsRecorder] = None
+) -> FindingsReport:
     logger = logging.getLogger("gpvb")
+    worker_count = _worker_count(config)
+    metrics = metrics or MetricsRecorder(workers=worker_count)
     out_dir = Path(config.out_dir)
     pages_dir = out_dir / "pages"
     pages_dir.mkdir(parents=True, exist_ok=True)
 
     logger.info("Starting audit for %s", config.site)
-    client = httpx.AsyncClient(headers={"User-Agent": config.user_agent}, timeout=20)
+    deadline = _crawl_deadline(config.time_budget_s)
+    archive = None
+    if config.replay_dir:
+        archive = NetworkArchive.replay(Path(config.replay_dir))
+    elif config.record_har_dir:
+        archive = NetworkArchive.record(Path(config.record_har_dir))
+    client_options = {"transport": archive.transport()} if archive is not None else {}
+    client = httpx.AsyncClient(
+        headers={"User-Agent": config.user_agent}, timeout=20, **client_options
+    )
     robots = await _load_robots(client, config.site, config.respect_robots)
-
-    site_host = urlparse(config.site).netloc.lower()
-    sitemap_urls = [
-        url for url in await expand_sitemaps(client, config.site) if _is_same_domain(url, site_host)
+    not_found = None
+    if config.soft_404:
+        # A fixed probe URL when archiving, so a replay finds the recorded response.
+        token = f"{PROBE_PREFIX}archived" if archive is not None else None
+        not_found = await probe_not_found(client, config.site, token)
+
+    fragment_cache = default_fragment_cache()
+    fragment_counts = fragment_cache.counts()
+    normalizer = URLNormalizer.from_dict(
+        config.url_rules, drop_query=config.ignore_querystrings
+    )
+    normalize = normalizer.normalize
+    site_host = urlparse(normalize(config.site)).netloc.lower()
+    sitemap_entries = [
+        entry
+        for entry in await expand_sitemap_entries(client, config.site)
+        if _is_same_domain(normalize(entry.url), site_host)
     ]
-    queue: asyncio.Queue[Tuple[str, int]] = asyncio.Queue()
+    sitemap_urls = [entry.url for entry in sitemap_entries]
+    # With a time budget the most important URLs are crawled first; otherwise plain FIFO.
+    frontier = PriorityFrontier(sitemap_entries, key=normalize) if deadline else None
+    queue: asyncio.Queue[Tuple[str, int]] = frontier or asyncio.Queue()
+    costs = CostModel()
     if sitemap_urls:
         logger.info("Discovered %s sitemap URLs", len(sitemap_urls))
         for url in sitemap_urls:
@@ -58,177 +120,637 @@ async def audit_site(config: CrawlConfig) -> FindingsReport:
         logger.info("No sitemap found; starting BFS crawl from homepage")
         await queue.put((config.site, 0))
 
+    sampler = PatternSampler(config.sample_per_pattern) if config.sample_per_pattern > 0 else None
     include_pattern = re.compile(config.include_regex) if config.include_regex else None
     exclude_pattern = re.compile(config.exclude_regex) if config.exclude_regex else None
 
     seen: Set[str] = set()
+    # URLs the time budget left unvisited, or cut off mid-flight.
+    unvisited: Set[str] = set()
+    cut_off: Set[str] = set()
     pages: List[PageResult] = []
     last_request: Dict[str, float] = defaultdict(float)
     privacy_found = False
     lock = asyncio.Lock()
+    # Replayed responses come from disk, so there is no host to be polite to.
+    rate_limit_ms = 0 if config.replay_dir else config.rate_limit_ms
+
+    stop_condition = StopCondition.parse(config.stop_when) if config.stop_when else None
+    risk = RiskTracker()
+    stop_reason: Optional[str] = None
+    # Per-URL jobs, tracked so a met stop condition can cancel the ones still running.
+    in_flight: Set[asyncio.Task] = set()
+    cancelled: Set[str] = set()
+    dropped: Set[str] = set()
+
+    render_attempts: Dict[str, int] = defaultdict(int)
+    # Resolved URLs already claimed for rendering, so aliases of one page render it once.
+    targets: Set[str] = set()
+    aliases: List[UrlAlias] = []
+    snapshots: Dict[str, PageSnapshot] = {}
+    # First page rendered with each content key, and its findings by detector, so byte-identical
+    # copies at other URLs reuse them instead of running extraction and detectors again.
+    identical: Dict[Tuple[str, int, bytes], Tuple[PageResult, Dict[str, List[Finding]]]] = {}
 
     desktop_viewport = {"width": 1366, "height": 768}
-    async with BrowserPool(config.concurrency, config.user_agent) as pool:
-        async def worker() -> None:
-            nonlocal privacy_found
-            while True:
-                item = await queue.get()
-                if item is None:
-                    queue.task_done()
-                    break
-                url, depth = item
-                canonical = canonicalize_url(url, config.ignore_querystrings)
-                logger.info("Processing %s (depth %s)", canonical, depth)
-
-                if not _is_same_domain(canonical, site_host):
-                    logger.info("Skipping external URL %s", canonical)
-                    queue.task_done()
-                    continue
-
+    registry = default_registry()
+    detector_specs = select_detectors(config, registry)
+    static_specs = [spec for spec in detector_specs if not spec.needs_render]
+    limiter = None
+    if config.adaptive_concurrency:
+        limiter = AdaptiveLimiter(
+            config.concurrency, config.min_concurrency, worker_count, metrics=metrics
+        )
+    # The archive answers every request itself, so an asset cache would never be consulted.
+    asset_cache = None
+    if config.asset_cache_mb > 0 and archive is None:
+        asset_cache = AssetCache(config.asset_cache_mb * 1024 * 1024, config.asset_cache_dir)
+    ad_stubs = AdStubber() if config.stub_ads else None
+    async with BrowserPool(
+        worker_count,
+        config.user_agent,
+        browsers=config.browsers,
+        recycle_after_pages=config.recycle_after_pages,
+        recycle_rss_mb=config.recycle_rss_mb,
+        metrics=metrics,
+        asset_cache=asset_cache,
+        archive=archive,
+        ad_stubs=ad_stubs,
+    ) as pool:
+        def allowed(url: str) -> bool:
+            """Whether the include/exclude patterns and robots.txt let ``url`` be audited."""
+            if include_pattern and not include_pattern.search(url):
+                return False
+            if exclude_pattern and exclude_pattern.search(url):
+                return False
+            return not (robots and not robots.can_fetch(config.user_agent, url))
+
+        async def process(url: str, depth: int) -> None:
+            canonical = normalize(url)
+            logger.info("Processing %s (depth %s)", canonical, depth)
+
+            if not _is_same_domain(canonical, site_host):
+                logger.info("Skipping external URL %s", canonical)
+                return
+
+            async with lock:
+                if canonical in seen or len(pages) >= config.max_pages:
+                    return
+                seen.add(canonical)
+
+            if not allowed(canonical):
+                return
+
+            pattern = None
+            if sampler is not None:
                 async with lock:
-                    if canonical in seen or len(pages) >= config.max_pages:
-                        queue.task_done()
-                        continue
-                    seen.add(canonical)
-
-                if include_pattern and not include_pattern.search(canonical):
-                    queue.task_done()
-                    continue
-                if exclude_pattern and exclude_pattern.search(canonical):
-                    queue.task_done()
-                    continue
-                if robots and not robots.can_fetch(config.user_agent, canonical):
-                    queue.task_done()
-                    continue
-
-                await _rate_limit(canonical, last_request, config.rate_limit_ms, lock)
-
-                slug = _slugify(canonical)
-                screenshot_path = pages_dir / slug / "screenshot.png"
-                screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-
-                final_url, status, html, text, network, ad_elements, extras = await pool.render_page(
-                    canonical,
-                    viewport=desktop_viewport,
-                    screenshot_path=str(screenshot_path),
-                )
-                logger.info("Rendered %s -> %s (%s)", canonical, final_url, status)
-                text = extract_visible_text(html)
+                    pattern, admitted = sampler.admit(canonical)
+                if not admitted:
+                    metrics.incr("pattern_sampled_out")
+                    return
+
+            started = time.perf_counter()
+            with metrics.span("page_total", canonical):
+                await handle(url, depth, canonical, pattern)
+            costs.observe(canonical, time.perf_counter() - started)
+
+        async def process_within_budget(url: str, depth: int) -> None:
+            """Process ``url`` if its expected cost fits before the deadline, cut it off at it."""
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or costs.expected(url) > remaining:
+                canonical = normalize(url)
+                async with lock:
+                    if canonical not in seen:
+                        unvisited.add(canonical)
+                return
+            try:
+                await asyncio.wait_for(process(url, depth), remaining)
+            except asyncio.TimeoutError:
+                logger.warning("Time budget ran out while processing %s", url)
+                async with lock:
+                    cut_off.add(normalize(url))
+
+        async def run_job(url: str, depth: int) -> None:
+            """Process ``url`` as its own task, which ``check_stop`` may cancel."""
+            work = process(url, depth) if deadline is None else process_within_budget(url, depth)
+            job = asyncio.create_task(work)
+            in_flight.add(job)
+            try:
+                await job
+            except asyncio.CancelledError:
+                # Only swallow our own cancellation, not that of the worker awaiting the job.
+                if not job.cancelled() or stop_reason is None:
+                    raise
+                cancelled.add(normalize(url))
+            finally:
+                in_flight.discard(job)
+
+        def check_stop(page: PageResult) -> None:
+            """Fold ``page`` into the running risk and stop the crawl once the condition is met."""
+            nonlocal stop_reason
+            if stop_condition is None or stop_reason is not None:
+                return
+            risk.add(page.findings)
+            stop_reason = stop_condition.reason(risk)
+            if stop_reason is None:
+                return
+            current = asyncio.current_task()
+            running = [job for job in in_flight if job is not current]
+            logger.warning(
+                "Stop condition %s met after %s pages (risk score %s); cancelling %s in flight",
+                stop_reason,
+                len(pages),
+                risk.score,
+                len(running),
+            )
+            metrics.event(
+                "early_termination",
+                reason=stop_reason,
+                pages=len(pages),
+                score=risk.score,
+                in_flight=len(running),
+            )
+            for job in running:
+                job.cancel()
+
+        async def render_in_browser(url: str, depth: int, canonical: str) -> Optional[
+            Tuple[Tuple[Any, ...], Dict[str, bool], str]
+        ]:
+            """Render with Chromium; None means the page was re-queued or recorded as failed."""
+            slug = _slugify(canonical)
+            screenshot_path = pages_dir / slug / "screenshot.png"
+            screenshot_path.parent.mkdir(parents=True, exist_ok=True)
+
+            try:
+                async with limiter.slot() if limiter else nullcontext():
+                    # Timed inside the slot: waiting for one is not render latency.
+                    started = time.perf_counter()
+                    with metrics.span("render", canonical):
+                        rendered = await pool.render_page(
+                            url,
+                            viewport=desktop_viewport,
+                            screenshot_path=str(screenshot_path),
+                        )
+            except BrowserCrashedError as exc:
+                await observe_render(started, "error")
+                render_attempts[canonical] += 1
+                if render_attempts[canonical] <= config.max_render_retries:
+                    logger.warning("Browser crashed while rendering %s; re-queueing", canonical)
+                    async with lock:
+                        seen.discard(canonical)
+                        targets.discard(canonical)
+                    await queue.put((url, depth))
+                    metrics.incr("render_requeues")
+                    return None
+                metrics.incr("render_failures")
+                await _record_render_failure(canonical, exc.reason, pages, lock)
+                return None
+            except RenderError as exc:
+                await observe_render(started, outcome_for_error(exc.reason))
+                logger.warning("Render failed for %s: %s", canonical, exc.reason)
+                metrics.incr("render_failures")
+                await _record_render_failure(canonical, exc.reason, pages, lock)
+                return None
+            await observe_render(started, outcome_for_status(rendered[1]))
+            logger.info("Rendered %s -> %s (%s)", canonical, rendered[0], rendered[1])
+            metrics.incr("pages_rendered")
+            try:
+                with metrics.span("mobile_render", canonical):
+                    mobile_flags = await pool.collect_mobile_flags(
+                        url,
+                        viewport={"width": 390, "height": 844},
+                    )
+            except RenderError as exc:
+                logger.warning("Mobile pass failed for %s: %s", canonical, exc.reason)
+                mobile_flags = {}
+            return rendered, mobile_flags, str(screenshot_path.relative_to(out_dir))
+
+        async def observe_render(started: float, outcome: str) -> None:
+            if limiter is not None:
+                await limiter.observe(time.perf_counter() - started, outcome)
+
+        async def claim_target(canonical: str, resolved: ResolvedURL) -> Optional[str]:
+            """The URL to audit for ``canonical``, or None when there is nothing left to render.
+
+            A URL that redirects to, or declares as canonical, another page on the site is
+            recorded as an alias and that page is audited once, under its own URL. The target
+            must pass the same filters and page limit as a crawled URL; otherwise only the alias
+            is recorded.
+            """
+            if not resolved.is_html:
+                metrics.incr("resolve_non_html")
                 page = PageResult(
                     url=canonical,
-                    final_url=final_url,
-                    status=status,
-                    html=html,
-                    text=text,
-                    screenshot_path=str(screenshot_path.relative_to(out_dir)),
-                    network_summary=network,
-                    ad_elements=ad_elements,
+                    final_url=resolved.final_url,
+                    status=resolved.status,
+                    html="",
+                    text="",
+                    skipped_reason=f"non_html: {resolved.content_type.split(';')[0]}",
                 )
-                if extras.get("has_google_ad_client"):
-                    page.ad_elements.append(
-                        AdElement(
-                            selector="google_ad_client_script",
-                            x=0,
-                            y=0,
-                            width=0,
-                            height=0,
+                async with lock:
+                    pages.append(page)
+                return None
+            target = resolved.target(normalize)
+            if not _is_same_domain(target, site_host):
+                target = canonical
+            admitted = target == canonical or allowed(target)
+            async with lock:
+                claimed = target in targets
+                if target != canonical:
+                    aliases.append(UrlAlias(canonical, target, resolved.alias_reason(normalize)))
+                    if not claimed and len(pages) >= config.max_pages:
+                        admitted = False
+                if admitted:
+                    targets.add(target)
+                    seen.add(target)
+            if not admitted:
+                metrics.incr("resolve_targets_filtered")
+                logger.info("%s resolves to %s, which is not audited", canonical, target)
+                return None
+            if target != canonical:
+                metrics.incr("resolve_aliases")
+                logger.info("%s resolves to %s", canonical, target)
+            return None if claimed else target
+
+        async def handle(
+            url: str, depth: int, canonical: str, pattern: Optional[str] = None
+        ) -> None:
+            nonlocal privacy_found
+            with metrics.span("rate_limit", canonical):
+                await _rate_limit(canonical, last_request, rate_limit_ms, lock)
+
+            rendered = None
+            tier = "browser"
+            mobile_flags: Dict[str, bool] = {}
+            screenshot: Optional[str] = None
+            fetched = None
+            resolved: Optional[ResolvedURL] = None
+            if config.render_mode == "tiered":
+                with metrics.span("static_fetch", canonical):
+                    fetched = await fetch_static(client, url)
+                if config.pre_resolve:
+                    resolved = resolved_from_response(
+                        url, fetched.final_url, fetched.status, fetched.headers, fetched.html
+                    )
+                    if fetched.escalation_reason == "fetch_error":
+                        resolved.error = "fetch_error"
+            elif config.pre_resolve:
+                with metrics.span("resolve", canonical):
+                    resolved = await resolve_url(client, url)
+            if resolved is not None:
+                target = await claim_target(canonical, resolved)
+                if target is None:
+                    return
+                if target != canonical:
+                    url, canonical = resolved.site_canonical or resolved.final_url, target
+                    if fetched is not None and target != normalize(fetched.final_url):
+                        with metrics.span("static_fetch", canonical):
+                            fetched = await fetch_static(client, url)
+
+            if fetched is not None:
+                if fetched.escalation_reason is None:
+                    rendered = fetched.as_rendered()
+                    tier = "static"
+                    metrics.incr("pages_static")
+                else:
+                    metrics.incr("pages_escalated")
+                    metrics.incr(f"escalated_{fetched.escalation_reason}")
+
+            if rendered is None:
+                browser_result = await render_in_browser(url, depth, canonical)
+                if browser_result is None:
+                    return
+                rendered, mobile_flags, screenshot = browser_result
+            final_url, status, html, text, network, ad_elements, extras = rendered
+            main_text = extras.pop("main_text", "")
+            render_stats = extras.pop("render_stats", {})
+            key = (tier, status, content_key(html, text, (canonical, final_url)))
+            original, original_findings = identical.get(key, (None, {}))
+            skipped_reason = None
+            if original is not None:
+                metrics.incr("exact_duplicates")
+                text = original.text
+                skipped_reason = original.skipped_reason
+            else:
+                skipped_reason = not_found_reason(status, html, not_found)
+                if skipped_reason:
+                    metrics.incr("not_found_skipped")
+                    text = ""
+                else:
+                    with metrics.span("extract_text", canonical):
+                        text = extract_text(
+                            html, config.text_mode, inner_text=text, main_text=main_text
                         )
+            page = PageResult(
+                url=canonical,
+                final_url=final_url,
+                status=status,
+                html=html,
+                text=text,
+                screenshot_path=screenshot,
+                network_summary=network,
+                render_stats=render_stats,
+                ad_elements=ad_elements,
+                render_tier=tier,
+                url_pattern=pattern,
+                skipped_reason=skipped_reason,
+                duplicate_of=original.url if original is not None else None,
+            )
+            if extras.get("has_google_ad_client"):
+                page.ad_elements.append(
+                    AdElement(
+                        selector="google_ad_client_script",
+                        x=0,
+                        y=0,
+                        width=0,
+                        height=0,
                     )
-
-                noindex_header = _has_noindex_header(extras.get("headers", {}))
-                if extras.get("has_noindex_meta") or noindex_header:
-                    page.skipped_reason = "noindex"
-
-                overlays = extras.get("overlays", [])
-                mobile_flags = await pool.collect_mobile_flags(
-                    canonical,
-                    viewport={"width": 390, "height": 844},
                 )
 
-                if not page.skipped_reason:
-                    merge_page_findings(page, overlays, mobile_flags)
-                    if config.enable_program_policy_checks:
-                        context = build_context(extras, desktop_viewport)
-                        page.findings.extend(run_program_policy_detectors(page, context))
+            noindex_header = _has_noindex_header(extras.get("headers", {}))
+            if not page.skipped_reason and (extras.get("has_noindex_meta") or noindex_header):
+                page.skipped_reason = "noindex"
+
+            findings: Dict[str, List[Finding]] = {}
+            if not page.skipped_reason:
+                specs = static_specs if tier == "static" else detector_specs
+                if original is not None:
+                    findings = {
+                        detector_id: [finding.model_copy(deep=True) for finding in items]
+                        for detector_id, items in original_findings.items()
+                    }
+                else:
+                    with metrics.span("detectors", canonical):
+                        inputs = DetectionInputs(
+                            page,
+                            extras=extras,
+                            mobile_flags=mobile_flags,
+                            viewport=desktop_viewport,
+                            providers=registry.inputs,
+                        )
+                        findings = run_detectors_by_id(specs, inputs, metrics)
+                page.findings.extend(finding for spec in specs for finding in findings[spec.id])
+                if config.snapshots:
+                    snapshots[canonical] = PageSnapshot.capture(page, extras, mobile_flags, findings)
+                with metrics.span("privacy_scan", canonical):
                     if _page_mentions_privacy(html):
                         privacy_found = True
 
-                async with lock:
-                    pages.append(page)
-
-                if not sitemap_urls and depth < config.max_depth:
-                    added_links = 0
-                    for link in extract_links(html, final_url):
-                        canonical_link = canonicalize_url(link, config.ignore_querystrings)
-                        if not _is_same_domain(canonical_link, site_host):
+            async with lock:
+                pages.append(page)
+                if original is None:
+                    identical.setdefault(key, (page, findings))
+            if not page.skipped_reason:
+                check_stop(page)
+
+            crawl_links = not sitemap_urls and depth < config.max_depth and stop_reason is None
+            if crawl_links or frontier is not None:
+                with metrics.span("extract_links", canonical):
+                    links = [
+                        (link, normalize(link))
+                        for link in extract_links(html, final_url)
+                        if _is_same_domain(normalize(link), site_host)
+                    ]
+                if frontier is not None:
+                    frontier.record_page(
+                        canonical, bool(page.ad_elements), [link for _, link in links]
+                    )
+            if crawl_links:
+                added_links = 0
+                for link, canonical_link in links:
+                    async with lock:
+                        if canonical_link in seen:
                             continue
-                        async with lock:
-                            if canonical_link in seen:
-                                continue
-                        await queue.put((canonical_link, depth + 1))
-                        added_links += 1
-                    if added_links:
-                        logger.info("Queued %s links from %s", added_links, canonical)
+                    await queue.put((link, depth + 1))
+                    added_links += 1
+                if added_links:
+                    logger.info("Queued %s links from %s", added_links, canonical)
 
-                queue.task_done()
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    break
+                started = time.perf_counter()
+                try:
+                    if stop_reason is not None:
+                        dropped.add(normalize(item[0]))
+                    elif stop_condition is not None:
+                        await run_job(*item)
+                    elif deadline is None:
+                        await process(*item)
+                    else:
+                        await process_within_budget(*item)
+                except Exception:
+                    logger.exception("Unexpected error while processing %s", item[0])
+                finally:
+                    metrics.add_worker_busy(time.perf_counter() - started)
+                    queue.task_done()
 
-        workers = [asyncio.create_task(worker()) for _ in range(config.concurrency)]
+        monitor = asyncio.create_task(metrics.monitor(queue_depth=queue.qsize))
+        workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
         await queue.join()
         for _ in workers:
             await queue.put(None)
         await asyncio.gather(*workers)
+        monitor.cancel()
+        cache = normalizer.cache_info()
+        metrics.incr("url_normalize_hits", cache.hits)
+        metrics.incr("url_normalize_misses", cache.misses)
+        for kind, (hits, misses) in fragment_cache.counts().items():
+            earlier_hits, earlier_misses = fragment_counts.get(kind, (0, 0))
+            metrics.incr(f"fragment_{kind}_hits", hits - earlier_hits)
+            metrics.incr(f"fragment_{kind}_misses", misses - earlier_misses)
+        for name, value in pool.stats.items():
+            metrics.incr(f"browser_{name}", value)
+        if asset_cache is not None:
+            for name in ("asset_cache_hits", "asset_cache_misses", "asset_cache_bytes_saved"):
+                metrics.incr(name, asset_cache.stats[name])
+            asset_cache.close()
+        if ad_stubs is not None:
+            metrics.incr("ad_requests_stubbed", ad_stubs.stats["ad_requests_stubbed"])
+        logger.info(
+            "Browser pool: %s launches, %s recycles, %s crashes",
+            pool.stats["launches"],
+            pool.stats["recycles"],
+            pool.stats["crashes"],
+        )
 
     privacy_found = privacy_found or await _probe_privacy_paths(client, config.site)
     ads_status, ads_lines = await fetch_ads_txt(client, config.site)
     await client.aclose()
+    if archive is not None:
+        for name in (
+            "archive_recorded",
+            "archive_replayed",
+            "archive_nearest_matches",
+            "archive_misses",
+        ):
+            metrics.incr(name, archive.stats[name])
+        archive.close()
+
+    site_facts = {
+        "privacy_found": privacy_found,
+        "ads_txt_status": ads_status,
+        "ads_txt_lines": ads_lines,
+        "aliases": [asdict(alias) for alias in aliases],
+    }
+    if ad_stubs is not None:
+        site_facts["ad_stubs"] = {"requests": ad_stubs.stats["ad_requests_stubbed"]}
+    if sampler is not None:
+        site_facts["url_patterns"] = sampler.discovered()
+    if deadline is not None:
+        unvisited -= seen
+        site_facts["coverage"] = {
+            "time_budget_s": config.time_budget_s,
+            "pages": len(pages),
+            "unvisited": len(unvisited),
+            "cut_off": len(cut_off),
+            "complete": not (unvisited or cut_off),
+        }
+        metrics.incr("budget_unvisited", len(unvisited))
+        metrics.incr("budget_cut_off", len(cut_off))
+    if stop_reason is not None:
+        dropped -= seen
+        site_facts["early_termination"] = {
+            "condition": config.stop_when,
+            "reason": stop_reason,
+            "score": risk.score,
+            "critical_detectors": sorted(risk.critical_detectors),
+            "pages": len(pages),
+            "cancelled": len(cancelled),
+            "dropped": len(dropped),
+        }
+        metrics.incr("stop_cancelled", len(cancelled))
+        metrics.incr("stop_dropped", len(dropped))
+    run_id = None
+    if config.snapshots:
+        run = new_run(config.site, config.model_dump(mode="json"))
+        run.detector_versions = {spec.id: spec.version for spec in detector_specs}
+        run.site_facts = site_facts
+        with metrics.span("save_snapshots"):
+            store = SnapshotStore(out_dir / SNAPSHOT_FILE)
+            store.save_run(run)
+            store.save_snapshots(
+                run.id,
+                [snapshots.get(page.url) or PageSnapshot.capture(page) for page in pages],
+            )
+        run_id = run.id
+        logger.info("Saved render snapshots as run %s", run_id)
 
+    report = build_report(config, pages, site_facts, metrics, run_id)
+    write_report(report, metrics, out_dir, config.slowest_urls)
+
+    if config.list_skipped:
+        skipped = [page for page in pages if page.skipped_reason]
+        if skipped:
+            storage = Storage(Path("gpvb.sqlite"))
+            storage.save_pages(skipped)
+
+    logger.info("Audit complete (%s pages)", len(pages))
+    return report
+
+
+def _crawl_deadline(time_budget_s: Optional[float]) -> Optional[float]:
+    """``time.monotonic()`` at which crawling stops, keeping some of the budget for the report."""
+    if not time_budget_s:
+        return None
+    reserve = min(REPORT_RESERVE_S, time_budget_s * REPORT_RESERVE_SHARE)
+    return time.monotonic() + time_budget_s - reserve
+
+
+def _worker_count(config: CrawlConfig) -> int:
+    """Workers (and browser pages) to provision: the adaptive ceiling or the fixed concurrency."""
+    if not config.adaptive_concurrency:
+        return config.concurrency
+    ceiling = config.max_concurrency or config.concurrency * 2
+    return max(ceiling, config.min_concurrency, 1)
+
+
+def select_detectors(config: CrawlConfig, registry: DetectorRegistry) -> List[DetectorSpec]:
+    groups = ["general"]
+    if config.enable_program_policy_checks:
+        groups.append("program_policy")
+    return registry.select(config.detectors, groups)
+
+
+def build_report(
+    config: CrawlConfig,
+    pages: List[PageResult],
+    site_facts: Dict[str, Any],
+    metrics: MetricsRecorder,
+    run_id: Optional[str] = None,
+) -> FindingsReport:
+    """Run the cross-page detectors and assemble the report from per-page results."""
     if config.enable_program_policy_checks:
-        apply_autogenerated_findings([page for page in pages if not page.skipped_reason])
+        with metrics.span("autogenerated_clusters"):
+            apply_autogenerated_findings([page for page in pages if not page.skipped_reason])
 
+    catalog = default_catalog()
     summary = _summarize(pages)
-    program_policy_summary = _summarize(pages, category="program_policy")
-    summary_findings = detect_ads_txt(ads_status, ads_lines)
-    privacy_findings = detect_privacy_policy(privacy_found)
+    program_policy_summary = _summarize(pages, category="program_policy", catalog=catalog)
+    summary_findings = detect_ads_txt(site_facts["ads_txt_status"], site_facts["ads_txt_lines"])
+    privacy_findings = detect_privacy_policy(site_facts["privacy_found"])
 
     duplicates = []
-    replicated_findings = detect_replicated_content(
-        [page for page in pages if not page.skipped_reason]
-    )
+    with metrics.span("replicated_content"):
+        replicated_findings = detect_replicated_content(
+            [page for page in pages if not page.skipped_reason]
+        )
     if replicated_findings:
         for finding in replicated_findings:
             duplicates.append(
-                DuplicateCluster(urls=finding.evidence["urls"], similarity=finding.evidence["similarity"])
+                DuplicateCluster(
+                    urls=finding.evidence["urls"], similarity=finding.evidence["similarity"]
+                )
             )
 
+    url_patterns = []
+    if site_facts.get("url_patterns"):
+        with metrics.span("pattern_estimates"):
+            url_patterns = estimate_patterns(pages, site_facts["url_patterns"])
+
     all_findings = [finding for page in pages for finding in page.findings]
     all_findings.extend(summary_findings)
     all_findings.extend(privacy_findings)
 
+    # After the summaries, risk score and pattern estimates have counted every page's findings.
+    with metrics.span("template_findings"):
+        template_findings = collapse_template_findings(pages, config.template_min_pages)
+
+    metrics.finish()
     report = FindingsReport(
         summary=summary,
         program_policy_summary=program_policy_summary,
         account_risk=calculate_account_risk_score(all_findings),
         pages=pages,
         duplicates=duplicates,
+        aliases=[UrlAlias(**alias) for alias in site_facts.get("aliases", [])],
+        url_patterns=url_patterns,
+        template_findings=template_findings,
+        coverage=site_facts.get("coverage", {}),
+        early_termination=site_facts.get("early_termination", {}),
+        ad_stubs=site_facts.get("ad_stubs", {}),
+        catalog=catalog.for_findings(all_findings),
         site=config.site,
+        run_id=run_id,
+        metrics=metrics.summary(config.slowest_urls),
     )
     for finding in summary_findings + privacy_findings:
         summary.setdefault(finding.detector, {})[finding.severity.value] = (
             summary.setdefault(finding.detector, {}).get(finding.severity.value, 0) + 1
         )
+    return report
 
+
+def write_report(
+    report: FindingsReport, metrics: MetricsRecorder, out_dir: Path, slowest_urls: int
+) -> None:
     write_json(report, out_dir)
+    metrics.write(out_dir, slowest_urls)
     write_html(report, out_dir)
-    logger.info("Wrote report to %s", out_dir.resolve())
-
-    if config.list_skipped:
-        skipped = [page for page in pages if page.skipped_reason]
-        if skipped:
-            storage = Storage(Path("gpvb.sqlite"))
-            storage.save_pages(skipped)
-
-    logger.info("Audit complete (%s pages)", len(pages))
-    return report
+    logging.getLogger("gpvb").info("Wrote report to %s", out_dir.resolve())
 
 
 async def _load_robots(
@@ -259,6 +781,21 @@ async def _rate_limit(
         last_request[host] = time.time()
 
 
+async def _record_render_failure(
+    url: str, reason: str, pages: List[PageResult], lock: asyncio.Lock
+) -> None:
+    page = PageResult(
+        url=url,
+        final_url=url,
+        status=0,
+        html="",
+        text="",
+        skipped_reason=f"render_failed: {reason}",
+    )
+    async with lock:
+        pages.append(page)
+
+
 def _page_mentions_privacy(html: str) -> bool:
     soup = BeautifulSoup(html, "lxml")
     for link in soup.select("a"):
@@ -273,11 +810,16 @@ def _has_noindex_header(headers: Dict[str, str]) -> bool:
     return "noindex" in value.lower()
 
 
-def _summarize(pages: List[PageResult], category: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+def _summarize(
+    pages: List[PageResult],
+    category: Optional[str] = None,
+    catalog: Optional[DetectorCatalog] = None,
+) -> Dict[str, Dict[str, int]]:
+    catalog = catalog if catalog is not None else default_catalog()
     summary: Dict[str, Dict[str, int]] = {}
     for page in pages:
         for finding in page.findings:
-            if category and finding.category.value != category:
+            if category and catalog.category(finding.detector, finding.version) != category:
                 continue
             summary.setdefault(finding.detector, {})
             summary[finding.detector][finding.severity.value] = (
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from gpvb.models import AdElement, PageResult
+
+
+WORDS = (
+    "policy publisher content article review guide travel recipe finance health garden "
+    "market family science history music software design camera phone budget weather city "
+    "river mountain coffee energy student school report update season league player team "
+    "simple quick better daily local global modern classic useful honest careful bright"
+).split()
+
+TRIGGER_PHRASES = [
+    "Support us by clicking ads below.",
+    "Official Google partner approved by the government.",
+    "Get paid to visit our sponsors today.",
+    "Leave a comment and reply to the thread, buy now at the casino.",
+    "Download now for free.",
+]
+
+AD_SIZES = [(728, 90), (300, 250), (336, 280), (160, 600), (320, 100)]
+
+
+@dataclass
+class CorpusSpec:
+    pages: int = 50
+    words: int = 800
+    ad_count: int = 3
+    text_blocks: int = 40
+    script_kb: int = 20
+    template_script_kb: int = 20
+    duplicate_rate: float = 0.2
+    seed: int = 1234
+
+
+@dataclass
+class SyntheticPage:
+    url: str
+    html: str
+    ad_elements: List[AdElement]
+    extras: Dict[str, Any]
+    mobile_flags: Dict[str, bool] = field(default_factory=dict)
+
+    def to_page(self, text: str) -> PageResult:
+        return PageResult(
+            url=self.url,
+            final_url=self.url,
+            status=200,
+            html=self.html,
+            text=text,
+            ad_elements=list(self.ad_elements),
+        )
+
+
+def generate_corpus(spec: CorpusSpec) -> List[SyntheticPage]:
+    """Build a deterministic set of publisher-like pages described by ``spec``.
+
+    A ``duplicate_rate`` share of the pages reuse the body of an earlier page with a few words
+    changed, so the clustering detectors have realistic near-duplicate work to do. Every page
+    also carries the same ``template_script_kb`` site script next to its own inline script.
+    """
+    rng = random.Random(spec.seed)
+    template_script = ""
+    if spec.template_script_kb:
+        template_script = _inline_script(random.Random(spec.seed + 1), spec.template_script_kb)
+    pages: List[SyntheticPage] = []
+    bodies: List[List[str]] = []
+    for index in range(spec.pages):
+        if bodies and rng.random() < spec.duplicate_rate:
+            paragraphs = list(rng.choice(bodies))
+            paragraphs[rng.randrange(len(paragraphs))] = _paragraph(rng, 40)
+        else:
+            paragraphs = random_paragraphs(rng, spec.words)
+            bodies.append(paragraphs)
+        pages.append(_build_page(rng, spec, index, paragraphs, template_script))
+    return pages
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(6, 18))
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + ".")
+        remaining -= length
+    if rng.random() < 0.05:
+        sentences.append(rng.choice(TRIGGER_PHRASES))
+    return " ".join(sentences)
+
+
+def random_paragraphs(rng: random.Random, words: int) -> List[str]:
+    paragraphs = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(40, 120))
+        paragraphs.append(_paragraph(rng, length))
+        remaining -= length
+    return paragraphs or [""]
+
+
+def _inline_script(rng: random.Random, size_kb: int) -> str:
+    chunks = []
+    size = 0
+    counter = 0
+    while size < size_kb * 1024:
+        counter += 1
+        chunk = (
+            f"var v{counter}=function(a,b){{return a+b*{rng.randint(1, 99)}}};"
+            f"window.cfg{counter}={{slot:'{rng.randint(1000, 9999)}',lazy:!0}};"
+        )
+        chunks.append(chunk)
+        size += len(chunk)
+    if rng.random() < 0.1:
+        chunks.append("setTimeout(function(){location.reload()},30000);")
+    return "".join(chunks)
+
+
+def _build_page(
+    rng: random.Random,
+    spec: CorpusSpec,
+    index: int,
+    paragraphs: List[str],
+    template_script: str = "",
+) -> SyntheticPage:
+    url = f"https://bench.example/article/{index}"
+    ads: List[AdElement] = []
+    ad_markup: List[str] = []
+    y = 140.0
+    for slot in range(spec.ad_count):
+        width, height = rng.choice(AD_SIZES)
+        ads.append(
+            AdElement(
+                selector="ins.adsbygoogle",
+                x=float(rng.randint(0, 600)),
+                y=y,
+                width=float(width),
+                height=float(height),
+                overlaps_content=rng.random() < 0.1,
+                overlaps_nav=y < 120,
+            )
+        )
+        ad_markup.append(
+            "<div class='ad-wrap'><span class='ad-label'>Advertisement</span>"
+            f"<ins class='adsbygoogle' data-ad-client='ca-pub-1234567890' "
+            f"data-ad-slot='{1000 + slot}' style='display:inline-block;width:{width}px;"
+            f"height:{height}px'></ins></div>"
+        )
+        y += rng.randint(200, 900)
+
+    body_parts: List[str] = []
+    for position, paragraph in enumerate(paragraphs):
+        body_parts.append(f"<p>{paragraph}</p>")
+        if ad_markup and position % 3 == 1:
+            body_parts.append(ad_markup.pop())
+    body_parts.extend(ad_markup)
+
+    text_blocks = []
+    block_y = 0.0
+    sources = paragraphs * (spec.text_blocks // max(len(paragraphs), 1) + 1)
+    for block_text in sources[: spec.text_blocks]:
+        text_blocks.append(
+            {"text": block_text[:200], "x": 20.0, "y": block_y, "width": 800.0, "height": 60.0}
+        )
+        block_y += rng.randint(40, 160)
+    label_blocks = [
+        {
+            "text": "Advertisement",
+            "x": ad.x,
+            "y": ad.y - 14,
+            "width": 90.0,
+            "height": 12.0,
+            "font_size": float(rng.choice([9, 11, 12])),
+            "opacity": 1.0,
+        }
+        for ad in ads
+    ]
+
+    html = (
+        "<!doctype html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>Article {index}</title><meta name='author' content='Bench Writer'>"
+        "<script async src='https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js'>"
+        f"</script><script>{template_script}</script>"
+        f"<script>{_inline_script(rng, spec.script_kb)}</script></head><body>"
+        "<header><nav><ul><li><a href='/'>Home</a></li><li><a href='/about'>About</a></li>"
+        "<li><a href='/privacy'>Privacy Policy</a></li></ul></nav></header>"
+        f"<main><article><h1>Article {index}</h1>{''.join(body_parts)}</article></main>"
+        "<footer><small>Independent site, not affiliated with any brand.</small>"
+        "<a href='https://bit.ly/abc'>Share</a></footer></body></html>"
+    )
+    extras = {
+        "has_google_ad_client": True,
+        "has_noindex_meta": False,
+        "overlays": [],
+        "text_blocks": text_blocks,
+        "label_blocks": label_blocks,
+        "headers": {"content-type": "text/html"},
+    }
+    mobile_flags = {
+        "autoplay_audio": False,
+        "sticky_elements": rng.random() < 0.1,
+        "popup_on_load": False,
+    }
+    return SyntheticPage(
+        url=url, html=html, ad_elements=ads, extras=extras, mobile_flags=mobile_flags
+    )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import resource
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from gpvb.audit import audit_site
+from gpvb.bench.site import SiteSpec, SyntheticSite
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import CrawlConfig
+from gpvb.render.procinfo import descendants, proc_available, snapshot_processes
+
+
+class ResourceSampler:
+    """Polls /proc for the RSS of this process tree and the CPU time of its Chromium children.
+
+    CPU time is read from each process's own counters, so it is only as complete as the
+    sampling: a renderer that starts and exits between two samples is not counted, and a
+    process's CPU after its last sample is lost. Lower ``interval_s`` to tighten that gap.
+    """
+
+    def __init__(self, interval_s: float = 0.1) -> None:
+        self.interval_s = interval_s
+        self.peak_rss_bytes = 0
+        self.peak_chromium_rss_bytes = 0
+        self._chromium_cpu: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "ResourceSampler":
+        if proc_available():
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+    def sample(self) -> None:
+        samples = snapshot_processes()
+        if not samples:
+            return
+        tree = descendants(os.getpid(), samples)
+        self.peak_rss_bytes = max(
+            self.peak_rss_bytes, sum(samples[pid].rss_bytes for pid in tree)
+        )
+        chromium = [pid for pid in tree if "chrom" in samples[pid].cmdline.lower()]
+        self.peak_chromium_rss_bytes = max(
+            self.peak_chromium_rss_bytes, sum(samples[pid].rss_bytes for pid in chromium)
+        )
+        for pid in chromium:
+            # Keep the last value seen per pid so processes that exit still count.
+            previous = self._chromium_cpu.get(pid, 0.0)
+            self._chromium_cpu[pid] = max(previous, samples[pid].cpu_seconds)
+
+    @property
+    def chromium_cpu_seconds(self) -> float:
+        return sum(self._chromium_cpu.values())
+
+
+def run_crawl_benchmark(
+    spec: SiteSpec,
+    concurrency: int = 6,
+    rate_limit_ms: int = 0,
+    browsers: int = 1,
+    out_dir: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Serve a synthetic site locally, audit it end to end and report throughput and resources."""
+    out_dir = out_dir or tempfile.mkdtemp(prefix="gpvb-bench-")
+    metrics = MetricsRecorder(workers=concurrency)
+    with SyntheticSite(spec) as site:
+        config = CrawlConfig(
+            site=site.url + "/",
+            out_dir=out_dir,
+            max_pages=spec.pages,
+            concurrency=concurrency,
+            rate_limit_ms=rate_limit_ms,
+            browsers=browsers,
+            list_skipped=False,
+            **(overrides or {}),
+        )
+        with ResourceSampler() as sampler:
+            started = time.perf_counter()
+            report = asyncio.run(audit_site(config, metrics=metrics))
+            wall_s = time.perf_counter() - started
+        server_stats = site.stats()
+
+    rendered = [
+        page for page in report.pages if not (page.skipped_reason or "").startswith("render")
+    ]
+    summary = metrics.summary()
+    return {
+        "site": asdict(spec),
+        "crawl": {
+            "concurrency": concurrency,
+            "rate_limit_ms": rate_limit_ms,
+            "browsers": browsers,
+            **(overrides or {}),
+        },
+        "pages": len(report.pages),
+        "rendered_pages": len(rendered),
+        "wall_s": round(wall_s, 3),
+        "pages_per_min": _per_minute(len(rendered), wall_s),
+        "attempted_pages_per_min": _per_minute(len(report.pages), wall_s),
+        "stages": summary["stages"],
+        "detectors": summary["detectors"],
+        "worker_utilization": summary["worker_utilization"],
+        "peak_rss_mb": round(sampler.peak_rss_bytes / 1024 / 1024, 1),
+        "peak_chromium_rss_mb": round(sampler.peak_chromium_rss_bytes / 1024 / 1024, 1),
+        "chromium_cpu_s": round(sampler.chromium_cpu_seconds, 2),
+        "self_max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "server": server_stats,
+        "out_dir": out_dir,
+    }
+
+
+def _per_minute(count: int, wall_s: float) -> float:
+    return round(count / wall_s * 60, 2) if wall_s else 0.0
+
+
+def format_crawl_report(result: Dict[str, Any]) -> str:
+    lines = [
+        f"pages: {result['rendered_pages']} rendered of {result['pages']} in {result['wall_s']}s "
+        f"-> {result['pages_per_min']} rendered pages/min "
+        f"({result['attempted_pages_per_min']} attempted/min), "
+        f"worker utilization {result['worker_utilization']:.0%}",
+        f"peak RSS: {result['peak_rss_mb']} MiB (chromium {result['peak_chromium_rss_mb']} MiB), "
+        f"chromium CPU: {result['chromium_cpu_s']}s",
+        f"server: {result['server']['requests']} requests, {result['server']['errors']} errors",
+        f"{'stage':<24} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'total s':>10}",
+    ]
+    for stage, stats in result["stages"].items():
+        lines.append(
+            f"{stage:<24} {stats['count']:>7} {stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f} "
+            f"{stats['total_s']:>10.2f}"
+        )
+    return "\n".join(lines)
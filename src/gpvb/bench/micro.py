@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from langdetect import detect as langdetect_detect
+
+from gpvb.bench.corpus import CorpusSpec, SyntheticPage, generate_corpus
+from gpvb.detect import detectors
+from gpvb.detect.langid import LanguageIdentifier
+from gpvb.detect.program_policy import (
+    apply_autogenerated_findings,
+    build_context,
+    detect_autogenerated_findings,
+)
+from gpvb.detect.program_policy.deceptive_representation import detect_deceptive_representation
+from gpvb.detect.program_policy.invalid_traffic_signals import detect_invalid_traffic_signals
+from gpvb.detect.program_policy.malware_risk import detect_malware_risk
+from gpvb.detect.program_policy.manipulative_ad_placement import detect_manipulative_ad_placement
+from gpvb.detect.program_policy.traffic_source_abuse import detect_traffic_source_abuse
+from gpvb.detect.program_policy.ugc_risk import detect_ugc_risk
+from gpvb.detect.fragments import default_fragment_cache
+from gpvb.detect.scripts import scan_scripts
+from gpvb.detect.text import (
+    TextProfile,
+    cluster_simhash,
+    extract_main_text,
+    extract_visible_text,
+    simhash,
+)
+from gpvb.models import PageResult
+
+
+DESKTOP_VIEWPORT = {"width": 1366, "height": 768}
+
+
+@dataclass
+class BenchItem:
+    """One synthetic page with every derived input a detector may ask for."""
+
+    source: SyntheticPage
+    page: PageResult
+    context: Any
+
+
+@dataclass
+class BenchTarget:
+    name: str
+    func: Callable[..., Any]
+    scope: str = "page"
+
+
+@dataclass
+class BenchResult:
+    name: str
+    scope: str
+    pages: int
+    total_s: float
+    per_page_ms: float
+    pages_per_s: float
+    alloc_kb_per_page: float
+    peak_kb: float
+
+
+def _langdetect(text: str) -> str:
+    """The previous language_issue path: unbounded, unseeded ``langdetect.detect``."""
+    try:
+        return langdetect_detect(text) if text else ""
+    except Exception:
+        return ""
+
+
+def _page_targets() -> List[BenchTarget]:
+    uncached = LanguageIdentifier(cache_size=0)
+    return [
+        BenchTarget(
+            "text.extract_visible_text", lambda item: extract_visible_text(item.page.html)
+        ),
+        BenchTarget("text.extract_main_text", lambda item: extract_main_text(item.page.html)),
+        BenchTarget("text.simhash", lambda item: simhash(item.page.text)),
+        BenchTarget("text.text_profile", lambda item: TextProfile.from_text(item.page.text)),
+        BenchTarget("scripts.scan_scripts", lambda item: scan_scripts(item.page.html)),
+        BenchTarget("langid.langdetect_full_text", lambda item: _langdetect(item.page.text)),
+        BenchTarget("langid.identify", lambda item: uncached.identify(item.page.text)),
+        BenchTarget(
+            "program_policy.build_context",
+            lambda item: build_context(item.source.extras, DESKTOP_VIEWPORT),
+        ),
+        BenchTarget(
+            "detectors.detect_thin_content", lambda item: detectors.detect_thin_content(item.page)
+        ),
+        BenchTarget(
+            "detectors.detect_ads_vs_content",
+            lambda item: detectors.detect_ads_vs_content(item.page),
+        ),
+        BenchTarget(
+            "detectors.detect_ads_interfering",
+            lambda item: detectors.detect_ads_interfering(item.page),
+        ),
+        BenchTarget(
+            "detectors.detect_dead_end",
+            lambda item: detectors.detect_dead_end(item.page, item.source.extras["overlays"]),
+        ),
+        BenchTarget(
+            "detectors.detect_language_issue",
+            lambda item: detectors.detect_language_issue(item.page),
+        ),
+        BenchTarget(
+            "detectors.detect_abusive_experience",
+            lambda item: detectors.detect_abusive_experience(item.page, item.source.mobile_flags),
+        ),
+        BenchTarget(
+            "detectors.detect_privacy_policy", lambda item: detectors.detect_privacy_policy(True)
+        ),
+        BenchTarget("detectors.detect_ads_txt", lambda item: detectors.detect_ads_txt(200, 3)),
+        BenchTarget(
+            "detectors.merge_page_findings",
+            lambda item: detectors.merge_page_findings(
+                item.page, item.source.extras["overlays"], item.source.mobile_flags
+            ),
+        ),
+        BenchTarget(
+            "program_policy.detect_invalid_traffic_signals",
+            lambda item: detect_invalid_traffic_signals(item.page, item.context),
+        ),
+        BenchTarget(
+            "program_policy.detect_manipulative_ad_placement",
+            lambda item: detect_manipulative_ad_placement(item.page, item.context),
+        ),
+        BenchTarget(
+            "program_policy.detect_deceptive_representation",
+            lambda item: detect_deceptive_representation(item.page),
+        ),
+        BenchTarget(
+            "program_policy.detect_malware_risk",
+            lambda item: detect_malware_risk(item.page, item.context),
+        ),
+        BenchTarget(
+            "program_policy.detect_traffic_source_abuse",
+            lambda item: detect_traffic_source_abuse(item.page),
+        ),
+        BenchTarget("program_policy.detect_ugc_risk", lambda item: detect_ugc_risk(item.page)),
+        BenchTarget(
+            "program_policy.detect_autogenerated_findings",
+            lambda item: detect_autogenerated_findings(item.page),
+        ),
+    ]
+
+
+def _identify_batch(identifier: LanguageIdentifier, texts: List[str]) -> None:
+    identifier.clear_cache()
+    identifier.identify_many(texts)
+
+
+def _corpus_targets() -> List[BenchTarget]:
+    batched = LanguageIdentifier()
+    return [
+        BenchTarget(
+            "text.cluster_simhash",
+            lambda items: cluster_simhash(
+                [item.page.url for item in items], [item.page.text for item in items], 0.85
+            ),
+            scope="corpus",
+        ),
+        BenchTarget(
+            "langid.identify_many",
+            lambda items: _identify_batch(batched, [item.page.text for item in items]),
+            scope="corpus",
+        ),
+        BenchTarget(
+            "detectors.detect_replicated_content",
+            lambda items: detectors.detect_replicated_content([item.page for item in items]),
+            scope="corpus",
+        ),
+        BenchTarget(
+            "program_policy.apply_autogenerated_findings",
+            lambda items: apply_autogenerated_findings([item.page for item in items]),
+            scope="corpus",
+        ),
+    ]
+
+
+def default_targets() -> List[BenchTarget]:
+    return _page_targets() + _corpus_targets()
+
+
+def prepare_items(corpus: List[SyntheticPage]) -> List[BenchItem]:
+    items = []
+    for source in corpus:
+        page = source.to_page(extract_visible_text(source.html))
+        context = build_context(source.extras, DESKTOP_VIEWPORT)
+        items.append(BenchItem(source=source, page=page, context=context))
+    return items
+
+
+def _run_once(target: BenchTarget, items: List[BenchItem]) -> None:
+    if target.scope == "corpus":
+        target.func(items)
+    else:
+        for item in items:
+            target.func(item)
+
+
+def _reset(items: List[BenchItem]) -> None:
+    for item in items:
+        item.page.findings.clear()
+        # Drop the cached text profile, ad geometry and script facts so every repeat pays for
+        # building them.
+        item.page._text_profile = None
+        item.page._ad_rects = None
+        item.page._script_facts = None
+    # Start each repeat with an empty fragment cache: hits then only come from fragments shared
+    # between pages of the corpus, as in one audit.
+    default_fragment_cache().clear()
+
+
+def run_target(target: BenchTarget, items: List[BenchItem], repeat: int = 3) -> BenchResult:
+    """Time ``target`` over ``items`` (best of ``repeat``) and measure its allocations once."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        _run_once(target, items)
+        best = min(best, time.perf_counter() - started)
+        _reset(items)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    _run_once(target, items)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    _reset(items)
+
+    pages = max(len(items), 1)
+    return BenchResult(
+        name=target.name,
+        scope=target.scope,
+        pages=len(items),
+        total_s=round(best, 6),
+        per_page_ms=round(best * 1000 / pages, 4),
+        pages_per_s=round(pages / best, 2) if best else 0.0,
+        alloc_kb_per_page=round(max(after - before, 0) / 1024 / pages, 3),
+        peak_kb=round((peak - before) / 1024, 3),
+    )
+
+
+def run_micro_benchmarks(
+    spec: CorpusSpec,
+    repeat: int = 3,
+    targets: Optional[List[BenchTarget]] = None,
+    name_filter: Optional[str] = None,
+) -> Dict[str, Any]:
+    items = prepare_items(generate_corpus(spec))
+    selected = targets if targets is not None else default_targets()
+    if name_filter:
+        selected = [target for target in selected if name_filter in target.name]
+    results = [asdict(run_target(target, items, repeat)) for target in selected]
+    return {
+        "meta": {
+            "corpus": asdict(spec),
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": {result["name"]: result for result in results},
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25
+) -> List[Dict[str, Any]]:
+    """Return one row per target shared with ``baseline``, flagging slowdowns past ``tolerance``."""
+    rows = []
+    for name, result in current.get("results", {}).items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("per_page_ms"):
+            continue
+        ratio = result["per_page_ms"] / previous["per_page_ms"]
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": previous["per_page_ms"],
+                "current_ms": result["per_page_ms"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1 + tolerance,
+            }
+        )
+    return rows
+
+
+def write_results(results: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def format_table(
+    results: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    ratios = {row["name"]: row for row in comparison or []}
+    lines = [f"{'target':<52} {'ms/page':>10} {'pages/s':>10} {'KiB/page':>10} {'vs base':>9}"]
+    for name, result in results["results"].items():
+        row = ratios.get(name)
+        delta = ""
+        if row:
+            delta = f"{row['ratio']:.2f}x" + (" !" if row["regression"] else "")
+        lines.append(
+            f"{name:<52} {result['per_page_ms']:>10.3f} {result['pages_per_s']:>10.1f} "
+            f"{result['alloc_kb_per_page']:>10.1f} {delta:>9}"
+        )
+    return "\n".join(lines)
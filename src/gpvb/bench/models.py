@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from gpvb.detect.geometry import OVERLAPS_CLICKABLE, OVERLAPS_CONTENT, AdRects, YIndex
+from gpvb.detect.program_policy.context import TextBlock
+from gpvb.models import AdElement
+
+
+@dataclass
+class ModelResult:
+    name: str
+    items: int
+    per_item_us: float
+    bytes_per_item: float
+
+
+def _raw_ads(pages: int, ads_per_page: int, rng: random.Random) -> List[List[Dict[str, Any]]]:
+    return [
+        [
+            {
+                "selector": "ins.adsbygoogle",
+                "x": float(rng.randint(0, 1000)),
+                "y": float(rng.randint(0, 6000)),
+                "width": 300.0,
+                "height": 250.0,
+                "overlaps_clickable": rng.random() < 0.1,
+                "overlaps_nav": rng.random() < 0.1,
+                "overlaps_content": rng.random() < 0.2,
+            }
+            for _ in range(ads_per_page)
+        ]
+        for _ in range(pages)
+    ]
+
+
+def _text_blocks(pages: int, blocks_per_page: int, rng: random.Random) -> List[List[TextBlock]]:
+    return [
+        [
+            TextBlock("Some paragraph text", 0.0, float(rng.randint(0, 6000)), 600.0, 40.0)
+            for _ in range(blocks_per_page)
+        ]
+        for _ in range(pages)
+    ]
+
+
+def _measure(name: str, items: int, build: Callable[[], Any], repeat: int) -> ModelResult:
+    """Best-of-``repeat`` time for ``build`` and the memory its result keeps alive."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return ModelResult(
+        name=name,
+        items=items,
+        per_item_us=round(best * 1e6 / max(items, 1), 4),
+        bytes_per_item=round((after - before) / max(items, 1), 1),
+    )
+
+
+def _time(name: str, items: int, func: Callable[[], Any], repeat: int) -> ModelResult:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return ModelResult(name, items, round(best * 1e6 / max(items, 1), 4), 0.0)
+
+
+def _nearby_scan(ads: List[AdElement], blocks: List[TextBlock]) -> List[str]:
+    return [block.text for ad in ads for block in blocks if abs(block.y - ad.y) <= 600]
+
+
+def _nearby_index(rects: AdRects, blocks: List[TextBlock], index: YIndex) -> List[str]:
+    return [blocks[i].text for y in rects.y for i in index.near(y, 600)]
+
+
+def run_model_benchmark(
+    pages: int = 2000,
+    ads_per_page: int = 8,
+    blocks_per_page: int = 300,
+    repeat: int = 3,
+    seed: int = 1234,
+) -> Dict[str, Any]:
+    """Compare validated models with ``model_construct`` and the array-backed ad geometry.
+
+    ``bytes_per_item`` is what the built objects keep alive, per ad (or per page for the
+    per-page rows); ``per_item_us`` is the best-of-``repeat`` time per item.
+    """
+    rng = random.Random(seed)
+    raw = _raw_ads(pages, ads_per_page, rng)
+    ads = pages * ads_per_page
+    validated = [[AdElement(**item) for item in page] for page in raw]
+    rects = [AdRects.from_elements(page) for page in validated]
+    results = [
+        _measure(
+            "ad_element.validated",
+            ads,
+            lambda: [[AdElement(**item) for item in page] for page in raw],
+            repeat,
+        ),
+        _measure(
+            "ad_element.model_construct",
+            ads,
+            lambda: [[AdElement.model_construct(**item) for item in page] for page in raw],
+            repeat,
+        ),
+        _measure(
+            "ad_rects.from_elements",
+            ads,
+            lambda: [AdRects.from_elements(page) for page in validated],
+            repeat,
+        ),
+        _time(
+            "geometry.models",
+            pages,
+            lambda: [
+                (
+                    sum(ad.width * ad.height for ad in page),
+                    sum(1 for ad in page if ad.overlaps_clickable or ad.overlaps_content),
+                )
+                for page in validated
+            ],
+            repeat,
+        ),
+        _time(
+            "geometry.ad_rects",
+            pages,
+            lambda: [
+                (page.area(), page.flagged(OVERLAPS_CLICKABLE | OVERLAPS_CONTENT))
+                for page in rects
+            ],
+            repeat,
+        ),
+    ]
+    sample = max(1, pages // 10)
+    blocks = _text_blocks(sample, blocks_per_page, rng)
+    indexes = [YIndex(block.y for block in page) for page in blocks]
+    pairs: List[Tuple[int, int]] = [(page, page) for page in range(sample)]
+    results += [
+        _time(
+            "nearby_text.scan",
+            sample,
+            lambda: [_nearby_scan(validated[ad], blocks[block]) for ad, block in pairs],
+            repeat,
+        ),
+        _time(
+            "nearby_text.y_index",
+            sample,
+            lambda: [
+                _nearby_index(rects[ad], blocks[block], indexes[block]) for ad, block in pairs
+            ],
+            repeat,
+        ),
+    ]
+    return {
+        "pages": pages,
+        "ads_per_page": ads_per_page,
+        "blocks_per_page": blocks_per_page,
+        "results": {result.name: asdict(result) for result in results},
+    }
+
+
+def format_model_report(results: Dict[str, Any]) -> str:
+    lines = [f"{'case':<30} {'items':>8} {'us/item':>10} {'bytes/item':>11}"]
+    for name, result in results["results"].items():
+        size = f"{result['bytes_per_item']:>11.1f}" if result["bytes_per_item"] else f"{'-':>11}"
+        lines.append(f"{name:<30} {result['items']:>8} {result['per_item_us']:>10.3f} {size}")
+    return "\n".join(lines)
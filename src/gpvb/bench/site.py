@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from gpvb.bench.corpus import AD_SIZES, random_paragraphs
+
+
+FAKE_ADSBYGOOGLE_JS = """
+(function () {
+  var slots = document.querySelectorAll('ins.adsbygoogle');
+  slots.forEach(function (slot) {
+    var frame = document.createElement('div');
+    frame.style.width = slot.style.width || '300px';
+    frame.style.height = slot.style.height || '250px';
+    frame.style.background = '#f2f2f2';
+    frame.textContent = 'Ad';
+    slot.appendChild(frame);
+  });
+})();
+"""
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    pages: int = 200
+    words: int = 600
+    links_per_page: int = 8
+    ad_rate: float = 0.7
+    max_ads: int = 4
+    sitemap: bool = True
+    sitemap_chunk: int = 100
+    latency_ms: int = 0
+    latency_jitter_ms: int = 0
+    error_rate: float = 0.0
+    slow_asset_ms: int = 0
+    seed: int = 1234
+
+
+class SyntheticSite:
+    """A generated publisher site served from a local thread, for offline crawl benchmarks.
+
+    Pages, sitemaps, robots.txt and ads.txt are derived deterministically from ``spec.seed``;
+    latency, error rate and slow assets are injected per request.
+    """
+
+    def __init__(self, spec: SiteSpec, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.spec = spec
+        self.requests: Counter = Counter()
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(spec.seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SyntheticSite":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        # shutdown() blocks until serve_forever() exits, so only call it once that loop runs.
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "SyntheticSite":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": sum(self.requests.values()), "errors": self.errors, **self.requests}
+
+    def respond(self, path: str) -> Tuple[int, str, bytes]:
+        """Return ``(status, content_type, body)`` for ``path`` without any injected delay."""
+        path = path.split("?", 1)[0]
+        if path == "/robots.txt":
+            body = "User-agent: *\nAllow: /\n"
+            if self.spec.sitemap:
+                body += f"Sitemap: {self.url}/sitemap.xml\n"
+            return 200, "text/plain", body.encode()
+        if path == "/ads.txt":
+            return 200, "text/plain", b"google.com, pub-1234567890, DIRECT, f08c47fec0942fa0\n"
+        if path == "/sitemap.xml" and self.spec.sitemap:
+            return 200, "application/xml", self._sitemap_index().encode()
+        if path.startswith("/sitemap-") and path.endswith(".xml") and self.spec.sitemap:
+            chunk = path[len("/sitemap-") : -len(".xml")]
+            if chunk.isdigit():
+                return 200, "application/xml", self._sitemap_chunk(int(chunk)).encode()
+        if path == "/pagead/js/adsbygoogle.js":
+            return 200, "application/javascript", FAKE_ADSBYGOOGLE_JS.encode()
+        if path == "/assets/app.js":
+            return 200, "application/javascript", b"window.siteReady = true;"
+        if path == "/assets/style.css":
+            return 200, "text/css", b"body{font-family:sans-serif;max-width:960px;margin:auto}"
+        if path in {"/", "/privacy"}:
+            return 200, "text/html", self._page_html(0 if path == "/" else -1).encode()
+        if path.startswith("/page/"):
+            index = path[len("/page/") :].strip("/")
+            if index.isdigit() and int(index) < self.spec.pages:
+                return 200, "text/html", self._page_html(int(index)).encode()
+        return 404, "text/plain", b"not found"
+
+    def _delay_for(self, path: str) -> float:
+        delay = self.spec.latency_ms
+        if self.spec.latency_jitter_ms:
+            with self._lock:
+                delay += self._rng.randint(0, self.spec.latency_jitter_ms)
+        if path.startswith("/assets/"):
+            delay += self.spec.slow_asset_ms
+        return delay / 1000
+
+    def _should_fail(self, path: str) -> bool:
+        if not self.spec.error_rate or not path.startswith("/page/"):
+            return False
+        return random.Random(f"{self.spec.seed}:{path}").random() < self.spec.error_rate
+
+    def _sitemap_index(self) -> str:
+        chunks = (self.spec.pages + self.spec.sitemap_chunk - 1) // self.spec.sitemap_chunk
+        entries = "".join(
+            f"<sitemap><loc>{self.url}/sitemap-{chunk}.xml</loc></sitemap>"
+            for chunk in range(chunks)
+        )
+        return f"<?xml version='1.0'?><sitemapindex>{entries}</sitemapindex>"
+
+    def _sitemap_chunk(self, chunk: int) -> str:
+        start = chunk * self.spec.sitemap_chunk
+        stop = min(start + self.spec.sitemap_chunk, self.spec.pages)
+        entries = "".join(
+            f"<url><loc>{self.url}/page/{index}</loc>"
+            f"<lastmod>2024-01-{index % 28 + 1:02d}</lastmod>"
+            f"<priority>{0.9 if index < 10 else 0.5}</priority></url>"
+            for index in range(start, stop)
+        )
+        return f"<?xml version='1.0'?><urlset>{entries}</urlset>"
+
+    def _page_html(self, index: int) -> str:
+        return _render_page(self.spec, index)
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._serve(include_body=True)
+
+            def do_HEAD(self) -> None:  # noqa: N802
+                self._serve(include_body=False)
+
+            def _serve(self, include_body: bool) -> None:
+                path = self.path.split("?", 1)[0]
+                delay = site._delay_for(path)
+                if delay:
+                    time.sleep(delay)
+                if site._should_fail(path):
+                    status, content_type, body = 500, "text/plain", b"injected error"
+                else:
+                    status, content_type, body = site.respond(path)
+                if content_type == "text/html":
+                    kind = "page"
+                elif status == 404:
+                    kind = "not_found"
+                else:
+                    kind = path.rsplit(".", 1)[-1]
+                with site._lock:
+                    site.requests[kind] += 1
+                    if status >= 500:
+                        site.errors += 1
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if include_body:
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                return
+
+        return Handler
+
+
+@lru_cache(maxsize=4096)
+def _render_page(spec: SiteSpec, index: int) -> str:
+    rng = random.Random(f"{spec.seed}:{index}")
+    title = "Privacy Policy" if index < 0 else f"Page {index}"
+    paragraphs = random_paragraphs(rng, spec.words)
+    ads = []
+    if index >= 0 and rng.random() < spec.ad_rate:
+        for slot in range(rng.randint(1, spec.max_ads)):
+            width, height = rng.choice(AD_SIZES)
+            ads.append(
+                f"<ins class='adsbygoogle' data-ad-client='ca-pub-1234567890' "
+                f"data-ad-slot='{2000 + slot}' "
+                f"style='display:inline-block;width:{width}px;height:{height}px'></ins>"
+            )
+    body = []
+    for position, paragraph in enumerate(paragraphs):
+        body.append(f"<p>{paragraph}</p>")
+        if ads and position % 2 == 0:
+            body.append("<div class='ad'><small>Advertisement</small>" + ads.pop() + "</div>")
+    body.extend(ads)
+    links = "".join(
+        f"<li><a href='/page/{rng.randrange(max(spec.pages, 1))}'>Related {n}</a></li>"
+        for n in range(spec.links_per_page)
+    )
+    ad_script = ""
+    if any("adsbygoogle" in part for part in body):
+        ad_script = (
+            "<script async src='/pagead/js/adsbygoogle.js'></script>"
+            "<script>window.adsbygoogle = window.adsbygoogle || [];"
+            "adsbygoogle.push({google_ad_client: 'ca-pub-1234567890'});</script>"
+        )
+    return (
+        "<!doctype html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>{title}</title><link rel='stylesheet' href='/assets/style.css'>"
+        f"<script src='/assets/app.js'></script>{ad_script}</head><body>"
+        "<header><nav><a href='/'>Home</a> <a href='/privacy'>Privacy Policy</a></nav></header>"
+        f"<main><article><h1>{title}</h1>{''.join(body)}</article></main>"
+        f"<aside><ul>{links}</ul></aside><footer>&copy; Synthetic Publisher</footer></body></html>"
+    )
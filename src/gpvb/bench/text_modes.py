@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from gpvb.detect.text import TEXT_MODES, extract_text
+
+
+REFERENCE_MODE = "readability"
+BROWSER_MODES = ("innertext", "browser_main")
+
+
+@dataclass
+class TextDocument:
+    name: str
+    html: str
+    inner_text: str = ""
+    main_text: str = ""
+
+
+@dataclass
+class TextModeResult:
+    mode: str
+    documents: int
+    per_page_ms: float
+    words_per_page: float
+    agreement: float
+    recall: float
+
+
+def load_fixture_documents(root: Path) -> List[TextDocument]:
+    return [
+        TextDocument(name=str(path.relative_to(root)), html=path.read_text(encoding="utf-8"))
+        for path in sorted(root.rglob("*.html"))
+    ]
+
+
+def collect_browser_text(documents: List[TextDocument], user_agent: str = "GPVB/1.0") -> None:
+    """Render each document from a temporary file to fill in what the browser modes reuse."""
+    from gpvb.render.browser import BrowserPool
+
+    async def render_all() -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            async with BrowserPool(concurrency=4, user_agent=user_agent) as pool:
+                for index, document in enumerate(documents):
+                    path = Path(tmp) / f"{index}.html"
+                    path.write_text(document.html, encoding="utf-8")
+                    _, _, _, text, _, _, extras = await pool.render_page(
+                        path.as_uri(), viewport={"width": 1366, "height": 768}
+                    )
+                    document.inner_text = text
+                    document.main_text = extras.get("main_text", "")
+
+    asyncio.run(render_all())
+
+
+def _overlap(words: List[str], reference: List[str]) -> Tuple[float, float]:
+    """Jaccard agreement of the two word sets, and recall of the reference words."""
+    ours, theirs = set(words), set(reference)
+    if not ours and not theirs:
+        return 1.0, 1.0
+    union = ours | theirs
+    shared = ours & theirs
+    return len(shared) / len(union), (len(shared) / len(theirs) if theirs else 1.0)
+
+
+def run_text_benchmark(
+    documents: List[TextDocument], repeat: int = 3, modes: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Time each text mode over ``documents`` and score its words against readability's.
+
+    Browser modes only time the reuse of text captured during rendering; they are skipped
+    unless ``collect_browser_text`` filled that text in.
+    """
+    have_browser_text = any(document.inner_text for document in documents)
+    selected = [
+        mode
+        for mode in modes or list(TEXT_MODES)
+        if have_browser_text or mode not in BROWSER_MODES
+    ]
+    reference = [extract_text(doc.html, REFERENCE_MODE).lower().split() for doc in documents]
+    results = []
+    pages = max(len(documents), 1)
+    for mode in selected:
+        best = float("inf")
+        outputs: List[str] = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            outputs = [
+                extract_text(doc.html, mode, inner_text=doc.inner_text, main_text=doc.main_text)
+                for doc in documents
+            ]
+            best = min(best, time.perf_counter() - started)
+        scores = [
+            _overlap(text.lower().split(), words) for text, words in zip(outputs, reference)
+        ]
+        results.append(
+            TextModeResult(
+                mode=mode,
+                documents=len(documents),
+                per_page_ms=round(best * 1000 / pages, 4),
+                words_per_page=round(sum(len(text.split()) for text in outputs) / pages, 1),
+                agreement=round(sum(score[0] for score in scores) / pages, 4),
+                recall=round(sum(score[1] for score in scores) / pages, 4),
+            )
+        )
+    return {
+        "reference": REFERENCE_MODE,
+        "documents": len(documents),
+        "skipped": [mode for mode in modes or TEXT_MODES if mode not in selected],
+        "results": {result.mode: asdict(result) for result in results},
+    }
+
+
+def format_text_report(results: Dict[str, Any]) -> str:
+    lines = [
+        f"{'mode':<14} {'ms/page':>10} {'words/page':>11} {'agreement':>10} {'recall':>8}"
+    ]
+    for mode, result in results["results"].items():
+        lines.append(
+            f"{mode:<14} {result['per_page_ms']:>10.3f} {result['words_per_page']:>11.1f} "
+            f"{result['agreement']:>10.3f} {result['recall']:>8.3f}"
+        )
+    if results["skipped"]:
+        lines.append(f"skipped (no browser text): {', '.join(results['skipped'])}")
+    lines.append(f"agreement and recall are measured against {results['reference']}")
+    return "\n".join(lines)
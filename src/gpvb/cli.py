@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import typer
 
 from gpvb.audit import audit_site
+from gpvb.crawl.canonicalize import URLNormalizer
+from gpvb.detect.program_policy.risk import StopCondition
+from gpvb.detect.registry import default_registry, parse_selection
+from gpvb.detect.text import TEXT_MODES
 from gpvb.models import CrawlConfig
+from gpvb.render.archive import HAR_FILE
 
 app = typer.Typer(
     help="Google Policy Violations Bot",
     no_args_is_help=True,
     context_settings={"allow_extra_args": True, "ignore_unknown_options": True},
 )
+bench_app = typer.Typer(help="Performance benchmarks", no_args_is_help=True)
+app.add_typer(bench_app, name="bench")
 
 
 def _parse_bool(value: Optional[str]) -> bool:
@@ -28,6 +37,84 @@ def _parse_bool(value: Optional[str]) -> bool:
     raise typer.BadParameter("Expected a boolean value (true/false).")
 
 
+def _parse_render_mode(value: str) -> str:
+    normalized = value.strip().lower()
+    if normalized not in {"full", "tiered"}:
+        raise typer.BadParameter("Expected full or tiered.")
+    return normalized
+
+
+def _parse_text_mode(value: str) -> str:
+    normalized = value.strip().lower()
+    if normalized not in TEXT_MODES:
+        raise typer.BadParameter(f"Expected one of {', '.join(TEXT_MODES)}.")
+    return normalized
+
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from ``90``, ``90s``, ``20m`` or ``1.5h``; None when not given."""
+    if value is None:
+        return None
+    normalized = value.strip().lower()
+    unit = _DURATION_UNITS.get(normalized[-1:])
+    number = normalized[:-1] if unit else normalized
+    try:
+        seconds = float(number) * (unit or 1)
+    except ValueError as exc:
+        raise typer.BadParameter("Expected a duration such as 90s, 20m or 1h.") from exc
+    if seconds <= 0:
+        raise typer.BadParameter("The time budget must be positive.")
+    return seconds
+
+
+def _load_url_rules(path: Optional[Path], trailing_slash: Optional[str]) -> Dict[str, Any]:
+    rules: Dict[str, Any] = {}
+    if path:
+        try:
+            rules = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as exc:
+            raise typer.BadParameter(f"Cannot read URL rules from {path}: {exc}") from exc
+    if trailing_slash:
+        rules["trailing_slash"] = trailing_slash
+    try:
+        URLNormalizer.from_dict(rules)
+    except (TypeError, ValueError) as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    return rules
+
+
+def _parse_replay(path: Optional[Path], record_har: Optional[Path]) -> Optional[str]:
+    if path is None:
+        return None
+    if record_har is not None:
+        raise typer.BadParameter("--replay cannot be combined with --record-har.")
+    if not (path / HAR_FILE).is_file():
+        raise typer.BadParameter(f"{path} does not contain a recorded {HAR_FILE}.")
+    return str(path)
+
+
+def _parse_stop_when(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        StopCondition.parse(value)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    return value
+
+
+def _parse_detectors(value: Optional[str]) -> List[str]:
+    selection = parse_selection(value)
+    try:
+        default_registry().select(selection)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    return selection
+
+
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context) -> None:
     if ctx.invoked_subcommand is None and ctx.args:
@@ -48,14 +135,38 @@ def audit(
     out: Path = typer.Option(Path("./out"), "--out"),
     max_pages: int = typer.Option(500, "--max-pages"),
     max_depth: int = typer.Option(3, "--max-depth"),
+    time_budget: Optional[str] = typer.Option(None, "--time-budget"),
+    stop_when: Optional[str] = typer.Option(None, "--stop-when"),
     concurrency: int = typer.Option(6, "--concurrency"),
+    adaptive_concurrency: bool = typer.Option(False, "--adaptive-concurrency"),
+    min_concurrency: int = typer.Option(1, "--min-concurrency"),
+    max_concurrency: Optional[int] = typer.Option(None, "--max-concurrency"),
+    browsers: int = typer.Option(1, "--browsers"),
+    recycle_after_pages: int = typer.Option(200, "--recycle-after-pages"),
+    recycle_rss_mb: Optional[int] = typer.Option(None, "--recycle-rss-mb"),
+    asset_cache_mb: int = typer.Option(256, "--asset-cache-mb"),
+    asset_cache_dir: Optional[Path] = typer.Option(None, "--asset-cache-dir"),
+    record_har: Optional[Path] = typer.Option(None, "--record-har"),
+    replay: Optional[Path] = typer.Option(None, "--replay"),
+    stub_ads: str = typer.Option("false", "--stub-ads"),
     respect_robots: str = typer.Option("true", "--respect-robots"),
     enable_program_policy_checks: str = typer.Option("true", "--enable-program-policy-checks"),
     user_agent: str = typer.Option("GPVB/1.0", "--user-agent"),
     include_regex: str = typer.Option(None, "--include-regex"),
     exclude_regex: str = typer.Option(None, "--exclude-regex"),
     ignore_querystrings: bool = typer.Option(False, "--ignore-querystrings"),
+    url_rules: Optional[Path] = typer.Option(None, "--url-rules"),
+    trailing_slash: Optional[str] = typer.Option(None, "--trailing-slash"),
     rate_limit_ms: int = typer.Option(250, "--rate-limit-ms"),
+    slowest_urls: int = typer.Option(10, "--slowest-urls"),
+    template_min_pages: int = typer.Option(3, "--template-min-pages"),
+    detectors: Optional[str] = typer.Option(None, "--detectors"),
+    snapshots: str = typer.Option("true", "--snapshots"),
+    render_mode: str = typer.Option("full", "--render-mode"),
+    text_mode: str = typer.Option("main", "--text-mode"),
+    pre_resolve: str = typer.Option("true", "--pre-resolve"),
+    soft_404: str = typer.Option("true", "--soft-404"),
+    sample_per_pattern: int = typer.Option(0, "--sample-per-pattern"),
 ) -> None:
     logging.basicConfig(
         level=logging.INFO,
@@ -66,17 +177,274 @@ def audit(
         out_dir=str(out),
         max_pages=max_pages,
         max_depth=max_depth,
+        time_budget_s=_parse_duration(time_budget),
+        stop_when=_parse_stop_when(stop_when),
         concurrency=concurrency,
+        adaptive_concurrency=adaptive_concurrency,
+        min_concurrency=min_concurrency,
+        max_concurrency=max_concurrency,
+        browsers=browsers,
+        recycle_after_pages=recycle_after_pages,
+        recycle_rss_mb=recycle_rss_mb,
+        asset_cache_mb=asset_cache_mb,
+        asset_cache_dir=str(asset_cache_dir) if asset_cache_dir else None,
+        record_har_dir=str(record_har) if record_har else None,
+        replay_dir=_parse_replay(replay, record_har),
+        stub_ads=_parse_bool(stub_ads),
         respect_robots=_parse_bool(respect_robots),
         enable_program_policy_checks=_parse_bool(enable_program_policy_checks),
         user_agent=user_agent,
         include_regex=include_regex,
         exclude_regex=exclude_regex,
         ignore_querystrings=ignore_querystrings,
+        url_rules=_load_url_rules(url_rules, trailing_slash),
         rate_limit_ms=rate_limit_ms,
+        slowest_urls=slowest_urls,
+        template_min_pages=template_min_pages,
+        detectors=_parse_detectors(detectors),
+        snapshots=_parse_bool(snapshots),
+        render_mode=_parse_render_mode(render_mode),
+        text_mode=_parse_text_mode(text_mode),
+        pre_resolve=_parse_bool(pre_resolve),
+        soft_404=_parse_bool(soft_404),
+        sample_per_pattern=sample_per_pattern,
     )
     asyncio.run(audit_site(config))
 
 
+@app.command()
+def redetect(
+    run: str = typer.Option("latest", "--run"),
+    out: Path = typer.Option(Path("./out"), "--out"),
+    workers: Optional[int] = typer.Option(None, "--workers"),
+    force: bool = typer.Option(False, "--force"),
+) -> None:
+    """Re-run changed detectors over a previous run's snapshots and rewrite its report."""
+    from gpvb.redetect import redetect_run
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    try:
+        redetect_run(out, run_id=run, workers=workers, force=force)
+    except (FileNotFoundError, KeyError) as exc:
+        typer.secho(str(exc.args[0]), fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1) from exc
+
+
+@app.command("detectors")
+def list_detectors() -> None:
+    """List registered detectors with their inputs, cost class and gating."""
+    typer.echo(
+        f"{'id':<28} {'group':<15} {'cost':<10} {'version':<8} {'gated':<6} {'render':<7} inputs"
+    )
+    for spec in default_registry():
+        gated = "yes" if spec.prefilter else "no"
+        render = "yes" if spec.needs_render else "no"
+        typer.echo(
+            f"{spec.id:<28} {spec.group:<15} {spec.cost:<10} {spec.version:<8} {gated:<6} "
+            f"{render:<7} {', '.join(spec.inputs)}"
+        )
+
+
+@bench_app.command("detectors")
+def bench_detectors(
+    pages: int = typer.Option(50, "--pages"),
+    words: int = typer.Option(800, "--words"),
+    ad_count: int = typer.Option(3, "--ad-count"),
+    text_blocks: int = typer.Option(40, "--text-blocks"),
+    script_kb: int = typer.Option(20, "--script-kb"),
+    template_script_kb: int = typer.Option(20, "--template-script-kb"),
+    duplicate_rate: float = typer.Option(0.2, "--duplicate-rate"),
+    seed: int = typer.Option(1234, "--seed"),
+    repeat: int = typer.Option(3, "--repeat"),
+    only: Optional[str] = typer.Option(None, "--only"),
+    out: Path = typer.Option(Path("./bench/detectors.json"), "--out"),
+    baseline: Optional[Path] = typer.Option(None, "--baseline"),
+    tolerance: float = typer.Option(0.25, "--tolerance"),
+) -> None:
+    from gpvb.bench.corpus import CorpusSpec
+    from gpvb.bench.micro import (
+        compare_to_baseline,
+        format_table,
+        load_results,
+        run_micro_benchmarks,
+        write_results,
+    )
+
+    spec = CorpusSpec(
+        pages=pages,
+        words=words,
+        ad_count=ad_count,
+        text_blocks=text_blocks,
+        script_kb=script_kb,
+        template_script_kb=template_script_kb,
+        duplicate_rate=duplicate_rate,
+        seed=seed,
+    )
+    results = run_micro_benchmarks(spec, repeat=repeat, name_filter=only)
+    write_results(results, out)
+    comparison = None
+    if baseline:
+        comparison = compare_to_baseline(results, load_results(baseline), tolerance)
+    typer.echo(format_table(results, comparison))
+    typer.echo(f"Wrote {out}")
+    if comparison and any(row["regression"] for row in comparison):
+        typer.secho("Regressions beyond tolerance detected.", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+
+@bench_app.command("text")
+def bench_text(
+    fixtures: Path = typer.Option(Path("./tests/fixtures"), "--fixtures"),
+    synthetic_pages: int = typer.Option(50, "--synthetic-pages"),
+    seed: int = typer.Option(1234, "--seed"),
+    browser: bool = typer.Option(False, "--browser"),
+    repeat: int = typer.Option(3, "--repeat"),
+    out: Path = typer.Option(Path("./bench/text.json"), "--out"),
+) -> None:
+    """Compare text-extraction modes for speed and agreement with readability."""
+    from gpvb.bench.corpus import CorpusSpec, generate_corpus
+    from gpvb.bench.micro import write_results
+    from gpvb.bench.text_modes import (
+        TextDocument,
+        collect_browser_text,
+        format_text_report,
+        load_fixture_documents,
+        run_text_benchmark,
+    )
+
+    documents = load_fixture_documents(fixtures) if fixtures.is_dir() else []
+    if synthetic_pages:
+        spec = CorpusSpec(pages=synthetic_pages, seed=seed)
+        documents += [
+            TextDocument(name=page.url, html=page.html) for page in generate_corpus(spec)
+        ]
+    if browser:
+        collect_browser_text(documents)
+    results = run_text_benchmark(documents, repeat=repeat)
+    write_results(results, out)
+    typer.echo(format_text_report(results))
+    typer.echo(f"Wrote {out}")
+
+
+@bench_app.command("models")
+def bench_models(
+    pages: int = typer.Option(2000, "--pages"),
+    ads_per_page: int = typer.Option(8, "--ads-per-page"),
+    blocks_per_page: int = typer.Option(300, "--blocks-per-page"),
+    repeat: int = typer.Option(3, "--repeat"),
+    seed: int = typer.Option(1234, "--seed"),
+    out: Path = typer.Option(Path("./bench/models.json"), "--out"),
+) -> None:
+    """Compare memory and throughput of page/ad representations used on the crawl hot path."""
+    from gpvb.bench.micro import write_results
+    from gpvb.bench.models import format_model_report, run_model_benchmark
+
+    results = run_model_benchmark(
+        pages=pages,
+        ads_per_page=ads_per_page,
+        blocks_per_page=blocks_per_page,
+        repeat=repeat,
+        seed=seed,
+    )
+    write_results(results, out)
+    typer.echo(format_model_report(results))
+    typer.echo(f"Wrote {out}")
+
+
+def _site_spec(
+    pages: int,
+    words: int,
+    links_per_page: int,
+    ad_rate: float,
+    sitemap: str,
+    latency_ms: int,
+    latency_jitter_ms: int,
+    error_rate: float,
+    slow_asset_ms: int,
+    seed: int,
+):
+    from gpvb.bench.site import SiteSpec
+
+    return SiteSpec(
+        pages=pages,
+        words=words,
+        links_per_page=links_per_page,
+        ad_rate=ad_rate,
+        sitemap=_parse_bool(sitemap),
+        latency_ms=latency_ms,
+        latency_jitter_ms=latency_jitter_ms,
+        error_rate=error_rate,
+        slow_asset_ms=slow_asset_ms,
+        seed=seed,
+    )
+
+
+@bench_app.command("serve")
+def bench_serve(
+    pages: int = typer.Option(200, "--pages"),
+    words: int = typer.Option(600, "--words"),
+    links_per_page: int = typer.Option(8, "--links-per-page"),
+    ad_rate: float = typer.Option(0.7, "--ad-rate"),
+    sitemap: str = typer.Option("true", "--sitemap"),
+    latency_ms: int = typer.Option(0, "--latency-ms"),
+    latency_jitter_ms: int = typer.Option(0, "--latency-jitter-ms"),
+    error_rate: float = typer.Option(0.0, "--error-rate"),
+    slow_asset_ms: int = typer.Option(0, "--slow-asset-ms"),
+    seed: int = typer.Option(1234, "--seed"),
+    port: int = typer.Option(8765, "--port"),
+) -> None:
+    from gpvb.bench.site import SyntheticSite
+
+    spec = _site_spec(
+        pages, words, links_per_page, ad_rate, sitemap, latency_ms, latency_jitter_ms,
+        error_rate, slow_asset_ms, seed,
+    )
+    with SyntheticSite(spec, port=port) as site:
+        typer.echo(f"Serving synthetic site at {site.url}/ (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+@bench_app.command("crawl")
+def bench_crawl(
+    pages: int = typer.Option(200, "--pages"),
+    words: int = typer.Option(600, "--words"),
+    links_per_page: int = typer.Option(8, "--links-per-page"),
+    ad_rate: float = typer.Option(0.7, "--ad-rate"),
+    sitemap: str = typer.Option("true", "--sitemap"),
+    latency_ms: int = typer.Option(0, "--latency-ms"),
+    latency_jitter_ms: int = typer.Option(0, "--latency-jitter-ms"),
+    error_rate: float = typer.Option(0.0, "--error-rate"),
+    slow_asset_ms: int = typer.Option(0, "--slow-asset-ms"),
+    seed: int = typer.Option(1234, "--seed"),
+    concurrency: int = typer.Option(6, "--concurrency"),
+    rate_limit_ms: int = typer.Option(0, "--rate-limit-ms"),
+    browsers: int = typer.Option(1, "--browsers"),
+    out: Path = typer.Option(Path("./bench/crawl.json"), "--out"),
+) -> None:
+    from gpvb.bench.e2e import format_crawl_report, run_crawl_benchmark
+    from gpvb.bench.micro import write_results
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s | %(levelname)s | %(message)s")
+    spec = _site_spec(
+        pages, words, links_per_page, ad_rate, sitemap, latency_ms, latency_jitter_ms,
+        error_rate, slow_asset_ms, seed,
+    )
+    result = run_crawl_benchmark(
+        spec, concurrency=concurrency, rate_limit_ms=rate_limit_ms, browsers=browsers
+    )
+    write_results(result, out)
+    typer.echo(format_crawl_report(result))
+    typer.echo(f"Wrote {out}")
+
+
+
+
 if __name__ == "__main__":
     app()
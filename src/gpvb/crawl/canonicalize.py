@@ -1,12 +1,189 @@
 from __future__ import annotations
 
-from urllib.parse import urlparse, urlunparse
+import re
+from dataclasses import dataclass, fields, replace
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+
+TRACKING_PARAMS = (
+    "utm_*",
+    "fbclid",
+    "gclid",
+    "gclsrc",
+    "dclid",
+    "gbraid",
+    "wbraid",
+    "msclkid",
+    "yclid",
+    "twclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+    "_hsenc",
+    "_hsmi",
+)
+TRAILING_SLASH_POLICIES = ("keep", "strip", "add")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+CACHE_SIZE = 65536
+
+_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+_PATH_SAFE = "/:@!$&'()*+,;=%-._~"
+
+
+@dataclass(frozen=True)
+class NormalizationRules:
+    """How URLs are rewritten before dedupe; see ``URLNormalizer``.
+
+    ``drop_params`` and ``keep_params`` are case-insensitive glob patterns; a parameter is
+    dropped when it matches ``drop_params`` and not ``keep_params``. ``index_files`` lists
+    directory index names (``index.html``) to strip from the end of a path.
+    """
+
+    drop_query: bool = False
+    drop_params: Tuple[str, ...] = TRACKING_PARAMS
+    keep_params: Tuple[str, ...] = ()
+    sort_query: bool = True
+    trailing_slash: str = "keep"
+    index_files: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.trailing_slash not in TRAILING_SLASH_POLICIES:
+            raise ValueError(
+                f"trailing_slash must be one of {', '.join(TRAILING_SLASH_POLICIES)}"
+            )
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "NormalizationRules":
+        known = {field.name for field in fields(self)}
+        unknown = sorted(set(overrides) - known)
+        if unknown:
+            raise ValueError(f"Unknown URL rule(s): {', '.join(unknown)}")
+        values = {
+            key: tuple(value) if isinstance(value, (list, tuple)) else value
+            for key, value in overrides.items()
+        }
+        return replace(self, **values)
+
+    def drops(self, name: str) -> bool:
+        lowered = name.lower()
+        if any(fnmatchcase(lowered, pattern.lower()) for pattern in self.keep_params):
+            return False
+        return any(fnmatchcase(lowered, pattern.lower()) for pattern in self.drop_params)
+
+
+class URLNormalizer:
+    """Normalizes URLs so trivially different spellings of one page dedupe to a single key.
+
+    Scheme and host are lowercased, default ports removed, percent-escapes made consistent
+    (unreserved characters decoded, the rest upper-case encoded), tracking parameters dropped
+    and the query sorted, with trailing-slash and index-file policies applied last. ``sites``
+    maps a host to rule overrides for that host. Results are memoized in an LRU because BFS
+    normalizes the same links over and over.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[NormalizationRules] = None,
+        sites: Optional[Dict[str, NormalizationRules]] = None,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        self.rules = rules or NormalizationRules()
+        self.sites = {host.lower(): site_rules for host, site_rules in (sites or {}).items()}
+        self.normalize: Callable[[str], str] = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **defaults: Any) -> "URLNormalizer":
+        """Build from ``{"<rule>": ..., "sites": {"<host>": {"<rule>": ...}}}``.
+
+        ``defaults`` are applied first, so explicit rules in ``data`` win.
+        """
+        overrides = dict(data)
+        sites = overrides.pop("sites", {}) or {}
+        rules = NormalizationRules().with_overrides(defaults).with_overrides(overrides)
+        return cls(rules, {host: rules.with_overrides(site) for host, site in sites.items()})
+
+    def rules_for(self, host: str) -> NormalizationRules:
+        return self.sites.get(host, self.rules)
+
+    def cache_info(self) -> Any:
+        return self.normalize.cache_info()  # type: ignore[attr-defined]
+
+    def _normalize(self, url: str) -> str:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").rstrip(".")
+        rules = self.rules_for(host)
+        netloc = f"[{host}]" if ":" in host else host
+        if parts.username or parts.password:
+            credentials = parts.username or ""
+            if parts.password:
+                credentials += f":{parts.password}"
+            netloc = f"{credentials}@{netloc}"
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        if port and port != DEFAULT_PORTS.get(scheme):
+            netloc += f":{port}"
+        path = _normalize_path(parts.path or "/", rules)
+        query = "" if rules.drop_query else _normalize_query(parts.query, rules)
+        return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def _normalize_escapes(value: str, safe: str) -> str:
+    decoded = _ESCAPE.sub(
+        lambda match: chr(int(match.group(1), 16))
+        if chr(int(match.group(1), 16)) in _UNRESERVED
+        else f"%{match.group(1).upper()}",
+        value,
+    )
+    return quote(decoded, safe=safe)
+
+
+def _normalize_path(path: str, rules: NormalizationRules) -> str:
+    path = _normalize_escapes(path, _PATH_SAFE)
+    if rules.index_files:
+        head, _, last = path.rpartition("/")
+        if last.lower() in {name.lower() for name in rules.index_files}:
+            path = head + "/"
+    if rules.trailing_slash == "strip" and len(path) > 1:
+        path = path.rstrip("/") or "/"
+    elif rules.trailing_slash == "add" and not path.endswith("/"):
+        last = path.rsplit("/", 1)[-1]
+        if "." not in last:
+            path += "/"
+    return path
+
+
+def _normalize_query(query: str, rules: NormalizationRules) -> str:
+    if not query:
+        return ""
+    pairs = [
+        (key, value)
+        for key, value in parse_qsl(query, keep_blank_values=True)
+        if not rules.drops(key)
+    ]
+    if rules.sort_query:
+        pairs.sort()
+    return urlencode(pairs, quote_via=quote, safe="-._~")
+
+
+_default_normalizers: Dict[bool, URLNormalizer] = {}
+
+
+def default_normalizer(ignore_querystrings: bool = False) -> URLNormalizer:
+    """A shared normalizer with the default rules."""
+    normalizer = _default_normalizers.get(ignore_querystrings)
+    if normalizer is None:
+        normalizer = URLNormalizer(NormalizationRules(drop_query=ignore_querystrings))
+        _default_normalizers[ignore_querystrings] = normalizer
+    return normalizer
 
 
 def canonicalize_url(url: str, ignore_querystrings: bool) -> str:
-    parsed = urlparse(url)
-    path = parsed.path or "/"
-    query = "" if ignore_querystrings else parsed.query
-    fragment = ""
-    normalized = parsed._replace(path=path, query=query, fragment=fragment)
-    return urlunparse(normalized)
+    return default_normalizer(ignore_querystrings).normalize(url)
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from collections import deque
+import asyncio
+import heapq
+import itertools
+import math
+from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Deque, Iterable, Optional, Set, Tuple
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from gpvb.crawl.sitemap import SitemapEntry
 
 
 @dataclass
@@ -33,3 +41,174 @@ class Frontier:
 
     def __len__(self) -> int:
         return len(self._queue)
+
+
+# Weights of the terms in ``PriorityFrontier.score``.
+SITEMAP_WEIGHT = 1.0
+FRESHNESS_WEIGHT = 0.5
+IN_DEGREE_WEIGHT = 0.5
+AD_WEIGHT = 1.0
+DEPTH_WEIGHT = 0.25
+DEFAULT_SITEMAP_PRIORITY = 0.5
+FRESHNESS_HALF_LIFE_DAYS = 30.0
+
+
+def url_section(url: str) -> str:
+    """The first path segment of ``url``, which groups pages that tend to share a template."""
+    segment = urlsplit(url).path.strip("/").split("/", 1)[0]
+    return f"/{segment}" if segment else "/"
+
+
+def freshness(lastmod: Optional[str], now: datetime) -> float:
+    """1.0 for a page modified now, halving every ``FRESHNESS_HALF_LIFE_DAYS``; 0 if unknown."""
+    if not lastmod:
+        return 0.0
+    try:
+        modified = datetime.fromisoformat(lastmod.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    days = max(0.0, (now - modified).total_seconds() / 86400)
+    return 0.5 ** (days / FRESHNESS_HALF_LIFE_DAYS)
+
+
+class CostModel:
+    """Expected seconds to process a URL: an EWMA of observed times per section, then site-wide."""
+
+    def __init__(self, alpha: float = 0.3, section: Callable[[str], str] = url_section) -> None:
+        self.alpha = alpha
+        self._section = section
+        self._sections: Dict[str, float] = {}
+        self._overall: Optional[float] = None
+
+    def observe(self, url: str, seconds: float) -> None:
+        key = self._section(url)
+        previous = self._sections.get(key)
+        self._sections[key] = seconds if previous is None else _ewma(previous, seconds, self.alpha)
+        self._overall = (
+            seconds if self._overall is None else _ewma(self._overall, seconds, self.alpha)
+        )
+
+    def expected(self, url: str) -> float:
+        """0 until anything has been observed, so the first pages always start."""
+        return self._sections.get(self._section(url), self._overall or 0.0)
+
+
+def _ewma(previous: float, value: float, alpha: float) -> float:
+    return previous + alpha * (value - previous)
+
+
+class _Pending:
+    """Queued items per URL plus shutdown sentinels; ``len`` is what ``asyncio.Queue`` sees."""
+
+    def __init__(self) -> None:
+        self.depths: Dict[str, List[int]] = {}
+        self.sentinels = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count + self.sentinels
+
+
+class PriorityFrontier(asyncio.Queue):
+    """An ``asyncio.Queue`` of ``(url, depth)`` items that hands out the most important URL first.
+
+    A URL's score adds its sitemap priority and ``lastmod`` freshness, the log of how many crawled
+    pages link to it, and how likely it is to carry ads (the ad rate of rendered pages in its
+    section, raised when an ad-bearing page links to it), minus a depth penalty. Scores are kept
+    in a heap; links found later push a fresh entry, and an entry whose score has dropped since
+    it was pushed is re-queued when it reaches the top. URLs come out passed through ``key``.
+    Items and ``None`` sentinels follow the usual queue protocol, so ``join``/``task_done`` work
+    unchanged.
+    """
+
+    def __init__(
+        self,
+        sitemap: Iterable[SitemapEntry] = (),
+        key: Callable[[str], str] = lambda url: url,
+        section: Callable[[str], str] = url_section,
+        now: Optional[datetime] = None,
+    ) -> None:
+        self._key = key
+        self._section = section
+        self._now = now or datetime.now(timezone.utc)
+        self._hints: Dict[str, SitemapEntry] = {key(entry.url): entry for entry in sitemap}
+        self._in_degree: Dict[str, int] = defaultdict(int)
+        self._ad_referrers: Dict[str, int] = defaultdict(int)
+        self._ad_pages: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        self._generation: Dict[str, int] = defaultdict(int)
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        super().__init__()
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = _Pending()
+
+    def _put(self, item: Optional[Tuple[str, int]]) -> None:
+        if item is None:
+            self._queue.sentinels += 1
+            return
+        url, depth = self._key(item[0]), item[1]
+        depths = self._queue.depths.setdefault(url, [])
+        depths.append(depth)
+        self._queue.count += 1
+        if len(depths) == 1 or depth < min(depths[:-1]):
+            self._push(url)
+
+    def _get(self) -> Optional[Tuple[str, int]]:
+        pending = self._queue
+        while self._heap:
+            negative, _, url, generation = heapq.heappop(self._heap)
+            if generation != self._generation[url] or url not in pending.depths:
+                continue
+            score = self.score(url, min(pending.depths[url]))
+            if self._heap and score < -negative - 1e-9 and score < -self._heap[0][0]:
+                self._push(url, score)
+                continue
+            depths = pending.depths[url]
+            depth = min(depths)
+            depths.remove(depth)
+            pending.count -= 1
+            if depths:
+                self._push(url)
+            else:
+                del pending.depths[url]
+            return url, depth
+        pending.sentinels -= 1
+        return None
+
+    def _push(self, url: str, score: Optional[float] = None) -> None:
+        self._generation[url] += 1
+        if score is None:
+            score = self.score(url, min(self._queue.depths[url]))
+        heapq.heappush(self._heap, (-score, next(self._sequence), url, self._generation[url]))
+
+    def score(self, url: str, depth: int = 0) -> float:
+        hint = self._hints.get(self._key(url))
+        priority = hint.priority if hint and hint.priority is not None else None
+        score = SITEMAP_WEIGHT * (DEFAULT_SITEMAP_PRIORITY if priority is None else priority)
+        score += FRESHNESS_WEIGHT * freshness(hint.lastmod if hint else None, self._now)
+        score += IN_DEGREE_WEIGHT * math.log1p(self._in_degree[self._key(url)])
+        score += AD_WEIGHT * self.ad_likelihood(url)
+        return score - DEPTH_WEIGHT * depth
+
+    def ad_likelihood(self, url: str) -> float:
+        ads, pages = self._ad_pages[self._section(url)]
+        likelihood = (ads + 0.5) / (pages + 1)
+        if self._ad_referrers[self._key(url)]:
+            likelihood = (likelihood + 1.0) / 2
+        return likelihood
+
+    def record_page(self, url: str, has_ads: bool, links: Iterable[str] = ()) -> None:
+        """Learn from a crawled page: its section's ad rate and the in-degree of its links."""
+        stats = self._ad_pages[self._section(url)]
+        stats[0] += int(has_ads)
+        stats[1] += 1
+        for link in set(links):
+            key = self._key(link)
+            self._in_degree[key] += 1
+            if has_ads:
+                self._ad_referrers[key] += 1
+            if key in self._queue.depths:
+                self._push(key)
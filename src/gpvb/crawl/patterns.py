@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from gpvb.detect.text import simhash, simhash_similarity
+from gpvb.models import FindingRate, PageResult, PatternEstimate
+
+
+FAN_OUT = 25
+WILSON_Z = 1.96
+
+_NUMERIC = re.compile(r"^\d+$")
+_HASH = re.compile(r"^(?:[0-9a-f]{8,}|[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12})$", re.I)
+_HAS_DIGIT = re.compile(r"\d")
+_TAG = re.compile(r"<([a-zA-Z][\w-]*)")
+
+
+def classify_segment(segment: str) -> Optional[str]:
+    """The placeholder for a path segment that is obviously an identifier, else None."""
+    stem, dot, extension = segment.rpartition(".")
+    if not dot or "/" in extension or len(extension) > 5:
+        stem, extension = segment, ""
+    suffix = f".{extension}" if extension else ""
+    if _NUMERIC.match(stem):
+        return "{id}" + suffix
+    if _HASH.match(stem):
+        return "{hash}" + suffix
+    if _HAS_DIGIT.search(stem) and ("-" in stem or "_" in stem):
+        return "{slug}" + suffix
+    if stem.count("-") >= 3:
+        return "{slug}" + suffix
+    return None
+
+
+@dataclass
+class PatternStats:
+    discovered: int = 0
+    sampled: int = 0
+
+
+class PatternSampler:
+    """Groups URLs into path/query patterns as they are discovered and admits K per pattern.
+
+    Segments that look like identifiers (numbers, hashes, slugs with digits) become
+    placeholders straight away. Any other path position becomes ``{slug}`` once more than
+    ``fan_out`` distinct literal values have been seen under the same prefix, so catalogues
+    with word-only slugs still collapse. Query keys are kept, their values dropped.
+    """
+
+    def __init__(self, per_pattern: int, fan_out: int = FAN_OUT) -> None:
+        self.per_pattern = per_pattern
+        self.fan_out = fan_out
+        self.patterns: Dict[str, PatternStats] = defaultdict(PatternStats)
+        self.url_patterns: Dict[str, str] = {}
+        self._admitted: Set[str] = set()
+        self._literals: Dict[str, Set[str]] = defaultdict(set)
+
+    def pattern(self, url: str) -> str:
+        known = self.url_patterns.get(url)
+        if known is not None:
+            return known
+        parts = urlsplit(url)
+        prefix = ""
+        for segment in [segment for segment in parts.path.split("/") if segment]:
+            placeholder = classify_segment(segment)
+            if placeholder is None:
+                literals = self._literals[prefix]
+                if segment in literals or len(literals) < self.fan_out:
+                    literals.add(segment)
+                    placeholder = segment
+                else:
+                    placeholder = "{slug}"
+            prefix += "/" + placeholder
+        pattern = prefix or "/"
+        if parts.path.endswith("/") and pattern != "/":
+            pattern += "/"
+        keys = sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)})
+        if keys:
+            pattern += "?" + "&".join(keys)
+        return pattern
+
+    def admit(self, url: str) -> Tuple[str, bool]:
+        """Record ``url`` and whether it is among the first K of its pattern to be rendered."""
+        if url in self.url_patterns:
+            return self.url_patterns[url], url in self._admitted
+        pattern = self.pattern(url)
+        self.url_patterns[url] = pattern
+        stats = self.patterns[pattern]
+        stats.discovered += 1
+        if stats.sampled >= self.per_pattern:
+            return pattern, False
+        stats.sampled += 1
+        self._admitted.add(url)
+        return pattern, True
+
+    def discovered(self) -> Dict[str, int]:
+        return {pattern: stats.discovered for pattern, stats in self.patterns.items()}
+
+
+def wilson_interval(successes: int, trials: int, z: float = WILSON_Z) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion; (0, 1) when there are no trials."""
+    if trials <= 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def structure_fingerprint(html: str) -> int:
+    """Simhash over the page's tag sequence, which pages rendered from one template share."""
+    return simhash(" ".join(_TAG.findall(html)))
+
+
+def cohesion(pages: List[PageResult]) -> Optional[float]:
+    """Mean pairwise structural similarity of ``pages``; None with fewer than two pages."""
+    fingerprints = [structure_fingerprint(page.html) for page in pages if page.html]
+    pairs = list(combinations(fingerprints, 2))
+    if not pairs:
+        return None
+    return round(sum(simhash_similarity(a, b) for a, b in pairs) / len(pairs), 3)
+
+
+def estimate_patterns(
+    pages: List[PageResult], discovered: Dict[str, int], z: float = WILSON_Z
+) -> List[PatternEstimate]:
+    """Extrapolate each pattern's per-detector finding rate from its sampled pages."""
+    by_pattern: Dict[str, List[PageResult]] = defaultdict(list)
+    for page in pages:
+        if page.url_pattern and not page.skipped_reason:
+            by_pattern[page.url_pattern].append(page)
+    estimates = []
+    for pattern, total in sorted(discovered.items(), key=lambda item: (-item[1], item[0])):
+        sampled = by_pattern.get(pattern, [])
+        estimate = PatternEstimate(
+            pattern=pattern, discovered=total, sampled=len(sampled), cohesion=cohesion(sampled)
+        )
+        hits: Dict[str, int] = defaultdict(int)
+        for page in sampled:
+            for detector in {finding.detector for finding in page.findings}:
+                hits[detector] += 1
+        for detector, count in sorted(hits.items()):
+            low, high = wilson_interval(count, len(sampled), z)
+            rate = count / len(sampled)
+            estimate.findings[detector] = FindingRate(
+                pages=count,
+                rate=round(rate, 3),
+                low=round(low, 3),
+                high=round(high, 3),
+                estimated_pages=round(rate * total),
+                estimated_low=max(count, math.floor(low * total)),
+                estimated_high=min(total, math.ceil(high * total)),
+            )
+        estimates.append(estimate)
+    return estimates
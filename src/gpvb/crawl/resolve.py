@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import httpx
+
+from gpvb.crawl.canonicalize import default_normalizer
+
+
+HEAD_BYTES = 32 * 1024
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+
+_LINK_TAG = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_REL_CANONICAL = re.compile(r"\brel\s*=\s*['\"]?canonical\b", re.IGNORECASE)
+_HREF = re.compile(r"\bhref\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))", re.IGNORECASE)
+
+
+@dataclass
+class ResolvedURL:
+    """Where a URL ends up before any rendering: redirect target, content type and canonical."""
+
+    url: str
+    final_url: str
+    status: int
+    content_type: str = ""
+    canonical: Optional[str] = None
+    redirects: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def is_html(self) -> bool:
+        # Failed requests and error pages go on to the renderer, which records what happened.
+        if self.error or self.status >= 400 or not self.content_type:
+            return True
+        return self.content_type.split(";")[0].strip().lower() in HTML_TYPES
+
+    @property
+    def site_canonical(self) -> Optional[str]:
+        """The canonical link, ignored when it points at another host (syndicated content)."""
+        if self.canonical and urlparse(self.canonical).netloc == urlparse(self.final_url).netloc:
+            return self.canonical
+        return None
+
+    def target(self, normalize: Optional[Callable[[str], str]] = None) -> str:
+        """The URL every alias of this page collapses to."""
+        normalize = normalize or default_normalizer().normalize
+        return normalize(self.site_canonical or self.final_url)
+
+    def alias_reason(self, normalize: Optional[Callable[[str], str]] = None) -> str:
+        normalize = normalize or default_normalizer().normalize
+        final = normalize(self.final_url)
+        if self.site_canonical and normalize(self.site_canonical) != final:
+            return "canonical"
+        if final != normalize(self.url):
+            return "redirect"
+        return "duplicate"
+
+
+def canonical_link(html: str, base_url: str) -> Optional[str]:
+    """The absolute ``rel=canonical`` href from the start of a document, if any."""
+    for tag in _LINK_TAG.findall(html):
+        if not _REL_CANONICAL.search(tag):
+            continue
+        match = _HREF.search(tag)
+        if match:
+            href = next(group for group in match.groups() if group is not None).strip()
+            if href:
+                return urljoin(base_url, href)
+    return None
+
+
+def resolved_from_response(
+    url: str,
+    final_url: str,
+    status: int,
+    headers: Dict[str, str],
+    head_html: str,
+    redirects: Optional[List[str]] = None,
+) -> ResolvedURL:
+    content_type = headers.get("content-type", "")
+    canonical = None
+    if status < 400 and head_html:
+        canonical = canonical_link(head_html, final_url)
+    return ResolvedURL(
+        url=url,
+        final_url=final_url,
+        status=status,
+        content_type=content_type,
+        canonical=canonical,
+        redirects=redirects or [],
+    )
+
+
+async def resolve_url(
+    client: httpx.AsyncClient, url: str, max_bytes: int = HEAD_BYTES
+) -> ResolvedURL:
+    """Follow redirects with a ranged GET, reading at most ``max_bytes`` of an HTML body.
+
+    One ranged GET answers everything a HEAD would (status, final URL, content type) and also
+    yields the ``<head>`` needed for the canonical link. Servers that ignore ``Range`` still only
+    have ``max_bytes`` read before the connection is released.
+    """
+    headers = {"Range": f"bytes=0-{max_bytes - 1}"}
+    try:
+        async with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+            response_headers = {key.lower(): value for key, value in response.headers.items()}
+            resolved = resolved_from_response(
+                url,
+                str(response.url),
+                200 if response.status_code == 206 else response.status_code,
+                response_headers,
+                "",
+                [str(item.url) for item in response.history],
+            )
+            if resolved.status < 400 and resolved.is_html:
+                head = bytearray()
+                async for chunk in response.aiter_bytes():
+                    head.extend(chunk)
+                    if len(head) >= max_bytes or b"</head>" in head.lower():
+                        break
+                encoding = response.encoding or "utf-8"
+                resolved.canonical = canonical_link(
+                    bytes(head[:max_bytes]).decode(encoding, errors="replace"), resolved.final_url
+                )
+    except httpx.HTTPError as exc:
+        return ResolvedURL(url=url, final_url=url, status=0, error=type(exc).__name__)
+    return resolved
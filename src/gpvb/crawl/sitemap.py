@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import urljoin
 
 import httpx
 from bs4 import BeautifulSoup
 
 
+@dataclass
+class SitemapEntry:
+    url: str
+    priority: Optional[float] = None
+    lastmod: Optional[str] = None
+
+
 async def fetch_sitemap_urls(client: httpx.AsyncClient, base_url: str) -> List[str]:
+    return [entry.url for entry in await fetch_sitemap_entries(client, base_url)]
+
+
+async def fetch_sitemap_entries(client: httpx.AsyncClient, base_url: str) -> List[SitemapEntry]:
     candidates = [
         "/sitemap.xml",
         "/sitemap_index.xml",
         "/sitemap_post.xml",
         "/sitemap_page.xml",
     ]
-    urls: List[str] = []
+    entries: List[SitemapEntry] = []
     for path in candidates:
         sitemap_url = urljoin(base_url, path)
         try:
@@ -22,43 +34,69 @@ async def fetch_sitemap_urls(client: httpx.AsyncClient, base_url: str) -> List[s
             response.raise_for_status()
         except httpx.HTTPError:
             continue
-        urls.extend(parse_sitemap(response.text))
-    return list(dict.fromkeys(urls))
+        entries.extend(parse_sitemap_entries(response.text))
+    return _dedupe(entries)
 
 
 def parse_sitemap(xml_text: str) -> List[str]:
+    return [entry.url for entry in parse_sitemap_entries(xml_text)]
+
+
+def parse_sitemap_entries(xml_text: str) -> List[SitemapEntry]:
+    """``<loc>`` entries of a urlset or sitemap index, with ``<priority>`` and ``<lastmod>``."""
     soup = BeautifulSoup(xml_text, "xml")
-    if soup.find("sitemapindex"):
-        urls = []
-        for sitemap in soup.find_all("sitemap"):
-            loc = sitemap.find("loc")
-            if loc and loc.text:
-                urls.append(loc.text.strip())
-        return urls
-    urls = []
-    for url in soup.find_all("url"):
-        loc = url.find("loc")
-        if loc and loc.text:
-            urls.append(loc.text.strip())
-    return urls
+    tag = "sitemap" if soup.find("sitemapindex") else "url"
+    entries = []
+    for item in soup.find_all(tag):
+        loc = item.find("loc")
+        if not (loc and loc.text):
+            continue
+        priority = item.find("priority")
+        lastmod = item.find("lastmod")
+        entries.append(
+            SitemapEntry(
+                url=loc.text.strip(),
+                priority=_parse_priority(priority.text) if priority else None,
+                lastmod=(lastmod.text.strip() or None) if lastmod else None,
+            )
+        )
+    return entries
+
+
+def _parse_priority(value: str) -> Optional[float]:
+    try:
+        return min(1.0, max(0.0, float(value.strip())))
+    except ValueError:
+        return None
+
+
+def _dedupe(entries: List[SitemapEntry]) -> List[SitemapEntry]:
+    first: Dict[str, SitemapEntry] = {}
+    for entry in entries:
+        first.setdefault(entry.url, entry)
+    return list(first.values())
 
 
 async def expand_sitemaps(client: httpx.AsyncClient, base_url: str) -> List[str]:
-    seeds = await fetch_sitemap_urls(client, base_url)
+    return [entry.url for entry in await expand_sitemap_entries(client, base_url)]
+
+
+async def expand_sitemap_entries(client: httpx.AsyncClient, base_url: str) -> List[SitemapEntry]:
+    seeds = await fetch_sitemap_entries(client, base_url)
     if not seeds:
         return []
-    final_urls: List[str] = []
+    final_entries: List[SitemapEntry] = []
     for entry in seeds:
-        if entry.endswith(".xml"):
+        if entry.url.endswith(".xml"):
             try:
-                response = await client.get(entry)
+                response = await client.get(entry.url)
                 response.raise_for_status()
             except httpx.HTTPError:
                 continue
-            final_urls.extend(parse_sitemap(response.text))
+            final_entries.extend(parse_sitemap_entries(response.text))
         else:
-            final_urls.append(entry)
-    return list(dict.fromkeys(final_urls))
+            final_entries.append(entry)
+    return _dedupe(final_entries)
 
 
 def extract_links(html: str, base_url: str) -> Iterable[str]:
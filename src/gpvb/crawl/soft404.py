@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import html as html_lib
+import re
+import secrets
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+from gpvb.crawl.patterns import structure_fingerprint
+from gpvb.detect.text import extract_visible_text, simhash, simhash_similarity
+
+
+PROBE_PREFIX = "gpvb-not-found-"
+# Minimum simhash similarity of the tag sequence and of the visible text to the probe page.
+TEMPLATE_SIMILARITY = 0.9
+TEXT_SIMILARITY = 0.9
+# A page titled like the probe needs less text similarity, since its body may quote the URL.
+TITLED_TEXT_SIMILARITY = 0.8
+NOT_FOUND_STATUSES = (404, 410)
+
+_TITLE = re.compile(r"<title\b[^>]*>([^<]{0,512})", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class NotFoundProfile:
+    """What the site serves for a URL that cannot exist, from one probe request.
+
+    Sites that answer unknown URLs with a ``200`` page ("soft 404s") are recognised by that
+    page's status, title and template: crawled pages that match are not real content.
+    """
+
+    status: int
+    title: str
+    structure: int
+    text: int
+
+    @classmethod
+    def from_response(cls, status: int, html: str, token: str = "") -> "NotFoundProfile":
+        if token:
+            html = html.replace(token, "")
+        return cls(
+            status=status,
+            title=page_title(html),
+            structure=structure_fingerprint(html),
+            text=simhash(extract_visible_text(html)),
+        )
+
+    def matches(self, status: int, html: str) -> bool:
+        if status != self.status or status in NOT_FOUND_STATUSES:
+            return False
+        if simhash_similarity(structure_fingerprint(html), self.structure) < TEMPLATE_SIMILARITY:
+            return False
+        similarity = simhash_similarity(simhash(extract_visible_text(html)), self.text)
+        if self.title and page_title(html) == self.title:
+            return similarity >= TITLED_TEXT_SIMILARITY
+        return similarity >= TEXT_SIMILARITY
+
+
+async def probe_not_found(
+    client: httpx.AsyncClient, site: str, token: Optional[str] = None
+) -> Optional[NotFoundProfile]:
+    """Fetch a random URL (or ``token``) on ``site``; None when the request fails."""
+    token = token or PROBE_PREFIX + secrets.token_hex(8)
+    try:
+        response = await client.get(urljoin(site, f"/{token}"), follow_redirects=True)
+    except httpx.HTTPError:
+        return None
+    return NotFoundProfile.from_response(response.status_code, response.text, token)
+
+
+def not_found_reason(
+    status: int, html: str, profile: Optional[NotFoundProfile] = None
+) -> Optional[str]:
+    """``skipped_reason`` for a page that is a (soft) 404, or None for real content."""
+    if status in NOT_FOUND_STATUSES:
+        return f"not_found: {status}"
+    if profile is not None and profile.matches(status, html):
+        return "soft_404"
+    return None
+
+
+def page_title(html: str) -> str:
+    match = _TITLE.search(html)
+    if not match:
+        return ""
+    return _SPACE.sub(" ", html_lib.unescape(match.group(1))).strip().lower()
+
+
+def content_key(html: str, text: str, urls: Iterable[str] = ()) -> bytes:
+    """Hash of a rendered page that is equal for byte-identical pages served at different URLs.
+
+    The page's own URLs (and their paths) are blanked and whitespace is collapsed first, so
+    canonical links or "no results for /path" messages do not make copies look different.
+    """
+    for url in urls:
+        path = urlsplit(url).path
+        for value in (url, path if len(path) > 1 else ""):
+            if value:
+                html = html.replace(value, "")
+                text = text.replace(value, "")
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_SPACE.sub(" ", html).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(_SPACE.sub(" ", text).encode("utf-8"))
+    return digest.digest()
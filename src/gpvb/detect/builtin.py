@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import re
+
+from gpvb.detect import detectors
+from gpvb.detect.program_policy.autogenerated_content import (
+    AUTOGENERATED_CLUSTER_CONTENT,
+    AUTOGENERATED_SIMILARITY_PATTERN,
+    AUTOGENERATED_SINGLE_PAGE_SIGNALS,
+    detect_autogenerated_findings,
+)
+from gpvb.detect.program_policy.deceptive_representation import (
+    DECEPTIVE_AFFILIATION_CLAIMS,
+    DECEPTIVE_DISCLAIMER_LOW_VISIBILITY,
+    detect_deceptive_representation,
+)
+from gpvb.detect.program_policy.invalid_traffic_signals import (
+    INVALID_TRAFFIC_ENCOURAGEMENT,
+    INVALID_TRAFFIC_HIGH_DENSITY,
+    INVALID_TRAFFIC_RELOAD_PATTERNS,
+    detect_invalid_traffic_signals,
+)
+from gpvb.detect.program_policy.malware_risk import (
+    MALWARE_FORCED_DOWNLOAD,
+    MALWARE_MISLEADING_DOWNLOAD_UI,
+    MALWARE_SHORTENER_USAGE,
+    detect_malware_risk,
+)
+from gpvb.detect.program_policy.manipulative_ad_placement import (
+    AD_LABELING_ISSUES,
+    MANIPULATIVE_AD_STYLING,
+    detect_manipulative_ad_placement,
+)
+from gpvb.detect.program_policy.traffic_source_abuse import (
+    TRAFFIC_SOURCE_FORCED_REDIRECTS,
+    TRAFFIC_SOURCE_INCENTIVIZED,
+    detect_traffic_source_abuse,
+)
+from gpvb.detect.program_policy.ugc_risk import (
+    UGC_HIGH_RISK_TERMS,
+    UGC_UNMODERATED,
+    UGC_UNMODERATED_SPAM,
+    _has_comment_section,
+    detect_ugc_risk,
+)
+from gpvb.detect.registry import DetectorRegistry, DetectorSpec
+from gpvb.models import PageResult
+
+
+AD_MARKERS = ("adsbygoogle", "googlesyndication", "google_ads", "data-ad-client", "data-ad-slot")
+BRAND_PATTERN = re.compile(r"google|irs|government", re.IGNORECASE)
+
+
+def _has_ads(page: PageResult) -> bool:
+    return bool(page.ad_elements)
+
+
+def _has_ads_or_ad_markup(page: PageResult) -> bool:
+    return bool(page.ad_elements) or any(marker in page.html for marker in AD_MARKERS)
+
+
+def _mentions_brand(page: PageResult) -> bool:
+    return bool(page.text and BRAND_PATTERN.search(page.text))
+
+
+def _has_comments(page: PageResult) -> bool:
+    return _has_comment_section(page.html)
+
+
+BUILTIN_DETECTORS = [
+    DetectorSpec(
+        "thin_content", detectors.detect_thin_content, findings=(detectors.THIN_CONTENT,)
+    ),
+    DetectorSpec(
+        "ads_vs_content",
+        detectors.detect_ads_vs_content,
+        needs_render=True,
+        findings=(detectors.ADS_VS_CONTENT,),
+    ),
+    DetectorSpec(
+        "ads_interfering",
+        detectors.detect_ads_interfering,
+        prefilter=_has_ads,
+        needs_render=True,
+        findings=(detectors.ADS_INTERFERING,),
+    ),
+    DetectorSpec(
+        "dead_end",
+        detectors.detect_dead_end,
+        inputs=("page", "overlays"),
+        prefilter=_has_ads,
+        needs_render=True,
+        findings=(detectors.DEAD_END_AD,),
+    ),
+    DetectorSpec(
+        "language_issue",
+        detectors.detect_language_issue,
+        inputs=("page", "soup", "language"),
+        cost="moderate",
+        version="2",
+        findings=(detectors.LANGUAGE_ISSUE,),
+    ),
+    DetectorSpec(
+        "abusive_experience",
+        detectors.detect_abusive_experience,
+        inputs=("page", "mobile_flags"),
+        needs_render=True,
+        findings=(detectors.ABUSIVE_EXPERIENCE,),
+    ),
+    DetectorSpec(
+        "invalid_traffic_signals",
+        detect_invalid_traffic_signals,
+        inputs=("page", "context"),
+        cost="moderate",
+        group="program_policy",
+        findings=(
+            INVALID_TRAFFIC_ENCOURAGEMENT,
+            INVALID_TRAFFIC_RELOAD_PATTERNS,
+            INVALID_TRAFFIC_HIGH_DENSITY,
+        ),
+    ),
+    DetectorSpec(
+        "manipulative_ad_placement",
+        detect_manipulative_ad_placement,
+        inputs=("page", "context"),
+        prefilter=_has_ads_or_ad_markup,
+        cost="expensive",
+        group="program_policy",
+        needs_render=True,
+        findings=(MANIPULATIVE_AD_STYLING, AD_LABELING_ISSUES),
+    ),
+    DetectorSpec(
+        "deceptive_representation",
+        detect_deceptive_representation,
+        prefilter=_mentions_brand,
+        cost="moderate",
+        group="program_policy",
+        findings=(DECEPTIVE_AFFILIATION_CLAIMS, DECEPTIVE_DISCLAIMER_LOW_VISIBILITY),
+    ),
+    DetectorSpec(
+        "malware_risk",
+        detect_malware_risk,
+        inputs=("page", "context"),
+        cost="expensive",
+        group="program_policy",
+        findings=(MALWARE_FORCED_DOWNLOAD, MALWARE_MISLEADING_DOWNLOAD_UI, MALWARE_SHORTENER_USAGE),
+    ),
+    DetectorSpec(
+        "traffic_source_abuse",
+        detect_traffic_source_abuse,
+        cost="moderate",
+        group="program_policy",
+        findings=(TRAFFIC_SOURCE_FORCED_REDIRECTS, TRAFFIC_SOURCE_INCENTIVIZED),
+    ),
+    DetectorSpec(
+        "ugc_risk",
+        detect_ugc_risk,
+        prefilter=_has_comments,
+        group="program_policy",
+        findings=(UGC_HIGH_RISK_TERMS, UGC_UNMODERATED_SPAM, UGC_UNMODERATED),
+    ),
+    DetectorSpec(
+        "autogenerated_single_page",
+        detect_autogenerated_findings,
+        cost="expensive",
+        group="program_policy",
+        findings=(AUTOGENERATED_SINGLE_PAGE_SIGNALS,),
+    ),
+]
+
+# Findings from the site-wide checks in ``build_report``, which are not registry detectors.
+SITE_FINDINGS = (
+    detectors.MISSING_ADS_TXT,
+    detectors.MISSING_PRIVACY_POLICY,
+    detectors.REPLICATED_CONTENT,
+    AUTOGENERATED_CLUSTER_CONTENT,
+    AUTOGENERATED_SIMILARITY_PATTERN,
+)
+
+
+def register_builtin_detectors(registry: DetectorRegistry) -> None:
+    for spec in BUILTIN_DETECTORS:
+        registry.register(spec)
+    for info in SITE_FINDINGS:
+        registry.catalog.add(info)
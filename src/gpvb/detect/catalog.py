@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from gpvb.models import DetectorInfo, Finding, FindingCategory, Severity
+
+
+class DetectorCatalog:
+    """Message, remediation, policy links and defaults for each finding ``detector`` id.
+
+    Entries are keyed by detector id and version, so a detector that changes what a finding
+    means can register new text without rewriting the meaning of findings it produced before.
+    Findings only carry their id, version and evidence; reports embed the entries their
+    findings reference (``for_findings``) and resolve them when rendering.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], DetectorInfo] = {}
+        self._latest: Dict[str, DetectorInfo] = {}
+
+    def add(self, info: DetectorInfo, version: Optional[str] = None) -> DetectorInfo:
+        if version is not None:
+            info = replace(info, version=version)
+        key = (info.detector, info.version)
+        existing = self._entries.get(key)
+        if existing is not None and existing != info:
+            raise ValueError(
+                f"Catalog entry {info.detector!r} version {info.version} is already registered"
+            )
+        self._entries[key] = info
+        self._latest[info.detector] = info
+        return info
+
+    def get(self, detector: str, version: Optional[str] = None) -> DetectorInfo:
+        """The entry for ``detector`` at ``version``.
+
+        Unknown versions (and no version) resolve to the most recently registered one; ids
+        nobody registered get a bare placeholder.
+        """
+        info = self._entries.get((detector, version)) if version is not None else None
+        info = info or self._latest.get(detector)
+        if info is None:
+            return DetectorInfo(detector, message=detector, severity=Severity.low)
+        return info
+
+    def category(self, detector: str, version: Optional[str] = None) -> FindingCategory:
+        return self.get(detector, version).category
+
+    def for_findings(self, findings: Iterable[Finding]) -> Dict[str, Dict[str, DetectorInfo]]:
+        """The entries ``findings`` reference, as ``{detector: {version: entry}}``."""
+        entries: Dict[str, Dict[str, DetectorInfo]] = {}
+        referenced = sorted({(finding.detector, finding.version) for finding in findings})
+        for detector, version in referenced:
+            entries.setdefault(detector, {})[version] = self.get(detector, version)
+        return entries
+
+    def __contains__(self, detector: object) -> bool:
+        """Whether a detector id, or a ``(detector, version)`` pair, is registered."""
+        if isinstance(detector, tuple):
+            return detector in self._entries
+        return detector in self._latest
+
+    def __iter__(self) -> Iterator[DetectorInfo]:
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
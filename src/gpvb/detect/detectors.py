@@ -1,91 +1,138 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from bs4 import BeautifulSoup
-from langdetect import detect
 
-from gpvb.detect.text import cluster_simhash, extract_visible_text, word_count
-from gpvb.models import AdElement, Finding, PageResult, Severity
+from gpvb.detect.geometry import OVERLAPS_CLICKABLE, OVERLAPS_CONTENT, ad_rects
+from gpvb.detect.langid import LanguageGuess, default_identifier
+from gpvb.detect.text import cluster_simhash, extract_visible_text, text_profile
+from gpvb.detect.registry import DetectionInputs, default_registry, run_detectors
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import AdElement, DetectorInfo, Finding, PageResult, Severity
+
+
+THIN_CONTENT = DetectorInfo(
+    "thin_content",
+    "Page has low visible word count.",
+    Severity.medium,
+)
+
+ADS_VS_CONTENT = DetectorInfo(
+    "ads_vs_content",
+    "More ads than content detected.",
+    Severity.high,
+)
+
+ADS_INTERFERING = DetectorInfo(
+    "ads_interfering",
+    "Ads overlapping interactive or primary content.",
+    Severity.high,
+)
+
+DEAD_END_AD = DetectorInfo(
+    "dead_end_ad",
+    "Modal overlay with ads may block content.",
+    Severity.high,
+)
+
+LANGUAGE_ISSUE = DetectorInfo(
+    "language_issue",
+    "Language mismatch or undetected language.",
+    Severity.low,
+)
+
+ABUSIVE_EXPERIENCE = DetectorInfo(
+    "abusive_experience",
+    "Possible abusive experience heuristics triggered.",
+    Severity.medium,
+)
+
+MISSING_PRIVACY_POLICY = DetectorInfo(
+    "missing_privacy_policy",
+    "No privacy policy page found.",
+    Severity.high,
+)
+
+MISSING_ADS_TXT = DetectorInfo(
+    "missing_ads_txt",
+    "ads.txt missing or empty.",
+    Severity.medium,
+)
+
+REPLICATED_CONTENT = DetectorInfo(
+    "replicated_content",
+    "Near-duplicate content cluster detected.",
+    Severity.high,
+)
 
 
 def detect_thin_content(page: PageResult) -> List[Finding]:
-    count = word_count(page.text)
+    count = text_profile(page).word_count
     if count < 300:
-        return [
-            Finding(
-                detector="thin_content",
-                severity=Severity.medium,
-                message="Page has low visible word count.",
-                evidence={"word_count": count},
-            )
-        ]
+        return [THIN_CONTENT.finding({"word_count": count})]
     return []
 
 
 def detect_ads_vs_content(page: PageResult) -> List[Finding]:
-    ad_count = len(page.ad_elements)
-    ad_area = sum(ad.width * ad.height for ad in page.ad_elements)
+    rects = ad_rects(page)
+    ad_count = len(rects)
+    ad_area = rects.area()
     viewport_area = 1366 * 768
-    word_count_value = word_count(page.text)
+    word_count_value = text_profile(page).word_count
     ad_ratio = ad_area / viewport_area if viewport_area else 0
     if (ad_count >= 4 and word_count_value < 400) or ad_ratio > 0.35:
         return [
-            Finding(
-                detector="ads_vs_content",
-                severity=Severity.high,
-                message="More ads than content detected.",
-                evidence={
+            ADS_VS_CONTENT.finding(
+                {
                     "ad_count": ad_count,
                     "word_count": word_count_value,
                     "ad_area_ratio": round(ad_ratio, 3),
-                },
+                }
             )
         ]
     return []
 
 
 def detect_ads_interfering(page: PageResult) -> List[Finding]:
-    overlapping = [ad for ad in page.ad_elements if ad.overlaps_clickable or ad.overlaps_content]
+    overlapping = ad_rects(page).flagged(OVERLAPS_CLICKABLE | OVERLAPS_CONTENT)
     if overlapping:
-        return [
-            Finding(
-                detector="ads_interfering",
-                severity=Severity.high,
-                message="Ads overlapping interactive or primary content.",
-                evidence={"overlap_count": len(overlapping)},
-            )
-        ]
+        return [ADS_INTERFERING.finding({"overlap_count": overlapping})]
     return []
 
 
 def detect_dead_end(page: PageResult, overlays: List[Dict[str, float]]) -> List[Finding]:
     if overlays and page.ad_elements:
-        return [
-            Finding(
-                detector="dead_end_ad",
-                severity=Severity.high,
-                message="Modal overlay with ads may block content.",
-                evidence={"overlay_count": len(overlays)},
-            )
-        ]
+        return [DEAD_END_AD.finding({"overlay_count": len(overlays)})]
     return []
 
 
-def detect_language_issue(page: PageResult) -> List[Finding]:
-    soup = BeautifulSoup(page.html, "lxml")
+LANGUAGE_MIN_CONFIDENCE = 0.7
+
+
+def detect_language_issue(
+    page: PageResult,
+    soup: Optional[BeautifulSoup] = None,
+    language: Optional[LanguageGuess] = None,
+) -> List[Finding]:
+    soup = soup if soup is not None else BeautifulSoup(page.html, "lxml")
     html_lang = (soup.html.get("lang") if soup.html else "") or ""
-    try:
-        detected = detect(page.text) if page.text else ""
-    except Exception:
-        detected = ""
-    if not detected or (html_lang and detected not in html_lang):
+    language = language if language is not None else default_identifier().identify(page.text)
+    detected = language.language
+    # A low-confidence guess is too weak to call a mismatch with the declared language.
+    mismatch = (
+        html_lang
+        and detected not in html_lang
+        and language.confidence >= LANGUAGE_MIN_CONFIDENCE
+    )
+    if not detected or mismatch:
         return [
-            Finding(
-                detector="language_issue",
-                severity=Severity.low,
-                message="Language mismatch or undetected language.",
-                evidence={"html_lang": html_lang, "detected": detected},
+            LANGUAGE_ISSUE.finding(
+                {
+                    "html_lang": html_lang,
+                    "detected": detected,
+                    "confidence": language.confidence,
+                }
             )
         ]
     return []
@@ -93,64 +140,41 @@ def detect_language_issue(page: PageResult) -> List[Finding]:
 
 def detect_abusive_experience(page: PageResult, mobile_flags: Dict[str, bool]) -> List[Finding]:
     if any(mobile_flags.values()):
-        return [
-            Finding(
-                detector="abusive_experience",
-                severity=Severity.medium,
-                message="Possible abusive experience heuristics triggered.",
-                evidence=mobile_flags,
-            )
-        ]
+        return [ABUSIVE_EXPERIENCE.finding(mobile_flags)]
     return []
 
 
 def detect_privacy_policy(found: bool) -> List[Finding]:
     if not found:
-        return [
-            Finding(
-                detector="missing_privacy_policy",
-                severity=Severity.high,
-                message="No privacy policy page found.",
-                evidence={},
-            )
-        ]
+        return [MISSING_PRIVACY_POLICY.finding()]
     return []
 
 
 def detect_ads_txt(status: int, lines: int) -> List[Finding]:
     if status >= 400 or lines < 1:
-        return [
-            Finding(
-                detector="missing_ads_txt",
-                severity=Severity.medium,
-                message="ads.txt missing or empty.",
-                evidence={"status": status, "lines": lines},
-            )
-        ]
+        return [MISSING_ADS_TXT.finding({"status": status, "lines": lines})]
     return []
 
 
 def detect_replicated_content(pages: List[PageResult], threshold: float = 0.85) -> List[Finding]:
     urls = [page.url for page in pages]
     texts = [page.text for page in pages]
-    clusters = cluster_simhash(urls, texts, threshold)
+    fingerprints = [text_profile(page).fingerprint for page in pages]
+    clusters = cluster_simhash(urls, texts, threshold, fingerprints)
     findings: List[Finding] = []
     for urls_group, similarity in clusters:
         findings.append(
-            Finding(
-                detector="replicated_content",
-                severity=Severity.high,
-                message="Near-duplicate content cluster detected.",
-                evidence={"urls": urls_group, "similarity": round(similarity, 3)},
-            )
+            REPLICATED_CONTENT.finding({"urls": urls_group, "similarity": round(similarity, 3)})
         )
     return findings
 
 
-def merge_page_findings(page: PageResult, overlays: List[Dict[str, float]], mobile_flags: Dict[str, bool]) -> None:
-    page.findings.extend(detect_thin_content(page))
-    page.findings.extend(detect_ads_vs_content(page))
-    page.findings.extend(detect_ads_interfering(page))
-    page.findings.extend(detect_dead_end(page, overlays))
-    page.findings.extend(detect_language_issue(page))
-    page.findings.extend(detect_abusive_experience(page, mobile_flags))
+def merge_page_findings(
+    page: PageResult,
+    overlays: List[Dict[str, float]],
+    mobile_flags: Dict[str, bool],
+    metrics: Optional[MetricsRecorder] = None,
+) -> None:
+    inputs = DetectionInputs(page, extras={"overlays": overlays}, mobile_flags=mobile_flags)
+    specs = default_registry().select(groups=["general"])
+    page.findings.extend(run_detectors(specs, inputs, metrics))
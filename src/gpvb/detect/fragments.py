@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+
+CACHE_SIZE = 8192
+# Elements that templates repeat on every page; each becomes its own cached fragment.
+BOILERPLATE_TAGS = ("nav", "header", "footer", "aside")
+
+T = TypeVar("T")
+
+_BOILERPLATE = re.compile(r"<(%s)\b" % "|".join(BOILERPLATE_TAGS))
+
+
+class FragmentCache:
+    """Analysis results for page fragments, keyed by fragment kind and a hash of the content.
+
+    Pages of one site share most of their markup (navigation, footer, the same inline
+    scripts), so a fragment seen on an earlier page is looked up instead of scanned again.
+    Least recently used entries are evicted beyond ``max_entries``; hits and misses are
+    counted per kind.
+    """
+
+    def __init__(self, max_entries: int = CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+
+    def get_or_compute(self, kind: str, content: str, compute: Callable[[str], T]) -> T:
+        key = (kind, hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest())
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+            return self._entries[key]
+        self.misses[kind] = self.misses.get(kind, 0) + 1
+        value = compute(content)
+        if self.max_entries > 0:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def counts(self) -> Dict[str, Tuple[int, int]]:
+        """``(hits, misses)`` per fragment kind."""
+        kinds = sorted(set(self.hits) | set(self.misses))
+        return {kind: (self.hits.get(kind, 0), self.misses.get(kind, 0)) for kind in kinds}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[FragmentCache] = None
+
+
+def default_fragment_cache() -> FragmentCache:
+    """The process-wide cache shared by every page a process analyses."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FragmentCache()
+    return _default_cache
+
+
+def split_boilerplate(markup: str) -> Iterator[Tuple[bool, str]]:
+    """Cut ``markup`` (lowercased) into ``(is_boilerplate, piece)`` runs covering all of it.
+
+    Each ``<nav>``, ``<header>``, ``<footer>`` and ``<aside>`` element up to its first closing
+    tag is one boilerplate piece; an unclosed element is left in the surrounding markup.
+    """
+    position = 0
+    for match in _BOILERPLATE.finditer(markup):
+        start = match.start()
+        if start < position:
+            continue
+        close = markup.find(f"</{match.group(1)}", match.end())
+        if close < 0:
+            continue
+        end = markup.find(">", close)
+        end = len(markup) if end < 0 else end + 1
+        if start > position:
+            yield False, markup[position:start]
+        yield True, markup[start:end]
+        position = end
+    if position < len(markup):
+        yield False, markup[position:]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List
+
+from gpvb.models import AdElement, PageResult
+
+
+OVERLAPS_CLICKABLE = 1
+OVERLAPS_NAV = 2
+OVERLAPS_CONTENT = 4
+
+
+class AdRects:
+    """A page's ad rectangles as parallel ``array('d')`` columns plus an overlap bitmask.
+
+    Detectors only need sums, counts and positions over the ads, which these columns answer
+    without touching a pydantic object per ad. Build one with ``ad_rects(page)`` so it is
+    shared by every detector that runs on the page.
+    """
+
+    __slots__ = ("x", "y", "width", "height", "flags")
+
+    def __init__(self) -> None:
+        self.x = array("d")
+        self.y = array("d")
+        self.width = array("d")
+        self.height = array("d")
+        self.flags = array("B")
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[AdElement]) -> "AdRects":
+        rects = cls()
+        for ad in elements:
+            rects.x.append(ad.x)
+            rects.y.append(ad.y)
+            rects.width.append(ad.width)
+            rects.height.append(ad.height)
+            rects.flags.append(
+                (OVERLAPS_CLICKABLE if ad.overlaps_clickable else 0)
+                | (OVERLAPS_NAV if ad.overlaps_nav else 0)
+                | (OVERLAPS_CONTENT if ad.overlaps_content else 0)
+            )
+        return rects
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def area(self) -> float:
+        return sum(width * height for width, height in zip(self.width, self.height))
+
+    def flagged(self, mask: int) -> int:
+        """How many ads have any of the overlap bits in ``mask``."""
+        return sum(1 for flags in self.flags if flags & mask)
+
+    def within(self, width: float, height: float) -> int:
+        """How many ads lie entirely inside a ``width`` x ``height`` viewport at the origin."""
+        return sum(
+            1
+            for x, y, ad_width, ad_height in zip(self.x, self.y, self.width, self.height)
+            if x >= 0 and y >= 0 and x + ad_width <= width and y + ad_height <= height
+        )
+
+
+def ad_rects(page: PageResult) -> AdRects:
+    """The page's ``AdRects``, built on first use and cached on the page."""
+    rects = page._ad_rects
+    if rects is None or len(rects) != len(page.ad_elements):
+        rects = AdRects.from_elements(page.ad_elements)
+        page._ad_rects = rects
+    return rects
+
+
+class YIndex:
+    """Positions sorted by ``y`` so "what is within ``radius`` of this ad" is two bisections."""
+
+    __slots__ = ("_ys", "_order")
+
+    def __init__(self, ys: Iterable[float]) -> None:
+        ranked = sorted((y, index) for index, y in enumerate(ys))
+        self._ys = array("d", (y for y, _ in ranked))
+        self._order = array("l", (index for _, index in ranked))
+
+    def near(self, y: float, radius: float) -> List[int]:
+        """Indexes (in original order) of the positions within ``radius`` of ``y``."""
+        low = bisect_left(self._ys, y - radius)
+        high = bisect_right(self._ys, y + radius)
+        return sorted(self._order[low:high])
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+from langdetect.lang_detect_exception import LangDetectException
+
+
+SAMPLE_CHARS = 2000
+SAMPLE_WINDOWS = 3
+CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    language: str
+    confidence: float
+
+
+UNDETECTED = LanguageGuess("", 0.0)
+
+
+def language_sample(
+    text: str, max_chars: int = SAMPLE_CHARS, windows: int = SAMPLE_WINDOWS
+) -> str:
+    """Return at most ``max_chars`` of ``text``, taken from evenly spaced windows.
+
+    Long pages often open with navigation or boilerplate in a different language from the body,
+    so a sample drawn from the start, middle and end is more representative than a prefix.
+    Windows are snapped to whitespace so no word is cut in half.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    windows = max(1, windows)
+    width = max_chars // windows
+    stride = (len(text) - width) // max(windows - 1, 1)
+    parts = []
+    for index in range(windows):
+        start = index * stride
+        if start:
+            space = text.find(" ", start)
+            start = space + 1 if 0 <= space < start + width // 2 else start
+        end = start + width
+        space = text.rfind(" ", start, end)
+        parts.append(text[start : space if space > start + width // 2 else end])
+    return " ".join(parts)
+
+
+class LanguageIdentifier:
+    """Deterministic language identification over bounded text samples.
+
+    Profiles are loaded once per instance (use ``default_identifier`` to share them across a
+    process) and the detector is seeded, so the same text always gets the same answer. Results
+    are cached by a hash of the sample; ``identify_many`` classifies each distinct sample once.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = SAMPLE_CHARS,
+        cache_size: int = CACHE_SIZE,
+        seed: int = 0,
+    ) -> None:
+        self.max_chars = max_chars
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._factory = DetectorFactory()
+        self._factory.load_profile(PROFILES_DIRECTORY)
+        self._factory.set_seed(seed)
+        self._cache: "OrderedDict[bytes, LanguageGuess]" = OrderedDict()
+
+    def identify(self, text: str) -> LanguageGuess:
+        sample = language_sample(text or "", self.max_chars)
+        if not sample:
+            return UNDETECTED
+        key = _sample_key(sample)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        guess = self._classify(sample)
+        self._store(key, guess)
+        return guess
+
+    def identify_many(self, texts: Iterable[str]) -> List[LanguageGuess]:
+        """Classify ``texts`` in order, running the detector once per distinct sample."""
+        samples = [language_sample(text or "", self.max_chars) for text in texts]
+        pending: Dict[bytes, str] = {}
+        resolved: Dict[bytes, LanguageGuess] = {}
+        keys: List[Optional[bytes]] = []
+        for sample in samples:
+            if not sample:
+                keys.append(None)
+                continue
+            key = _sample_key(sample)
+            keys.append(key)
+            if key in resolved or key in pending:
+                continue
+            cached = self._cached(key)
+            if cached is not None:
+                resolved[key] = cached
+            else:
+                pending[key] = sample
+        for key, sample in pending.items():
+            resolved[key] = self._classify(sample)
+            self._store(key, resolved[key])
+        return [resolved[key] if key is not None else UNDETECTED for key in keys]
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _classify(self, sample: str) -> LanguageGuess:
+        detector = self._factory.create()
+        detector.set_max_text_length(self.max_chars)
+        detector.append(sample)
+        try:
+            ranked = detector.get_probabilities()
+        except LangDetectException:
+            return UNDETECTED
+        if not ranked:
+            return UNDETECTED
+        return LanguageGuess(ranked[0].lang, round(ranked[0].prob, 4))
+
+    def _cached(self, key: bytes) -> Optional[LanguageGuess]:
+        guess = self._cache.get(key)
+        if guess is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return guess
+
+    def _store(self, key: bytes, guess: LanguageGuess) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = guess
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _sample_key(sample: str) -> bytes:
+    return hashlib.blake2b(sample.encode("utf-8"), digest_size=16).digest()
+
+
+_default_identifier: Optional[LanguageIdentifier] = None
+
+
+def default_identifier() -> LanguageIdentifier:
+    """The process-wide identifier, loading language profiles on first use."""
+    global _default_identifier
+    if _default_identifier is None:
+        _default_identifier = LanguageIdentifier()
+    return _default_identifier
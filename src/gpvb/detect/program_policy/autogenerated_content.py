@@ -1,42 +1,58 @@
 from __future__ import annotations
 
 import json
-import math
 import re
-from typing import Dict, List
+from typing import List
 
 from bs4 import BeautifulSoup
 
-from gpvb.detect.text import cluster_simhash, word_count
-from gpvb.models import Finding, FindingCategory, PageResult, Severity
+from gpvb.detect.text import cluster_simhash, text_profile
+from gpvb.models import DetectorInfo, Finding, FindingCategory, PageResult, Severity
 
 
-AUTO_CONTENT_POLICY_LINKS = [
+AUTO_CONTENT_POLICY_LINKS = (
     "https://support.google.com/adsense/answer/1348737",
     "https://support.google.com/webmasters/answer/2721306",
-]
-
-
-def _word_entropy(text: str) -> float:
-    words = re.findall(r"\w+", text.lower())
-    if not words:
-        return 0.0
-    total = len(words)
-    counts: Dict[str, int] = {}
-    for word in words:
-        counts[word] = counts.get(word, 0) + 1
-    entropy = 0.0
-    for count in counts.values():
-        p = count / total
-        entropy -= p * math.log2(p)
-    return entropy
-
-
-def _unique_sentence_ratio(text: str) -> float:
-    sentences = [s.strip() for s in re.split(r"[.!?]+", text) if s.strip()]
-    if not sentences:
-        return 1.0
-    return len(set(sentences)) / len(sentences)
+)
+
+AUTOGENERATED_SINGLE_PAGE_SIGNALS = DetectorInfo(
+    "autogenerated_single_page_signals",
+    "Text signals suggest auto-generated or low-quality content.",
+    Severity.medium,
+    confidence=0.58,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Add original, human-written content with unique structure and detail.",
+        "Reduce template boilerplate and include author/date metadata.",
+    ),
+    policy_links=AUTO_CONTENT_POLICY_LINKS,
+)
+
+AUTOGENERATED_CLUSTER_CONTENT = DetectorInfo(
+    "autogenerated_cluster_content",
+    "Clustered pages resemble template or scraped content.",
+    Severity.high,
+    confidence=0.74,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Replace templated pages with unique, authored content.",
+        "Include author and date metadata for original work.",
+    ),
+    policy_links=AUTO_CONTENT_POLICY_LINKS,
+)
+
+AUTOGENERATED_SIMILARITY_PATTERN = DetectorInfo(
+    "autogenerated_similarity_pattern",
+    "Page content is short and highly similar to other pages.",
+    Severity.medium,
+    confidence=0.55,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Increase unique content and avoid duplicating templates.",
+        "Add author/date metadata to reinforce content ownership.",
+    ),
+    policy_links=AUTO_CONTENT_POLICY_LINKS,
+)
 
 
 def _has_author_or_date(html: str) -> bool:
@@ -58,40 +74,27 @@ def _has_author_or_date(html: str) -> bool:
 
 def detect_autogenerated_findings(page: PageResult) -> List[Finding]:
     findings: List[Finding] = []
-    text = page.text or ""
-    entropy = _word_entropy(text)
-    sentence_ratio = _unique_sentence_ratio(text)
-    boilerplate_ratio = len(text) / max(len(page.html), 1)
+    profile = text_profile(page)
+    entropy = profile.entropy
+    sentence_ratio = profile.unique_sentence_ratio
+    boilerplate_ratio = len(profile.text) / max(len(page.html), 1)
     signals = {
         "entropy": round(entropy, 3),
         "unique_sentence_ratio": round(sentence_ratio, 3),
         "boilerplate_ratio": round(boilerplate_ratio, 3),
-        "word_count": word_count(text),
+        "word_count": profile.word_count,
     }
 
     if entropy < 3.0 or sentence_ratio < 0.5 or boilerplate_ratio < 0.05:
-        findings.append(
-            Finding(
-                detector="autogenerated_single_page_signals",
-                severity=Severity.medium,
-                category=FindingCategory.program_policy,
-                confidence=0.58,
-                message="Text signals suggest auto-generated or low-quality content.",
-                remediation=[
-                    "Add original, human-written content with unique structure and detail.",
-                    "Reduce template boilerplate and include author/date metadata.",
-                ],
-                policy_links=AUTO_CONTENT_POLICY_LINKS,
-                evidence=signals,
-            )
-        )
+        findings.append(AUTOGENERATED_SINGLE_PAGE_SIGNALS.finding(signals))
     return findings
 
 
 def apply_autogenerated_findings(pages: List[PageResult], threshold: float = 0.9) -> None:
     urls = [page.url for page in pages]
     texts = [page.text for page in pages]
-    clusters = cluster_simhash(urls, texts, threshold)
+    fingerprints = [text_profile(page).fingerprint for page in pages]
+    clusters = cluster_simhash(urls, texts, threshold, fingerprints)
 
     url_to_page = {page.url: page for page in pages}
     for cluster_urls, similarity in clusters:
@@ -99,27 +102,17 @@ def apply_autogenerated_findings(pages: List[PageResult], threshold: float = 0.9
             page = url_to_page.get(url)
             if not page:
                 continue
-            if word_count(page.text) < 150 and not _has_author_or_date(page.html):
+            if text_profile(page).word_count < 150 and not _has_author_or_date(page.html):
                 page.findings.append(
-                    Finding(
-                        detector="autogenerated_cluster_content",
-                        severity=Severity.high,
-                        category=FindingCategory.program_policy,
-                        confidence=0.74,
-                        message="Clustered pages resemble template or scraped content.",
-                        remediation=[
-                            "Replace templated pages with unique, authored content.",
-                            "Include author and date metadata for original work.",
-                        ],
-                        policy_links=AUTO_CONTENT_POLICY_LINKS,
-                        evidence={
+                    AUTOGENERATED_CLUSTER_CONTENT.finding(
+                        {
                             "cluster_urls": cluster_urls,
                             "similarity": round(similarity, 3),
-                        },
+                        }
                     )
                 )
 
-    similarity_clusters = cluster_simhash(urls, texts, 0.7)
+    similarity_clusters = cluster_simhash(urls, texts, 0.7, fingerprints)
     for cluster_urls, similarity in similarity_clusters:
         if len(cluster_urls) < 2:
             continue
@@ -127,22 +120,12 @@ def apply_autogenerated_findings(pages: List[PageResult], threshold: float = 0.9
             page = url_to_page.get(url)
             if not page:
                 continue
-            if word_count(page.text) < 150 and not _has_author_or_date(page.html):
+            if text_profile(page).word_count < 150 and not _has_author_or_date(page.html):
                 page.findings.append(
-                    Finding(
-                        detector="autogenerated_similarity_pattern",
-                        severity=Severity.medium,
-                        category=FindingCategory.program_policy,
-                        confidence=0.55,
-                        message="Page content is short and highly similar to other pages.",
-                        remediation=[
-                            "Increase unique content and avoid duplicating templates.",
-                            "Add author/date metadata to reinforce content ownership.",
-                        ],
-                        policy_links=AUTO_CONTENT_POLICY_LINKS,
-                        evidence={
+                    AUTOGENERATED_SIMILARITY_PATTERN.finding(
+                        {
                             "similarity": round(similarity, 3),
                             "cluster_urls": cluster_urls,
-                        },
+                        }
                     )
                 )
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
+from gpvb.detect.geometry import YIndex
 
-@dataclass
+
+@dataclass(slots=True)
 class TextBlock:
     text: str
     x: float
@@ -13,7 +15,7 @@ class TextBlock:
     height: float
 
 
-@dataclass
+@dataclass(slots=True)
 class LabelBlock(TextBlock):
     font_size: float
     opacity: float
@@ -24,6 +26,13 @@ class ProgramPolicyContext:
     text_blocks: List[TextBlock]
     label_blocks: List[LabelBlock]
     viewport: Dict[str, int]
+    _text_index: Optional[YIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    def texts_near(self, y: float, radius: float) -> List[TextBlock]:
+        """Text blocks whose top is within ``radius`` of ``y``, in page order."""
+        if self._text_index is None:
+            self._text_index = YIndex(block.y for block in self.text_blocks)
+        return [self.text_blocks[index] for index in self._text_index.near(y, radius)]
 
 
 def build_context(extras: Dict[str, Any], viewport: Dict[str, int]) -> ProgramPolicyContext:
@@ -5,13 +5,40 @@ from typing import List
 
 from bs4 import BeautifulSoup
 
-from gpvb.models import Finding, FindingCategory, PageResult, Severity
+from gpvb.detect.text import text_profile
+from gpvb.models import DetectorInfo, Finding, FindingCategory, PageResult, Severity
 
 
-DECEPTIVE_POLICY_LINKS = [
+DECEPTIVE_POLICY_LINKS = (
     "https://support.google.com/adsense/answer/1346295",
     "https://support.google.com/adsense/answer/2785928",
-]
+)
+
+DECEPTIVE_AFFILIATION_CLAIMS = DetectorInfo(
+    "deceptive_affiliation_claims",
+    "Claims of affiliation or authorization detected without disclaimer.",
+    Severity.high,
+    confidence=0.72,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Remove claims of official status or brand affiliation unless authorized.",
+        "Add clear disclaimers when referencing third-party brands.",
+    ),
+    policy_links=DECEPTIVE_POLICY_LINKS,
+)
+
+DECEPTIVE_DISCLAIMER_LOW_VISIBILITY = DetectorInfo(
+    "deceptive_affiliation_disclaimer_low_visibility",
+    "Affiliation disclaimer appears low visibility or buried.",
+    Severity.medium,
+    confidence=0.6,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Place disclaimers near claims and make them easy to read.",
+        "Avoid hiding disclosures in footers or fine print.",
+    ),
+    policy_links=DECEPTIVE_POLICY_LINKS,
+)
 
 
 AFFILIATION_KEYWORDS = [
@@ -32,8 +59,7 @@ DISCLAIMER_PATTERNS = [
 ]
 
 
-def _claims_affiliation(text: str) -> bool:
-    lowered = text.lower()
+def _claims_affiliation(lowered: str) -> bool:
     for keyword in ["official", "authorized", "partner", "approved"]:
         if keyword in lowered and any(brand in lowered for brand in ["google", "irs", "government"]):
             return True
@@ -65,41 +91,14 @@ def _disclaimer_low_visibility(html: str) -> bool:
 
 def detect_deceptive_representation(page: PageResult) -> List[Finding]:
     findings: List[Finding] = []
-    text = page.text or ""
-    if not _claims_affiliation(text):
+    if not _claims_affiliation(text_profile(page).lower):
         return findings
 
     disclaimer_present = _find_disclaimer(page.html)
     if not disclaimer_present:
-        findings.append(
-            Finding(
-                detector="deceptive_affiliation_claims",
-                severity=Severity.high,
-                category=FindingCategory.program_policy,
-                confidence=0.72,
-                message="Claims of affiliation or authorization detected without disclaimer.",
-                remediation=[
-                    "Remove claims of official status or brand affiliation unless authorized.",
-                    "Add clear disclaimers when referencing third-party brands.",
-                ],
-                policy_links=DECEPTIVE_POLICY_LINKS,
-                evidence={"keywords": AFFILIATION_KEYWORDS},
-            )
-        )
+        findings.append(DECEPTIVE_AFFILIATION_CLAIMS.finding({"keywords": AFFILIATION_KEYWORDS}))
     elif _disclaimer_low_visibility(page.html):
         findings.append(
-            Finding(
-                detector="deceptive_affiliation_disclaimer_low_visibility",
-                severity=Severity.medium,
-                category=FindingCategory.program_policy,
-                confidence=0.6,
-                message="Affiliation disclaimer appears low visibility or buried.",
-                remediation=[
-                    "Place disclaimers near claims and make them easy to read.",
-                    "Avoid hiding disclosures in footers or fine print.",
-                ],
-                policy_links=DECEPTIVE_POLICY_LINKS,
-                evidence={"disclaimer_low_visibility": True},
-            )
+            DECEPTIVE_DISCLAIMER_LOW_VISIBILITY.finding({"disclaimer_low_visibility": True})
         )
     return findings
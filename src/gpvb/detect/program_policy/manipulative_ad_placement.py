@@ -4,15 +4,42 @@ from typing import List
 
 from bs4 import BeautifulSoup
 
-from gpvb.models import Finding, FindingCategory, PageResult, Severity
+from gpvb.detect.geometry import OVERLAPS_CONTENT, OVERLAPS_NAV, ad_rects
+from gpvb.models import DetectorInfo, Finding, FindingCategory, PageResult, Severity
 
 from .context import ProgramPolicyContext
 
 
-PLACEMENT_POLICY_LINKS = [
+PLACEMENT_POLICY_LINKS = (
     "https://support.google.com/adsense/answer/1346295",
     "https://support.google.com/adsense/answer/48182",
-]
+)
+
+MANIPULATIVE_AD_STYLING = DetectorInfo(
+    "manipulative_ad_styling",
+    "Ads appear styled to blend with navigation or content.",
+    Severity.high,
+    confidence=0.72,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Separate ad placements from navigation and primary content blocks.",
+        "Use clear visual separation (borders, spacing) around ads.",
+    ),
+    policy_links=PLACEMENT_POLICY_LINKS,
+)
+
+AD_LABELING_ISSUES = DetectorInfo(
+    "ad_labeling_issues",
+    "Ad labeling appears missing or low visibility.",
+    Severity.medium,
+    confidence=0.6,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Add clear 'Advertisement' or 'Sponsored' labels adjacent to ads.",
+        "Ensure labels are legible and not faded or hidden.",
+    ),
+    policy_links=PLACEMENT_POLICY_LINKS,
+)
 
 
 def _ad_in_list_or_menu(html: str) -> bool:
@@ -41,15 +68,17 @@ def detect_manipulative_ad_placement(
 ) -> List[Finding]:
     findings: List[Finding] = []
     misleading_styling = False
-    if any(ad.overlaps_nav or ad.overlaps_content for ad in page.ad_elements):
+    rects = ad_rects(page)
+    overlaps_nav_or_content = rects.flagged(OVERLAPS_NAV | OVERLAPS_CONTENT) > 0
+    if overlaps_nav_or_content:
         misleading_styling = True
     if _ad_in_list_or_menu(page.html):
         misleading_styling = True
 
     weak_labels = 0
     missing_labels = 0
-    for ad in page.ad_elements:
-        labels = _find_label_near_ad(ad.y, context.label_blocks)
+    for ad_y in rects.y:
+        labels = _find_label_near_ad(ad_y, context.label_blocks)
         if not labels:
             missing_labels += 1
             continue
@@ -58,43 +87,21 @@ def detect_manipulative_ad_placement(
 
     if misleading_styling:
         findings.append(
-            Finding(
-                detector="manipulative_ad_styling",
-                severity=Severity.high,
-                category=FindingCategory.program_policy,
-                confidence=0.72,
-                message="Ads appear styled to blend with navigation or content.",
-                remediation=[
-                    "Separate ad placements from navigation and primary content blocks.",
-                    "Use clear visual separation (borders, spacing) around ads.",
-                ],
-                policy_links=PLACEMENT_POLICY_LINKS,
-                evidence={
-                    "overlaps_nav_or_content": any(
-                        ad.overlaps_nav or ad.overlaps_content for ad in page.ad_elements
-                    ),
+            MANIPULATIVE_AD_STYLING.finding(
+                {
+                    "overlaps_nav_or_content": overlaps_nav_or_content,
                     "ads_in_lists": _ad_in_list_or_menu(page.html),
-                },
+                }
             )
         )
 
     if missing_labels or weak_labels:
         findings.append(
-            Finding(
-                detector="ad_labeling_issues",
-                severity=Severity.medium,
-                category=FindingCategory.program_policy,
-                confidence=0.6,
-                message="Ad labeling appears missing or low visibility.",
-                remediation=[
-                    "Add clear 'Advertisement' or 'Sponsored' labels adjacent to ads.",
-                    "Ensure labels are legible and not faded or hidden.",
-                ],
-                policy_links=PLACEMENT_POLICY_LINKS,
-                evidence={
+            AD_LABELING_ISSUES.finding(
+                {
                     "missing_labels": missing_labels,
                     "weak_labels": weak_labels,
-                },
+                }
             )
         )
     return findings
@@ -1,28 +1,101 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
 
 from gpvb.models import Finding, Severity
 
 
+SEVERITY_POINTS = {
+    Severity.critical: 30,
+    Severity.high: 15,
+    Severity.medium: 5,
+    Severity.low: 1,
+}
+MAX_SCORE = 100
+# Lowest score labelled "Severe Risk"; ``--stop-when severe`` stops there.
+SEVERE_SCORE = 71
+
+
 def calculate_account_risk_score(findings: List[Finding]) -> Dict[str, int | str]:
-    score = 0
-    for finding in findings:
-        if finding.severity == Severity.critical:
-            score += 30
-        elif finding.severity == Severity.high:
-            score += 15
-        elif finding.severity == Severity.medium:
-            score += 5
-        elif finding.severity == Severity.low:
-            score += 1
-    score = min(score, 100)
+    score = min(sum(SEVERITY_POINTS.get(finding.severity, 0) for finding in findings), MAX_SCORE)
+    return {"score": score, "label": risk_label(score)}
+
+
+def risk_label(score: int) -> str:
     if score <= 15:
-        label = "Low Risk"
-    elif score <= 40:
-        label = "Moderate Risk"
-    elif score <= 70:
-        label = "High Risk"
-    else:
-        label = "Severe Risk (Likely Enforcement)"
-    return {"score": score, "label": label}
+        return "Low Risk"
+    if score <= 40:
+        return "Moderate Risk"
+    if score < SEVERE_SCORE:
+        return "High Risk"
+    return "Severe Risk (Likely Enforcement)"
+
+
+@dataclass
+class RiskTracker:
+    """Account risk accumulated as pages finish, scored like ``calculate_account_risk_score``."""
+
+    score: int = 0
+    critical_detectors: Set[str] = field(default_factory=set)
+
+    def add(self, findings: Iterable[Finding]) -> None:
+        for finding in findings:
+            self.score = min(self.score + SEVERITY_POINTS.get(finding.severity, 0), MAX_SCORE)
+            if finding.severity == Severity.critical:
+                self.critical_detectors.add(finding.detector)
+
+
+_CONDITION = re.compile(r"^(score|critical)\s*>=\s*(\d+)$")
+
+
+@dataclass(frozen=True)
+class StopCondition:
+    """When an audit may stop early; any one of the thresholds that is set is enough.
+
+    Parsed from ``--stop-when``: a comma-separated list of ``score>=N``, ``severe`` (the
+    "Severe Risk" band), ``critical`` (any critical finding) and ``critical>=K`` (critical
+    findings from K distinct detectors).
+    """
+
+    min_score: Optional[int] = None
+    min_critical_detectors: Optional[int] = None
+
+    @classmethod
+    def parse(cls, value: str) -> "StopCondition":
+        scores: List[int] = []
+        criticals: List[int] = []
+        for token in (token.strip().lower() for token in value.split(",")):
+            if not token:
+                continue
+            if token == "severe":
+                scores.append(SEVERE_SCORE)
+            elif token == "critical":
+                criticals.append(1)
+            else:
+                match = _CONDITION.match(token)
+                if not match or int(match.group(2)) < 1:
+                    raise ValueError(
+                        f"Unknown stop condition {token!r}; use score>=N, severe, critical "
+                        "or critical>=K"
+                    )
+                if match.group(1) == "score":
+                    scores.append(int(match.group(2)))
+                else:
+                    criticals.append(int(match.group(2)))
+        if not scores and not criticals:
+            raise ValueError("No stop condition given")
+        # Any one condition is enough, so the lowest threshold of each kind is the one that counts.
+        return cls(min(scores, default=None), min(criticals, default=None))
+
+    def reason(self, tracker: RiskTracker) -> Optional[str]:
+        """Why the audit should stop now, or None while no threshold is reached."""
+        if self.min_score is not None and tracker.score >= self.min_score:
+            return f"score>={self.min_score}"
+        critical = len(tracker.critical_detectors)
+        if self.min_critical_detectors is not None and critical >= self.min_critical_detectors:
+            if self.min_critical_detectors == 1:
+                return "critical"
+            return f"critical>={self.min_critical_detectors}"
+        return None
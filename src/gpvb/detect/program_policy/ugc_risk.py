@@ -3,13 +3,54 @@ from __future__ import annotations
 import re
 from typing import List
 
-from gpvb.models import Finding, FindingCategory, PageResult, Severity
+from gpvb.detect.text import text_profile
+from gpvb.models import DetectorInfo, Finding, FindingCategory, PageResult, Severity
 
 
-UGC_POLICY_LINKS = [
+UGC_POLICY_LINKS = (
     "https://support.google.com/adsense/answer/1346295",
     "https://support.google.com/adsense/answer/48182",
-]
+)
+
+UGC_HIGH_RISK_TERMS = DetectorInfo(
+    "ugc_high_risk_terms",
+    "User-generated content contains high-risk terms.",
+    Severity.high,
+    confidence=0.7,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Moderate or remove high-risk user-generated content.",
+        "Add keyword filters and active moderation workflows.",
+    ),
+    policy_links=UGC_POLICY_LINKS,
+)
+
+UGC_UNMODERATED_SPAM = DetectorInfo(
+    "ugc_unmoderated_spam",
+    "Comment or forum sections show spam signals without moderation.",
+    Severity.medium,
+    confidence=0.55,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Enable moderation, CAPTCHA, or rel=\"nofollow\" on UGC links.",
+        "Remove spam-heavy threads or restrict posting privileges.",
+    ),
+    policy_links=UGC_POLICY_LINKS,
+)
+
+UGC_UNMODERATED = DetectorInfo(
+    "ugc_unmoderated",
+    "User-generated content detected without clear moderation controls.",
+    Severity.medium,
+    confidence=0.5,
+    category=FindingCategory.program_policy,
+    remediation=(
+        "Add moderation notices or CAPTCHA on comment submissions.",
+        "Apply rel=\"nofollow\" to outbound UGC links.",
+    ),
+    policy_links=UGC_POLICY_LINKS,
+)
+
 
 SPAM_KEYWORDS = [
     "buy now",
@@ -44,57 +85,15 @@ def detect_ugc_risk(page: PageResult) -> List[Finding]:
     if not _has_comment_section(page.html):
         return findings
 
-    text = page.text.lower()
+    text = text_profile(page).lower
     high_risk_hits = [term for term in HIGH_RISK_TERMS if term in text]
     spam_hits = [term for term in SPAM_KEYWORDS if term in text]
     has_moderation = _has_moderation(page.html)
 
     if high_risk_hits:
-        findings.append(
-            Finding(
-                detector="ugc_high_risk_terms",
-                severity=Severity.high,
-                category=FindingCategory.program_policy,
-                confidence=0.7,
-                message="User-generated content contains high-risk terms.",
-                remediation=[
-                    "Moderate or remove high-risk user-generated content.",
-                    "Add keyword filters and active moderation workflows.",
-                ],
-                policy_links=UGC_POLICY_LINKS,
-                evidence={"high_risk_terms": high_risk_hits},
-            )
-        )
+        findings.append(UGC_HIGH_RISK_TERMS.finding({"high_risk_terms": high_risk_hits}))
     elif spam_hits and not has_moderation:
-        findings.append(
-            Finding(
-                detector="ugc_unmoderated_spam",
-                severity=Severity.medium,
-                category=FindingCategory.program_policy,
-                confidence=0.55,
-                message="Comment or forum sections show spam signals without moderation.",
-                remediation=[
-                    "Enable moderation, CAPTCHA, or rel=\"nofollow\" on UGC links.",
-                    "Remove spam-heavy threads or restrict posting privileges.",
-                ],
-                policy_links=UGC_POLICY_LINKS,
-                evidence={"spam_terms": spam_hits},
-            )
-        )
+        findings.append(UGC_UNMODERATED_SPAM.finding({"spam_terms": spam_hits}))
     elif not has_moderation:
-        findings.append(
-            Finding(
-                detector="ugc_unmoderated",
-                severity=Severity.medium,
-                category=FindingCategory.program_policy,
-                confidence=0.5,
-                message="User-generated content detected without clear moderation controls.",
-                remediation=[
-                    "Add moderation notices or CAPTCHA on comment submissions.",
-                    "Apply rel=\"nofollow\" to outbound UGC links.",
-                ],
-                policy_links=UGC_POLICY_LINKS,
-                evidence={"moderation_detected": has_moderation},
-            )
-        )
+        findings.append(UGC_UNMODERATED.finding({"moderation_detected": has_moderation}))
     return findings
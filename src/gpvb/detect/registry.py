@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup
+
+from gpvb.detect.catalog import DetectorCatalog
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import DetectorInfo, Finding, PageResult
+
+
+ENTRY_POINT_GROUP = "gpvb.detectors"
+COST_CLASSES = ("cheap", "moderate", "expensive")
+DEFAULT_VIEWPORT = {"width": 1366, "height": 768}
+
+
+@dataclass(frozen=True)
+class DetectorSpec:
+    """A page-level detector and what it needs to run.
+
+    ``inputs`` names the arguments passed to ``func`` in order (see ``DetectionInputs``).
+    ``prefilter`` gets the bare page and must be cheap; returning False skips the detector
+    without computing any of its inputs. ``needs_render`` marks detectors that depend on layout
+    or mobile data, which only a browser render provides. ``findings`` describes each finding
+    id the detector emits; they are added to the registry's catalog at this spec's version, and
+    the findings it returns are stamped with that version.
+    """
+
+    id: str
+    func: Callable[..., List[Finding]]
+    inputs: Tuple[str, ...] = ("page",)
+    prefilter: Optional[Callable[[PageResult], bool]] = None
+    cost: str = "cheap"
+    version: str = "1"
+    group: str = "general"
+    needs_render: bool = False
+    findings: Tuple[DetectorInfo, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.cost not in COST_CLASSES:
+            raise ValueError(f"{self.id}: cost must be one of {', '.join(COST_CLASSES)}")
+
+
+InputProvider = Callable[["DetectionInputs"], Any]
+
+
+def _soup(inputs: "DetectionInputs") -> BeautifulSoup:
+    return BeautifulSoup(inputs.page.html, "lxml")
+
+
+def _context(inputs: "DetectionInputs") -> Any:
+    from gpvb.detect.program_policy.context import build_context
+
+    return build_context(inputs.extras, inputs.viewport)
+
+
+def _language(inputs: "DetectionInputs") -> Any:
+    from gpvb.detect.langid import default_identifier
+
+    return default_identifier().identify(inputs.page.text)
+
+
+BUILTIN_INPUTS: Dict[str, InputProvider] = {
+    "page": lambda inputs: inputs.page,
+    "overlays": lambda inputs: inputs.extras.get("overlays", []),
+    "mobile_flags": lambda inputs: inputs.mobile_flags,
+    "extras": lambda inputs: inputs.extras,
+    "context": _context,
+    "soup": _soup,
+    "language": _language,
+}
+
+
+class DetectionInputs:
+    """Per-page detector inputs, each computed on first use and then shared."""
+
+    def __init__(
+        self,
+        page: PageResult,
+        extras: Optional[Dict[str, Any]] = None,
+        mobile_flags: Optional[Dict[str, bool]] = None,
+        viewport: Optional[Dict[str, int]] = None,
+        providers: Optional[Dict[str, InputProvider]] = None,
+    ) -> None:
+        self.page = page
+        self.extras = extras or {}
+        self.mobile_flags = mobile_flags or {}
+        self.viewport = viewport or DEFAULT_VIEWPORT
+        self._providers = providers if providers is not None else BUILTIN_INPUTS
+        self._values: Dict[str, Any] = {}
+
+    def get(self, name: str) -> Any:
+        if name not in self._values:
+            try:
+                provider = self._providers[name]
+            except KeyError:
+                raise KeyError(f"No provider for detector input {name!r}") from None
+            self._values[name] = provider(self)
+        return self._values[name]
+
+    def provide(self, name: str, value: Any) -> None:
+        """Seed an input the caller already has, so its provider never runs."""
+        self._values[name] = value
+
+    def computed(self) -> List[str]:
+        return list(self._values)
+
+
+class DetectorRegistry:
+    def __init__(self) -> None:
+        self._specs: Dict[str, DetectorSpec] = {}
+        self.inputs: Dict[str, InputProvider] = dict(BUILTIN_INPUTS)
+        self.catalog = DetectorCatalog()
+
+    def register(self, spec: DetectorSpec) -> DetectorSpec:
+        if spec.id in self._specs:
+            raise ValueError(f"Detector {spec.id!r} is already registered")
+        unknown = [name for name in spec.inputs if name not in self.inputs]
+        if unknown:
+            raise ValueError(f"{spec.id}: unknown inputs {', '.join(unknown)}")
+        for info in spec.findings:
+            self.catalog.add(info, spec.version)
+        self._specs[spec.id] = spec
+        return spec
+
+    def register_input(self, name: str, provider: InputProvider) -> None:
+        self.inputs[name] = provider
+
+    def load_entry_points(self) -> None:
+        """Register detectors exposed by installed plugins under ``gpvb.detectors``.
+
+        An entry point may resolve to a ``DetectorSpec``, an iterable of specs, or a callable
+        taking the registry. Broken plugins are logged and skipped.
+        """
+        logger = logging.getLogger("gpvb")
+        for entry in entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                loaded = entry.load()
+                if isinstance(loaded, DetectorSpec):
+                    self.register(loaded)
+                elif callable(loaded):
+                    loaded(self)
+                else:
+                    for spec in loaded:
+                        self.register(spec)
+            except Exception:
+                logger.exception("Failed to load detector plugin %s", entry.name)
+
+    def get(self, detector_id: str) -> DetectorSpec:
+        return self._specs[detector_id]
+
+    def __iter__(self) -> Iterator[DetectorSpec]:
+        return iter(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def select(
+        self, selection: Sequence[str] = (), groups: Optional[Iterable[str]] = None
+    ) -> List[DetectorSpec]:
+        """Pick detectors by id; ``-id`` excludes, and any plain id turns selection into a list."""
+        include = {token for token in selection if not token.startswith("-")}
+        exclude = {token[1:] for token in selection if token.startswith("-")}
+        unknown = sorted((include | exclude) - set(self._specs))
+        if unknown:
+            raise ValueError(f"Unknown detectors: {', '.join(unknown)}")
+        allowed = set(groups) if groups is not None else None
+        return [
+            spec
+            for spec in self._specs.values()
+            if (allowed is None or spec.group in allowed)
+            and (not include or spec.id in include)
+            and spec.id not in exclude
+        ]
+
+
+_default_registry: Optional[DetectorRegistry] = None
+
+
+def default_registry() -> DetectorRegistry:
+    """Built-in detectors plus installed plugins, built once per process."""
+    global _default_registry
+    if _default_registry is None:
+        from gpvb.detect.builtin import register_builtin_detectors
+
+        registry = DetectorRegistry()
+        register_builtin_detectors(registry)
+        registry.load_entry_points()
+        _default_registry = registry
+    return _default_registry
+
+
+def default_catalog() -> DetectorCatalog:
+    return default_registry().catalog
+
+
+def parse_selection(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [token.strip() for token in value.split(",") if token.strip()]
+
+
+def run_detectors_by_id(
+    specs: Sequence[DetectorSpec],
+    inputs: DetectionInputs,
+    metrics: Optional[MetricsRecorder] = None,
+) -> Dict[str, List[Finding]]:
+    """Run ``specs`` against one page, keeping each detector's findings separate."""
+    results: Dict[str, List[Finding]] = {}
+    for spec in specs:
+        if spec.prefilter is not None and not spec.prefilter(inputs.page):
+            if metrics is not None:
+                metrics.detector_skipped(spec.id, spec.cost)
+            results[spec.id] = []
+            continue
+        if metrics is None:
+            results[spec.id] = spec.func(*[inputs.get(name) for name in spec.inputs])
+        else:
+            with metrics.detector_span(spec.id, spec.cost):
+                results[spec.id] = spec.func(*[inputs.get(name) for name in spec.inputs])
+        for finding in results[spec.id]:
+            finding.version = spec.version
+    return results
+
+
+def run_detectors(
+    specs: Sequence[DetectorSpec],
+    inputs: DetectionInputs,
+    metrics: Optional[MetricsRecorder] = None,
+) -> List[Finding]:
+    results = run_detectors_by_id(specs, inputs, metrics)
+    return [finding for spec in specs for finding in results[spec.id]]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import html as html_lib
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from gpvb.detect.fragments import FragmentCache, default_fragment_cache, split_boilerplate
+
+if TYPE_CHECKING:
+    from gpvb.models import PageResult
+
+
+# How far past a trigger (``setTimeout(``, ``onload=``, ``window.location =``) its target is
+# looked for. Every search is bounded like this, so a scan stays linear in the page size even
+# on minified single-line bundles that made the old ``.*``/``[^)]*`` regexes backtrack.
+WINDOW = 1024
+MAX_TAG = 2048
+DOWNLOAD_EXTENSIONS = ("exe", "apk", "zip", "msi")
+RELOAD_TARGETS = ("reload", "adsbygoogle", "googlesyndication")
+
+_TIMER = re.compile(r"set(?:interval|timeout)\s*\(")
+_LOAD_HANDLER = re.compile(r"onload\s*=|addeventlistener\(\s*['\"]load['\"]")
+_LOCATION_ASSIGN = re.compile(r"window\.location(?:\.href)?\s*=\s*(['\"])")
+_DOWNLOAD_URL = re.compile(r".\.(?:" + "|".join(DOWNLOAD_EXTENSIONS) + ")")
+# A tag ends at its ``>`` or, when malformed, at the next ``<``; either way at MAX_TAG.
+_META = re.compile(r"<meta\b([^<>]{0,%d})" % MAX_TAG)
+_ANCHOR = re.compile(r"<a\s([^<>]{0,%d})" % MAX_TAG)
+_ATTRIBUTE = re.compile(r"([a-z-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))")
+_DELAY = re.compile(r"\s*(\d+)")
+_REFRESH_URL = re.compile(r"url\s*=\s*['\"]?([^'\"\s;]+)")
+
+
+@dataclass(frozen=True)
+class MetaRefresh:
+    """A ``<meta http-equiv=refresh>`` tag; ``delay`` is None when ``content`` has no number."""
+
+    delay: Optional[int]
+    url: str = ""
+
+
+@dataclass
+class ScriptFacts:
+    """What the reload, redirect and download detectors need from a page's scripts and markup.
+
+    Built by ``scan_scripts`` in one pass: inline ``<script>`` bodies and the markup around them
+    (event-handler attributes) are scanned separately, so a trigger in one script never pairs
+    with a target in another, and ``<meta>`` refresh tags are parsed once. ``links`` holds the
+    lowercased ``href`` of every ``<a>`` in document order.
+    """
+
+    html: str = ""
+    meta_refresh: List[MetaRefresh] = field(default_factory=list)
+    timer_reload: bool = False
+    load_redirect: bool = False
+    location_replace: bool = False
+    download_redirect: bool = False
+    links: List[str] = field(default_factory=list)
+
+    @property
+    def fast_refresh(self) -> bool:
+        return any(meta.delay is not None and meta.delay < 5 for meta in self.meta_refresh)
+
+    @property
+    def refresh_download(self) -> bool:
+        return any(_is_download(meta.url) for meta in self.meta_refresh)
+
+
+@dataclass(frozen=True)
+class _FragmentScan:
+    timer_reload: bool
+    load_redirect: bool
+    location_replace: bool
+    download_redirect: bool
+    links: Tuple[str, ...] = ()
+
+
+def scan_scripts(html: str, cache: Optional[FragmentCache] = None) -> ScriptFacts:
+    """Scan ``html``, reusing the results for inline scripts and template blocks from ``cache``.
+
+    Script bodies and ``<nav>``/``<header>``/``<footer>``/``<aside>`` elements are looked up in
+    ``cache`` (the process-wide ``default_fragment_cache`` unless given); only the rest of the
+    markup, which is usually unique to the page, is always scanned.
+    """
+    cache = cache if cache is not None else default_fragment_cache()
+    facts = ScriptFacts(html=html)
+    lower = html.lower()
+    facts.meta_refresh = list(_meta_refreshes(lower))
+    for kind, source in _sources(lower):
+        if kind == "script":
+            scan = cache.get_or_compute(kind, source, _scan_script)
+        elif kind == "boilerplate":
+            scan = cache.get_or_compute(kind, source, _scan_markup)
+        else:
+            scan = _scan_markup(source)
+        facts.timer_reload = facts.timer_reload or scan.timer_reload
+        facts.load_redirect = facts.load_redirect or scan.load_redirect
+        facts.location_replace = facts.location_replace or scan.location_replace
+        facts.download_redirect = facts.download_redirect or scan.download_redirect
+        facts.links.extend(scan.links)
+    return facts
+
+
+def script_facts(page: "PageResult") -> ScriptFacts:
+    """The page's ``ScriptFacts``, scanned on first use and cached until ``page.html`` changes."""
+    html = page.html or ""
+    facts = page._script_facts
+    if facts is None or (facts.html is not html and facts.html != html):
+        facts = scan_scripts(html)
+        page._script_facts = facts
+    return facts
+
+
+def _scan_script(source: str) -> _FragmentScan:
+    return _FragmentScan(
+        timer_reload=_has_timer_reload(source),
+        load_redirect=_has_load_redirect(source),
+        location_replace="location.replace(" in source,
+        download_redirect=_has_download_redirect(source),
+    )
+
+
+def _scan_markup(source: str) -> _FragmentScan:
+    scan = _scan_script(source)
+    links = tuple(
+        html_lib.unescape(href)
+        for href in (_attributes(match.group(1)).get("href") for match in _ANCHOR.finditer(source))
+        if href is not None
+    )
+    return _FragmentScan(
+        scan.timer_reload, scan.load_redirect, scan.location_replace, scan.download_redirect, links
+    )
+
+
+def _sources(lower: str) -> Iterator[Tuple[str, str]]:
+    """``(kind, text)`` for each inline script body, then for the markup around them.
+
+    The markup is cut into ``boilerplate`` elements and the ``page`` markup between them.
+    """
+    markup: List[str] = []
+    position = 0
+    while position < len(lower):
+        start = lower.find("<script", position)
+        body_start = lower.find(">", start) if start >= 0 else -1
+        if body_start < 0:
+            markup.append(lower[position:])
+            break
+        markup.append(lower[position : body_start + 1])
+        end = lower.find("</script", body_start)
+        if end < 0:
+            yield "script", lower[body_start + 1 :]
+            break
+        yield "script", lower[body_start + 1 : end]
+        position = end
+    for boilerplate, piece in split_boilerplate("".join(markup)):
+        yield ("boilerplate" if boilerplate else "page"), piece
+
+
+def _meta_refreshes(lower: str) -> Iterator[MetaRefresh]:
+    for match in _META.finditer(lower):
+        tag = match.group(1)
+        if "refresh" not in tag:
+            continue
+        attributes = _attributes(tag)
+        if attributes.get("http-equiv") != "refresh":
+            continue
+        content = attributes.get("content", "")
+        delay = _DELAY.match(content)
+        url = _REFRESH_URL.search(content)
+        yield MetaRefresh(int(delay.group(1)) if delay else None, url.group(1) if url else "")
+
+
+def _attributes(tag: str) -> Dict[str, str]:
+    values: Dict[str, str] = {}
+    for match in _ATTRIBUTE.finditer(tag):
+        value = next((group for group in match.groups()[1:] if group is not None), "")
+        values.setdefault(match.group(1), value.strip())
+    return values
+
+
+def _has_timer_reload(source: str) -> bool:
+    """``setTimeout``/``setInterval`` whose arguments mention a reload or the ad script."""
+    for match in _TIMER.finditer(source):
+        start = match.end()
+        stop = _closing_paren(source, start, start + WINDOW)
+        if any(source.find(target, start, stop) >= 0 for target in RELOAD_TARGETS):
+            return True
+    return False
+
+
+def _closing_paren(source: str, start: int, limit: int) -> int:
+    """Index of the ``)`` closing the call opened just before ``start``, or ``limit``.
+
+    Parentheses are counted between each ``)`` rather than per character, so callbacks such as
+    ``function(){location.reload()}`` stay inside the arguments.
+    """
+    depth = 0
+    position = start
+    while True:
+        close = source.find(")", position, limit)
+        if close < 0:
+            return limit
+        depth += source.count("(", position, close)
+        if depth == 0:
+            return close
+        depth -= 1
+        position = close + 1
+
+
+def _has_load_redirect(source: str) -> bool:
+    """A load handler followed on the same line by a ``location`` change."""
+    for match in _LOAD_HANDLER.finditer(source):
+        start = match.end()
+        stop = source.find("\n", start, start + WINDOW)
+        stop = stop if stop >= 0 else start + WINDOW
+        if source.find("location", start, stop) >= 0:
+            return True
+    return False
+
+
+def _has_download_redirect(source: str) -> bool:
+    """``window.location = '...'`` pointing at an executable or archive."""
+    for match in _LOCATION_ASSIGN.finditer(source):
+        start = match.end()
+        stop = source.find(match.group(1), start, start + WINDOW)
+        stop = stop if stop >= 0 else start + WINDOW
+        if _DOWNLOAD_URL.search(source, start, stop):
+            return True
+    return False
+
+
+def _is_download(url: str) -> bool:
+    return bool(url) and _DOWNLOAD_URL.search(url) is not None
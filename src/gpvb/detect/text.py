@@ -1,10 +1,48 @@
 from __future__ import annotations
 
+import hashlib
+import math
 import re
-from typing import List, Tuple
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+import lxml.html
+from lxml import etree
 from readability import Document
 
+if TYPE_CHECKING:
+    from gpvb.models import PageResult
+
+
+TEXT_MODES = ("main", "innertext", "browser_main", "readability")
+
+_BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer",
+    "aside", "form",
+)
+_BLOCK_TAGS = ("p", "pre", "blockquote", "li", "td", "h1", "h2", "h3", "h4", "h5", "h6")
+_MIN_MAIN_SHARE = 0.25
+_TOKEN = re.compile(r"\w+")
+_SENTENCE_SPLIT = re.compile(r"[.!?]+")
+
+
+def extract_text(
+    html: str, mode: str = "main", inner_text: str = "", main_text: str = ""
+) -> str:
+    """Visible text for ``mode`` (one of ``TEXT_MODES``).
+
+    ``innertext`` and ``browser_main`` reuse what the browser already computed for the page and
+    fall back to ``main`` when it is missing, as it is for statically fetched pages.
+    """
+    if mode == "innertext" and inner_text:
+        return _normalize_space(inner_text)
+    if mode == "browser_main" and main_text:
+        return _normalize_space(main_text)
+    if mode == "readability":
+        return extract_visible_text(html)
+    return extract_main_text(html)
+
 
 def extract_visible_text(html: str) -> str:
     try:
@@ -15,26 +53,127 @@ def extract_visible_text(html: str) -> str:
     return _strip_tags(summary)
 
 
+def extract_main_text(html: str) -> str:
+    """Main-content text from one lxml parse, without readability's scoring passes.
+
+    Boilerplate elements are dropped, then each text block credits its length to its parent
+    (and half to its grandparent); the best-scoring container wins. Pages whose best container
+    holds only a small share of the text fall back to the whole body.
+    """
+    if not html or not html.strip():
+        return ""
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return _strip_tags(html)
+    etree.strip_elements(root, *_BOILERPLATE_TAGS, etree.Comment, with_tail=False)
+    body = root.find("body")
+    body = body if body is not None else root
+    body_text = _element_text(body)
+    scores: Dict[etree._Element, float] = {}
+    for block in body.iter(*_BLOCK_TAGS):
+        length = len(block.text_content().strip())
+        if length < 25:
+            continue
+        parent = block.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0.0) + length
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0.0) + length / 2
+    best: Optional[etree._Element] = max(scores, key=scores.__getitem__) if scores else None
+    if best is None:
+        return body_text
+    main_text = _element_text(best)
+    if len(main_text) < len(body_text) * _MIN_MAIN_SHARE:
+        return body_text
+    return main_text
+
+
 def _strip_tags(html: str) -> str:
     return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", html)).strip()
 
 
+def _element_text(element: etree._Element) -> str:
+    return _normalize_space(" ".join(element.itertext()))
+
+
+def _normalize_space(text: str) -> str:
+    return " ".join(text.split())
+
+
 def word_count(text: str) -> int:
     if not text:
         return 0
     return len(text.split())
 
 
-def simhash(text: str, hash_bits: int = 64) -> int:
-    tokens = re.findall(r"\w+", text.lower())
-    if not tokens:
+@dataclass(frozen=True)
+class TextProfile:
+    """Text statistics shared by every text-based detector, built in one pass over the text.
+
+    ``tokens`` are lowercased ``\\w+`` runs; ``word_count`` keeps the whitespace-split count
+    used by the thin-content thresholds.
+    """
+
+    text: str
+    lower: str
+    tokens: Tuple[str, ...]
+    word_count: int
+    frequencies: Dict[str, int] = field(repr=False)
+    entropy: float
+    sentence_count: int
+    unique_sentence_ratio: float
+    fingerprint: int
+
+    @classmethod
+    def from_text(cls, text: str) -> "TextProfile":
+        lower = text.lower()
+        tokens = tuple(_TOKEN.findall(lower))
+        frequencies = Counter(tokens)
+        total = len(tokens)
+        entropy = 0.0
+        for count in frequencies.values():
+            p = count / total
+            entropy -= p * math.log2(p)
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+        return cls(
+            text=text,
+            lower=lower,
+            tokens=tokens,
+            word_count=len(text.split()),
+            frequencies=dict(frequencies),
+            entropy=entropy,
+            sentence_count=len(sentences),
+            unique_sentence_ratio=len(set(sentences)) / len(sentences) if sentences else 1.0,
+            fingerprint=_simhash_counts(frequencies),
+        )
+
+
+def text_profile(page: "PageResult") -> TextProfile:
+    """The page's ``TextProfile``, built on first use and cached until ``page.text`` changes."""
+    text = page.text or ""
+    profile = page._text_profile
+    if profile is None or (profile.text is not text and profile.text != text):
+        profile = TextProfile.from_text(text)
+        page._text_profile = profile
+    return profile
+
+
+def _token_hash(token: str) -> int:
+    # Built-in hash() is salted per process, which made fingerprints differ between runs.
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _simhash_counts(frequencies: Dict[str, int], hash_bits: int = 64) -> int:
+    if not frequencies:
         return 0
     v = [0] * hash_bits
-    for token in tokens:
-        h = hash(token)
+    for token, count in frequencies.items():
+        h = _token_hash(token)
         for i in range(hash_bits):
-            bitmask = 1 << i
-            v[i] += 1 if h & bitmask else -1
+            v[i] += count if h >> i & 1 else -count
     fingerprint = 0
     for i in range(hash_bits):
         if v[i] >= 0:
@@ -42,14 +181,24 @@ def simhash(text: str, hash_bits: int = 64) -> int:
     return fingerprint
 
 
+def simhash(text: str, hash_bits: int = 64) -> int:
+    return _simhash_counts(Counter(_TOKEN.findall(text.lower())), hash_bits)
+
+
 def simhash_similarity(a: int, b: int, hash_bits: int = 64) -> float:
     x = a ^ b
     dist = bin(x).count("1")
     return 1 - dist / hash_bits
 
 
-def cluster_simhash(urls: List[str], texts: List[str], threshold: float) -> List[Tuple[List[str], float]]:
-    hashes = [simhash(text) for text in texts]
+def cluster_simhash(
+    urls: List[str],
+    texts: List[str],
+    threshold: float,
+    fingerprints: Optional[List[int]] = None,
+) -> List[Tuple[List[str], float]]:
+    """Group near-duplicate texts; pass precomputed ``fingerprints`` to skip hashing ``texts``."""
+    hashes = fingerprints if fingerprints is not None else [simhash(text) for text in texts]
     clusters: List[Tuple[List[str], float]] = []
     used = set()
     for i, base_hash in enumerate(hashes):
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+# Samples kept per histogram for percentiles; beyond this they are a uniform random sample.
+RESERVOIR_SIZE = 4096
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` for ``q`` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+class Histogram:
+    """Cumulative-bucket duration histogram with a bounded sample reservoir for percentiles.
+
+    Counts, total and max are exact. Percentiles are exact up to ``reservoir_size`` samples
+    and estimated from a uniform reservoir sample (Algorithm R) after that, so memory stays
+    constant on long crawls.
+    """
+
+    def __init__(
+        self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, reservoir_size: int = RESERVOIR_SIZE
+    ) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.samples: List[float] = []
+        self.reservoir_size = reservoir_size
+        self.total = 0.0
+        self.max = 0.0
+        self._count = 0
+        # Seeded so two runs over the same samples report the same percentiles.
+        self._random = random.Random(0)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self._count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(value)
+        else:
+            slot = self._random.randrange(self._count)
+            if slot < self.reservoir_size:
+                self.samples[slot] = value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add ``other``'s observations; reservoirs are combined in proportion to counts."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        combined = self._count + other._count
+        if len(self.samples) + len(other.samples) <= self.reservoir_size:
+            self.samples.extend(other.samples)
+        elif combined:
+            theirs = round(self.reservoir_size * other._count / combined)
+            theirs = min(theirs, len(other.samples))
+            mine = min(self.reservoir_size - theirs, len(self.samples))
+            self.samples = self._random.sample(self.samples, mine) + self._random.sample(
+                other.samples, theirs
+            )
+        self._count = combined
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        rows = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            rows.append((_format_bound(bound), running))
+        rows.append(("+Inf", self.count))
+        return rows
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "p50_ms": round(percentile(self.samples, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.samples, 95) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class Gauge:
+    def __init__(self) -> None:
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+        self.samples = 0
+
+    def set(self, value: float) -> None:
+        self.last = value
+        self.max = max(self.max, value)
+        self.total += value
+        self.samples += 1
+
+    def summary(self) -> Dict[str, float]:
+        mean = self.total / self.samples if self.samples else 0.0
+        return {"last": self.last, "max": self.max, "mean": round(mean, 3)}
+
+
+class MetricsRecorder:
+    """Timing spans, gauges and counters for one audit run.
+
+    Stages cover the crawl pipeline (``render``, ``extract_text``, ...), detectors are kept in a
+    separate family, and spans tagged with a URL feed the slowest-URL breakdown.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = workers
+        self.stages: Dict[str, Histogram] = defaultdict(Histogram)
+        self.detectors: Dict[str, Histogram] = defaultdict(Histogram)
+        self.detector_skips: Dict[str, int] = defaultdict(int)
+        self.detector_costs: Dict[str, str] = {}
+        self.gauges: Dict[str, Gauge] = defaultdict(Gauge)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.event_loop_lag = Histogram()
+        self.url_stages: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.events: List[Dict[str, Any]] = []
+        self.worker_busy_s = 0.0
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+
+    @contextmanager
+    def span(self, stage: str, url: Optional[str] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, url)
+
+    def record(self, stage: str, seconds: float, url: Optional[str] = None) -> None:
+        self.stages[stage].observe(seconds)
+        if url:
+            self.url_stages[url][stage] += seconds
+
+    @contextmanager
+    def detector_span(self, name: str, cost: Optional[str] = None) -> Iterator[None]:
+        if cost:
+            self.detector_costs[name] = cost
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.detectors[name].observe(time.perf_counter() - started)
+
+    def detector_skipped(self, name: str, cost: Optional[str] = None) -> None:
+        """Count a detector that a prefilter ruled out for a page."""
+        if cost:
+            self.detector_costs[name] = cost
+        self.detector_skips[name] += 1
+
+    def _detector_summary(self) -> Dict[str, Dict[str, Any]]:
+        summary: Dict[str, Dict[str, Any]] = {}
+        for name in sorted(set(self.detectors) | set(self.detector_skips)):
+            hist = self.detectors.get(name) or Histogram()
+            summary[name] = {**hist.summary(), "skipped": self.detector_skips.get(name, 0)}
+            if name in self.detector_costs:
+                summary[name]["cost"] = self.detector_costs[name]
+        return summary
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        self.counters[name] += amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self.gauges[name].set(value)
+
+    def event(self, kind: str, **fields: Any) -> None:
+        """Log a timestamped run event (for example a concurrency decision) to metrics.json."""
+        self.events.append({"kind": kind, "t_s": round(self.wall_s, 3), **fields})
+
+    def add_worker_busy(self, seconds: float) -> None:
+        self.worker_busy_s += seconds
+
+    def finish(self) -> None:
+        self._finished = time.perf_counter()
+
+    @property
+    def wall_s(self) -> float:
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+    def worker_utilization(self) -> float:
+        capacity = self.wall_s * max(self.workers, 1)
+        return round(self.worker_busy_s / capacity, 4) if capacity else 0.0
+
+    async def monitor(
+        self, interval_s: float = 0.1, queue_depth: Optional[Callable[[], int]] = None
+    ) -> None:
+        """Sample event-loop lag (and optionally queue depth) until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval_s
+            await asyncio.sleep(interval_s)
+            self.event_loop_lag.observe(max(0.0, loop.time() - expected))
+            if queue_depth is not None:
+                self.set_gauge("queue_depth", queue_depth())
+
+    def slowest_urls(self, count: int, total_stage: str = "page_total") -> List[Dict[str, Any]]:
+        ranked = sorted(
+            self.url_stages.items(), key=lambda item: item[1].get(total_stage, 0.0), reverse=True
+        )
+        return [
+            {
+                "url": url,
+                "total_ms": round(stages.get(total_stage, 0.0) * 1000, 1),
+                "stages_ms": {
+                    stage: round(seconds * 1000, 1)
+                    for stage, seconds in sorted(stages.items())
+                    if stage != total_stage
+                },
+            }
+            for url, stages in ranked[:count]
+        ]
+
+    def summary(self, slowest: int = 0) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "wall_s": round(self.wall_s, 3),
+            "workers": self.workers,
+            "worker_utilization": self.worker_utilization(),
+            "stages": {name: hist.summary() for name, hist in sorted(self.stages.items())},
+            "detectors": self._detector_summary(),
+            "event_loop_lag": self.event_loop_lag.summary(),
+            "gauges": {name: gauge.summary() for name, gauge in sorted(self.gauges.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if slowest:
+            data["slowest_urls"] = self.slowest_urls(slowest)
+        if self.events:
+            data["events"] = list(self.events)
+        return data
+
+    def to_json(self, slowest: int = 0) -> Dict[str, Any]:
+        data = self.summary(slowest)
+        data["histograms"] = {
+            "stages": {name: _buckets(hist) for name, hist in sorted(self.stages.items())},
+            "detectors": {name: _buckets(hist) for name, hist in sorted(self.detectors.items())},
+            "event_loop_lag": _buckets(self.event_loop_lag),
+        }
+        return data
+
+    def to_openmetrics(self) -> str:
+        lines: List[str] = []
+        _histogram_family(lines, "gpvb_stage_duration_seconds", "stage", self.stages)
+        _histogram_family(lines, "gpvb_detector_duration_seconds", "detector", self.detectors)
+        _histogram_family(
+            lines, "gpvb_event_loop_lag_seconds", None, {"": self.event_loop_lag}
+        )
+        lines.append("# TYPE gpvb_worker_utilization_ratio gauge")
+        lines.append(f"gpvb_worker_utilization_ratio {self.worker_utilization()}")
+        for name, gauge in sorted(self.gauges.items()):
+            metric = f"gpvb_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} gauge")
+            for stat, value in gauge.summary().items():
+                lines.append(f'{metric}{{stat="{stat}"}} {value}')
+        if self.detector_skips:
+            lines.append("# TYPE gpvb_detector_skipped counter")
+            for name, count in sorted(self.detector_skips.items()):
+                lines.append(f'gpvb_detector_skipped_total{{detector="{name}"}} {count}')
+        for name, value in sorted(self.counters.items()):
+            metric = f"gpvb_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}_total {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, out_dir: Path, slowest: int = 0) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / "metrics.json").write_text(json.dumps(self.to_json(slowest), indent=2))
+        (out_dir / "metrics.prom").write_text(self.to_openmetrics())
+
+
+def _buckets(hist: Histogram) -> Dict[str, Any]:
+    return {"buckets": dict(hist.cumulative()), "count": hist.count, "sum": round(hist.total, 6)}
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _metric_name(name: str) -> str:
+    return "".join(char if char.isalnum() else "_" for char in name)
+
+
+def _histogram_family(
+    lines: List[str], metric: str, label: Optional[str], histograms: Dict[str, Histogram]
+) -> None:
+    lines.append(f"# TYPE {metric} histogram")
+    lines.append(f"# UNIT {metric} seconds")
+    for name, hist in sorted(histograms.items()):
+        prefix = f'{label}="{name}",' if label else ""
+        labels = f"{{{prefix[:-1]}}}" if label else ""
+        for bound, count in hist.cumulative():
+            lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {count}')
+        lines.append(f"{metric}_count{labels} {hist.count}")
+        lines.append(f"{metric}_sum{labels} {round(hist.total, 6)}")
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Severity(str, Enum):
@@ -20,16 +20,47 @@ class FindingCategory(str, Enum):
 
 
 class Finding(BaseModel):
+    """One detector hit on one page.
+
+    Only what is specific to the page is stored here; the message, category, remediation and
+    policy links are looked up by ``detector`` and ``version`` in the catalog (see
+    ``DetectorInfo``). ``version`` is the version of the detector that produced the finding.
+    """
+
     detector: str
+    version: str = "1"
     severity: Severity
-    message: str
-    category: FindingCategory = FindingCategory.general
     confidence: float = Field(default=0.0, ge=0.0, le=1.0)
-    remediation: List[str] = Field(default_factory=list)
-    policy_links: List[str] = Field(default_factory=list)
     evidence: Dict[str, Any] = Field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class DetectorInfo:
+    """Static metadata for one finding ``detector`` id, shared by all of its findings.
+
+    ``severity`` and ``confidence`` are the defaults findings are created with. ``version`` is
+    the version of the detector that emits it, filled in when the catalog entry is registered.
+    """
+
+    detector: str
+    message: str
+    severity: Severity
+    confidence: float = 0.0
+    category: FindingCategory = FindingCategory.general
+    remediation: Tuple[str, ...] = ()
+    policy_links: Tuple[str, ...] = ()
+    version: str = "1"
+
+    def finding(self, evidence: Optional[Dict[str, Any]] = None) -> Finding:
+        return Finding(
+            detector=self.detector,
+            version=self.version,
+            severity=self.severity,
+            confidence=self.confidence,
+            evidence=evidence or {},
+        )
+
+
 class AdElement(BaseModel):
     selector: str
     x: float
@@ -48,10 +79,23 @@ class PageResult(BaseModel):
     html: str
     text: str
     screenshot_path: Optional[str] = None
+    # Requests per host seen while rendering.
     network_summary: Dict[str, int] = Field(default_factory=dict)
+    # How the renderer served those requests: asset cache hits, misses and bytes saved, stubbed
+    # ad requests. Kept apart so every ``network_summary`` key is a host.
+    render_stats: Dict[str, int] = Field(default_factory=dict)
     ad_elements: List[AdElement] = Field(default_factory=list)
     findings: List[Finding] = Field(default_factory=list)
     skipped_reason: Optional[str] = None
+    render_tier: str = "browser"
+    url_pattern: Optional[str] = None
+    # URL of an earlier page with byte-identical rendered content whose results were reused.
+    duplicate_of: Optional[str] = None
+    # Derived text statistics, ad geometry and script facts, see ``gpvb.detect.text.text_profile``,
+    # ``gpvb.detect.geometry.ad_rects`` and ``gpvb.detect.scripts.script_facts``; never serialized.
+    _text_profile: Any = PrivateAttr(default=None)
+    _ad_rects: Any = PrivateAttr(default=None)
+    _script_facts: Any = PrivateAttr(default=None)
 
 
 class CrawlConfig(BaseModel):
@@ -59,15 +103,51 @@ class CrawlConfig(BaseModel):
     out_dir: str
     max_pages: int = 500
     max_depth: int = 3
+    # Wall-clock budget for the whole audit; URLs are then crawled most important first.
+    time_budget_s: Optional[float] = None
+    # ``StopCondition.parse`` syntax; the audit ends early once account risk meets it.
+    stop_when: Optional[str] = None
     concurrency: int = 6
+    # With adaptive_concurrency, render slots start at ``concurrency`` and move within
+    # [min_concurrency, max_concurrency]; max_concurrency defaults to twice ``concurrency``.
+    adaptive_concurrency: bool = False
+    min_concurrency: int = 1
+    max_concurrency: Optional[int] = None
+    browsers: int = 1
+    recycle_after_pages: int = 200
+    recycle_rss_mb: Optional[int] = None
+    # Static assets shared across browser contexts, kept in memory or under asset_cache_dir
+    # (0: off).
+    asset_cache_mb: int = 256
+    asset_cache_dir: Optional[str] = None
+    # NetworkArchive directories: record every response of the crawl, or serve every request
+    # from an earlier recording without network access.
+    record_har_dir: Optional[str] = None
+    replay_dir: Optional[str] = None
+    # Answer ad-network requests with placeholder creatives sized like the page's ad slots.
+    stub_ads: bool = False
+    max_render_retries: int = 2
     respect_robots: bool = True
     user_agent: str = "GPVB/1.0"
     include_regex: Optional[str] = None
     exclude_regex: Optional[str] = None
     ignore_querystrings: bool = False
+    # URLNormalizer.from_dict rules, including per-host overrides under "sites".
+    url_rules: Dict[str, Any] = Field(default_factory=dict)
     rate_limit_ms: int = 250
     list_skipped: bool = True
     enable_program_policy_checks: bool = True
+    detectors: List[str] = Field(default_factory=list)
+    snapshots: bool = True
+    render_mode: str = "full"
+    pre_resolve: bool = True
+    # Probe a random URL and skip crawled pages that match the site's "not found" page.
+    soft_404: bool = True
+    sample_per_pattern: int = 0
+    text_mode: str = "main"
+    slowest_urls: int = 10
+    # Findings identical on at least this many pages are reported once per template (0: off).
+    template_min_pages: int = 3
 
 
 @dataclass
@@ -76,10 +156,68 @@ class DuplicateCluster:
     similarity: float
 
 
+@dataclass
+class FindingRate:
+    """How many sampled pages of a URL pattern had a finding, extrapolated to the pattern."""
+
+    pages: int
+    rate: float
+    low: float
+    high: float
+    estimated_pages: int
+    estimated_low: int
+    estimated_high: int
+
+
+@dataclass
+class PatternEstimate:
+    pattern: str
+    discovered: int
+    sampled: int
+    cohesion: Optional[float] = None
+    findings: Dict[str, FindingRate] = field(default_factory=dict)
+
+
+@dataclass
+class TemplateFinding:
+    """One finding that site-wide markup put on many pages, reported once for all of them.
+
+    ``finding`` is the shared finding (same detector and evidence on every page), ``urls`` all
+    of the affected pages and ``patterns`` their URL patterns, most common first.
+    """
+
+    finding: Finding
+    pages: int
+    urls: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+
+
+@dataclass
+class UrlAlias:
+    """A crawled URL that was not rendered because it resolves to an already audited page."""
+
+    url: str
+    target: str
+    reason: str
+
+
 class FindingsReport(BaseModel):
     summary: Dict[str, Dict[str, int]]
     program_policy_summary: Dict[str, Dict[str, int]] = Field(default_factory=dict)
     account_risk: Dict[str, Any] = Field(default_factory=dict)
     pages: List[PageResult]
     duplicates: List[DuplicateCluster]
+    aliases: List[UrlAlias] = Field(default_factory=list)
+    url_patterns: List[PatternEstimate] = Field(default_factory=list)
+    # Findings repeated across pages by a shared template; removed from those pages' findings.
+    template_findings: List[TemplateFinding] = Field(default_factory=list)
+    coverage: Dict[str, Any] = Field(default_factory=dict)
+    # Set when ``stop_when`` ended the audit: the condition met, pages audited, URLs dropped.
+    early_termination: Dict[str, Any] = Field(default_factory=dict)
+    # Set when ads were rendered as placeholder creatives: the number of requests stubbed.
+    ad_stubs: Dict[str, Any] = Field(default_factory=dict)
+    # Metadata for every detector id and version the report's findings reference, emitted once.
+    catalog: Dict[str, Dict[str, DetectorInfo]] = Field(default_factory=dict)
     site: str
+    run_id: Optional[str] = None
+    metrics: Dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from gpvb.audit import build_report, select_detectors, write_report
+from gpvb.detect.registry import DetectionInputs, default_registry, run_detectors_by_id
+from gpvb.metrics import Histogram, MetricsRecorder
+from gpvb.models import CrawlConfig, FindingsReport
+from gpvb.snapshots import SNAPSHOT_FILE, PageSnapshot, SnapshotStore
+
+
+ChunkResult = Tuple[List[str], Dict[str, Histogram], Dict[str, int]]
+
+
+def redetect_run(
+    out_dir: Path,
+    run_id: str = "latest",
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> FindingsReport:
+    """Rebuild a run's report from its snapshots, re-running only detectors whose version changed.
+
+    Findings from detectors whose version matches the one recorded for the run are reused as-is;
+    ``force`` re-runs every selected detector. Snapshots and the run's detector versions are
+    updated so a later call only picks up further changes.
+    """
+    logger = logging.getLogger("gpvb")
+    path = out_dir / SNAPSHOT_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"No snapshots at {path}; run an audit with snapshots enabled")
+    store = SnapshotStore(path)
+    run = store.load_run(run_id)
+    config = CrawlConfig.model_validate({**run.config, "out_dir": str(out_dir)})
+    workers = workers or os.cpu_count() or 1
+    metrics = MetricsRecorder(workers=workers)
+
+    specs = select_detectors(config, default_registry())
+    stale = [
+        spec.id for spec in specs if force or run.detector_versions.get(spec.id) != spec.version
+    ]
+    raw = list(store.iter_snapshots(run.id))
+    logger.info(
+        "Re-running %s of %s detectors over %s snapshots from run %s",
+        len(stale),
+        len(specs),
+        len(raw),
+        run.id,
+    )
+    if stale:
+        with metrics.span("redetect"):
+            raw = _redetect_all(raw, stale, workers, metrics)
+    snapshots = [PageSnapshot.model_validate_json(data) for data in raw]
+    for spec in specs:
+        metrics.detector_costs.setdefault(spec.id, spec.cost)
+    if stale:
+        store.update_snapshots(run.id, snapshots)
+    run.detector_versions = {spec.id: spec.version for spec in specs}
+    store.save_run(run)
+
+    pages = [snapshot.to_page([spec.id for spec in specs]) for snapshot in snapshots]
+    report = build_report(config, pages, run.site_facts, metrics, run.id)
+    write_report(report, metrics, out_dir, config.slowest_urls)
+    return report
+
+
+def _redetect_all(
+    raw: List[str], detector_ids: List[str], workers: int, metrics: MetricsRecorder
+) -> List[str]:
+    if workers <= 1 or len(raw) < 2:
+        chunks = [_redetect_chunk(raw, detector_ids)]
+    else:
+        size = max(1, math.ceil(len(raw) / (workers * 4)))
+        parts = [raw[start : start + size] for start in range(0, len(raw), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_redetect_chunk, parts, [detector_ids] * len(parts)))
+    updated: List[str] = []
+    for snapshots, histograms, skips in chunks:
+        updated.extend(snapshots)
+        for name, histogram in histograms.items():
+            metrics.detectors[name].merge(histogram)
+        for name, count in skips.items():
+            metrics.detector_skips[name] += count
+    return updated
+
+
+def _redetect_chunk(raw: List[str], detector_ids: List[str]) -> ChunkResult:
+    registry = default_registry()
+    specs = [registry.get(detector_id) for detector_id in detector_ids]
+    metrics = MetricsRecorder()
+    updated = []
+    for data in raw:
+        snapshot = PageSnapshot.model_validate_json(data)
+        if not snapshot.page.skipped_reason:
+            page_specs = specs
+            if snapshot.page.render_tier == "static":
+                page_specs = [spec for spec in specs if not spec.needs_render]
+            inputs = DetectionInputs(
+                snapshot.page,
+                extras=snapshot.extras,
+                mobile_flags=snapshot.mobile_flags,
+                providers=registry.inputs,
+            )
+            snapshot.findings.update(run_detectors_by_id(page_specs, inputs, metrics))
+        updated.append(snapshot.model_dump_json())
+    return updated, dict(metrics.detectors), dict(metrics.detector_skips)
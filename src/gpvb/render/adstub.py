@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import base64
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+
+# Ad serving, auction and bidder hosts (and their subdomains) answered with stubs.
+AD_NETWORK_DOMAINS = (
+    "googlesyndication.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "rubiconproject.com",
+    "pubmatic.com",
+    "openx.net",
+    "casalemedia.com",
+    "indexww.com",
+    "criteo.com",
+    "criteo.net",
+    "adsrvr.org",
+    "smartadserver.com",
+    "3lift.com",
+    "sharethrough.com",
+    "teads.tv",
+    "lijit.com",
+    "taboola.com",
+    "outbrain.com",
+)
+# Loader scripts replaced by the stub runtime; every other ad script is replaced by nothing.
+RUNTIME_SCRIPTS = ("adsbygoogle.js", "gpt.js", "pubads_impl")
+
+# Fills ``ins.adsbygoogle`` slots on ``adsbygoogle.push`` and GPT slots on
+# ``googletag.display`` with an iframe the size of the slot: inline style, ``data-ad-width``/
+# ``data-ad-height`` or GPT sizes first, otherwise the container width and a standard height
+# for ``data-ad-format``.
+STUB_RUNTIME = """
+(function () {
+  if (window.__gpvbAdStub) return;
+  window.__gpvbAdStub = true;
+  var FORMAT_HEIGHTS = {horizontal: 90, rectangle: 250, vertical: 600};
+  var CHAINED = ['addService', 'setTargeting', 'clearTargeting', 'setCollapseEmptyDiv',
+    'enableSingleRequest', 'enableLazyLoad', 'collapseEmptyDivs', 'disableInitialLoad',
+    'enableServices', 'setCentering', 'setPrivacySettings', 'setRequestNonPersonalizedAds',
+    'addEventListener', 'removeEventListener', 'refresh', 'clear', 'updateCorrelator',
+    'setForceSafeFrame', 'setSafeFrameConfig', 'defineSizeMapping', 'setConfig', 'addSize'];
+  var adsenseCount = 0;
+  var slots = {};
+
+  function px(value) {
+    var number = parseInt(value, 10);
+    return number > 0 ? number : 0;
+  }
+  function slotSize(el) {
+    var width = px(el.style.width) || px(el.getAttribute('data-ad-width'));
+    var height = px(el.style.height) || px(el.getAttribute('data-ad-height'));
+    var format = (el.getAttribute('data-ad-format') || 'auto').split(',')[0].trim();
+    if (!width) {
+      var parent = el.parentElement;
+      width = Math.min(el.offsetWidth || (parent && parent.clientWidth) || window.innerWidth, 1200);
+      if (format === 'vertical') width = width >= 300 ? 300 : 160;
+    }
+    if (!height) {
+      height = FORMAT_HEIGHTS[format] ||
+        (width >= 970 ? 250 : width >= 728 ? 90 : width >= 300 ? 250 : 50);
+    }
+    return [width, height];
+  }
+  function fill(el, id, src, size) {
+    if (el.getAttribute('data-gpvb-stub')) return;
+    size = size || slotSize(el);
+    el.setAttribute('data-gpvb-stub', size.join('x'));
+    if (el.tagName === 'INS') el.setAttribute('data-ad-status', 'filled');
+    if (window.getComputedStyle(el).display === 'inline') el.style.display = 'block';
+    if (!px(el.style.height)) el.style.height = size[1] + 'px';
+    var frame = document.createElement('iframe');
+    frame.id = id;
+    frame.width = size[0];
+    frame.height = size[1];
+    frame.setAttribute('frameborder', '0');
+    frame.setAttribute('scrolling', 'no');
+    frame.style.border = '0';
+    frame.src = src + size.join('x');
+    el.appendChild(frame);
+  }
+  function chainable(target) {
+    CHAINED.forEach(function (name) {
+      if (!target[name]) target[name] = function () { return target; };
+    });
+    return target;
+  }
+  function firstSize(sizes) {
+    if (!Array.isArray(sizes) || !sizes.length) return null;
+    var size = Array.isArray(sizes[0]) ? sizes[0] : sizes;
+    return typeof size[0] === 'number' ? [size[0], size[1]] : null;
+  }
+
+  function push(params) {
+    // Auto ads configuration, not a slot.
+    if (params && params.enable_page_level_ads) return;
+    var next = document.querySelector('ins.adsbygoogle:not([data-gpvb-stub])');
+    if (next) {
+      fill(next, 'aswift_' + adsenseCount++,
+        'https://googleads.g.doubleclick.net/pagead/ads?gpvb_stub=');
+    }
+  }
+  var queued = Array.isArray(window.adsbygoogle) ? window.adsbygoogle : [];
+  window.adsbygoogle = {loaded: true, push: push};
+  queued.forEach(push);
+
+  var googletag = window.googletag = window.googletag || {};
+  var commands = Array.isArray(googletag.cmd) ? googletag.cmd : [];
+  var pubads = chainable({getSlots: function () { return Object.values(slots); }});
+  googletag.apiReady = true;
+  googletag.pubadsReady = true;
+  googletag.pubads = function () { return pubads; };
+  googletag.enableServices = function () {};
+  googletag.destroySlots = function () { return true; };
+  googletag.sizeMapping = function () {
+    return chainable({build: function () { return []; }});
+  };
+  googletag.defineSlot = function (path, sizes, id) {
+    var slot = chainable({
+      getSlotElementId: function () { return id; },
+      getAdUnitPath: function () { return path; },
+    });
+    slot.sizes = sizes;
+    slots[id] = slot;
+    return slot;
+  };
+  googletag.defineOutOfPageSlot = function (path) {
+    return chainable({getAdUnitPath: function () { return path; }});
+  };
+  googletag.display = function (target) {
+    var id = typeof target === 'string' ? target
+      : (target && target.getSlotElementId ? target.getSlotElementId() : target && target.id);
+    var slot = slots[id];
+    var el = id && document.getElementById(id);
+    if (!slot || !el) return;
+    fill(el, 'google_ads_iframe_' + slot.getAdUnitPath() + '_0',
+      'https://tpc.googlesyndication.com/safeframe/gpvb-stub?size=', firstSize(slot.sizes));
+  };
+  googletag.cmd = {push: function () {
+    for (var i = 0; i < arguments.length; i++) {
+      try { arguments[i](); } catch (e) {}
+    }
+    return 0;
+  }};
+  commands.forEach(function (command) { googletag.cmd.push(command); });
+})();
+"""
+
+PLACEHOLDER_CREATIVE = (
+    "<!doctype html><html><body style=\"margin:0\"><div style=\"width:100vw;height:100vh;"
+    "background:#d9d9d9;color:#777;font:12px sans-serif;display:flex;align-items:center;"
+    "justify-content:center\">Ad</div></body></html>"
+)
+TRANSPARENT_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+def is_ad_request(url: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in AD_NETWORK_DOMAINS)
+
+
+def stub_response(url: str, resource_type: str) -> Dict[str, Any]:
+    """``route.fulfill`` arguments replacing an ad-network response."""
+    if resource_type == "script":
+        path = urlsplit(url).path
+        body = STUB_RUNTIME if any(name in path for name in RUNTIME_SCRIPTS) else ""
+        return {"status": 200, "content_type": "application/javascript", "body": body}
+    if resource_type == "document":
+        return {"status": 200, "content_type": "text/html", "body": PLACEHOLDER_CREATIVE}
+    if resource_type == "image":
+        return {"status": 200, "content_type": "image/gif", "body": TRANSPARENT_GIF}
+    if resource_type == "stylesheet":
+        return {"status": 200, "content_type": "text/css", "body": ""}
+    return {"status": 204, "body": ""}
+
+
+class AdStubber:
+    """Answers ad-network requests locally so renders skip the real ad auction.
+
+    Detectors only need ad slot geometry and the layout around it. ``handler`` returns a
+    ``context.route`` callback that serves the stub runtime for the AdSense and GPT loaders,
+    a placeholder creative for ad iframes, and empty responses for bidders, pixels and
+    everything else on ``AD_NETWORK_DOMAINS``, so ad selectors resolve to the same rects on
+    every run without waiting for live creatives.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Counter = Counter()
+
+    def handler(self, page_stats: Optional[Counter] = None) -> Callable[[Any], Any]:
+        async def handle(route: Any) -> None:
+            request = route.request
+            if not is_ad_request(request.url):
+                await route.fallback()
+                return
+            await route.fulfill(**stub_response(request.url, request.resource_type))
+            self.stats["ad_requests_stubbed"] += 1
+            if page_stats is not None:
+                page_stats["ad_requests_stubbed"] += 1
+
+        return handle
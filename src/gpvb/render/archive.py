@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+
+
+HAR_FILE = "archive.har"
+# Bodies are stored decoded, so headers describing the transfer encoding would be wrong on replay.
+_UNREPLAYABLE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+Headers = List[Tuple[str, str]]
+
+
+def archive_key(
+    method: str, url: str, range_header: Optional[str] = None, body: bytes = b""
+) -> str:
+    """Identity of a request in the archive: method and URL, plus ``Range`` and body if any."""
+    key = f"{method.upper()} {url.split('#', 1)[0]}"
+    if range_header:
+        key += f" range={range_header}"
+    if body:
+        key += f" body={hashlib.sha1(body).hexdigest()}"
+    return key
+
+
+def header_dict(headers: Headers) -> Dict[str, str]:
+    """Merge repeated headers the way ``route.fulfill`` expects (one cookie per line)."""
+    merged: Dict[str, str] = {}
+    for name, value in headers:
+        name = name.lower()
+        if name in merged:
+            separator = "\n" if name == "set-cookie" else ", "
+            merged[name] = f"{merged[name]}{separator}{value}"
+        else:
+            merged[name] = value
+    return merged
+
+
+@dataclass
+class ArchivedResponse:
+    status: int
+    headers: Headers
+    file: Optional[str] = None
+    body: Optional[bytes] = None
+
+
+class NetworkArchive:
+    """Responses captured during one crawl, replayed later without touching the network.
+
+    The archive is a directory holding ``archive.har`` (HAR 1.2) and one file per distinct
+    response body, named by its SHA-1 and referenced from the HAR entries through ``_file`` as
+    Playwright's attached-content HARs do, so assets shared by many pages are stored once.
+    When recording, the first response seen for each request is kept. When replaying, a request
+    recorded under a different query string (ad correlators, cache-busters and other random
+    parameters) gets the response recorded for the same method, host and path whose query
+    shares the most parameters; requests with no such response fail as if the machine were
+    offline.
+
+    ``handler`` serves Chromium through ``context.route``; ``transport`` serves the httpx
+    client used for robots.txt, sitemaps, URL resolution and static fetches.
+    """
+
+    def __init__(self, directory: Path, replay: bool) -> None:
+        self.directory = Path(directory)
+        self.replaying = replay
+        self.stats: Counter = Counter()
+        self._entries: Dict[str, ArchivedResponse] = {}
+        # Responses by their key without the query, with the query parameters they were
+        # recorded under, for requests whose exact URL is not archived.
+        self._by_path: Dict[str, List[Tuple[Set[Tuple[str, str]], ArchivedResponse]]] = {}
+        self._har_entries: List[Dict[str, Any]] = []
+        self._files: Set[str] = set()
+        har_path = self.directory / HAR_FILE
+        if replay and not har_path.exists():
+            raise FileNotFoundError(f"No {HAR_FILE} in {self.directory}")
+        if har_path.exists():
+            self._load(har_path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def record(cls, directory: Path) -> "NetworkArchive":
+        return cls(directory, replay=False)
+
+    @classmethod
+    def replay(cls, directory: Path) -> "NetworkArchive":
+        return cls(directory, replay=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str) -> Optional[ArchivedResponse]:
+        return self._entries.get(key)
+
+    def find(
+        self, method: str, url: str, range_header: Optional[str] = None, body: bytes = b""
+    ) -> Optional[ArchivedResponse]:
+        """The response archived for a request, or the nearest one recorded for its path."""
+        key = archive_key(method, url, range_header, body)
+        entry = self.lookup(key)
+        if entry is not None:
+            return entry
+        candidates = self._by_path.get(_path_key(key, method, url))
+        if not candidates:
+            return None
+        params = _query_params(url)
+        # max() keeps the first of equally close candidates, i.e. the earliest recorded.
+        _, entry = max(candidates, key=lambda candidate: len(candidate[0] & params))
+        self.stats["archive_nearest_matches"] += 1
+        return entry
+
+    async def body(self, entry: ArchivedResponse) -> bytes:
+        if entry.body is not None:
+            return entry.body
+        return await asyncio.to_thread((self.directory / entry.file).read_bytes)
+
+    async def add(
+        self, key: str, method: str, url: str, status: int, headers: Headers, body: bytes
+    ) -> Headers:
+        """Store a response unless one is already archived for ``key``; returns replay headers."""
+        headers = [
+            (name, value) for name, value in headers if name.lower() not in _UNREPLAYABLE_HEADERS
+        ]
+        if key in self._entries:
+            return headers
+        name = hashlib.sha1(body).hexdigest()
+        self._index(key, method, url, ArchivedResponse(status, headers, file=name))
+        if name not in self._files:
+            self._files.add(name)
+            await asyncio.to_thread((self.directory / name).write_bytes, body)
+        self._har_entries.append(_har_entry(key, method, url, status, headers, name, len(body)))
+        self.stats["archive_recorded"] += 1
+        return headers
+
+    def handler(self) -> Callable[[Any], Any]:
+        """A ``context.route`` handler that records or replays every request."""
+
+        async def handle(route: Any) -> None:
+            request = route.request
+            range_header = request.headers.get("range")
+            post_data = request.post_data_buffer or b""
+            if self.replaying:
+                entry = self.find(request.method, request.url, range_header, post_data)
+                if entry is None:
+                    self.stats["archive_misses"] += 1
+                    await route.abort("internetdisconnected")
+                    return
+                self.stats["archive_replayed"] += 1
+                body = await self.body(entry)
+                await route.fulfill(
+                    status=entry.status, headers=header_dict(entry.headers), body=body
+                )
+                return
+            try:
+                response = await route.fetch(max_redirects=0)
+                body = await response.body()
+            except PlaywrightError:
+                # Not archived: the browser sees the same failure, and so will the replay.
+                await route.fallback()
+                return
+            headers = await self.add(
+                archive_key(request.method, request.url, range_header, post_data),
+                request.method,
+                request.url,
+                response.status,
+                [(header["name"], header["value"]) for header in response.headers_array],
+                body,
+            )
+            await route.fulfill(status=response.status, headers=header_dict(headers), body=body)
+
+        return handle
+
+    def transport(self, wrapped: Optional[httpx.AsyncBaseTransport] = None) -> "ArchiveTransport":
+        return ArchiveTransport(self, wrapped)
+
+    def close(self) -> None:
+        """Write the HAR index of a recording; replaying leaves the archive untouched."""
+        if self.replaying:
+            return
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "gpvb", "version": "1.0"},
+                "entries": self._har_entries,
+            }
+        }
+        path = self.directory / HAR_FILE
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(har), encoding="utf-8")
+        os.replace(temporary, path)
+
+    def _load(self, path: Path) -> None:
+        entries = json.loads(path.read_text(encoding="utf-8"))["log"]["entries"]
+        for entry in entries:
+            request, response = entry["request"], entry["response"]
+            headers = [(header["name"], header["value"]) for header in response["headers"]]
+            request_headers = header_dict(
+                [(header["name"], header["value"]) for header in request.get("headers", [])]
+            )
+            key = entry.get("_key") or archive_key(
+                request["method"], request["url"], request_headers.get("range")
+            )
+            content = response.get("content", {})
+            archived = ArchivedResponse(response["status"], headers, file=content.get("_file"))
+            if archived.file is None:
+                text = content.get("text", "")
+                archived.body = (
+                    base64.b64decode(text)
+                    if content.get("encoding") == "base64"
+                    else text.encode("utf-8")
+                )
+            else:
+                self._files.add(archived.file)
+            if key not in self._entries:
+                self._index(key, request["method"], request["url"], archived)
+            self._har_entries.append(entry)
+
+    def _index(self, key: str, method: str, url: str, entry: ArchivedResponse) -> None:
+        self._entries[key] = entry
+        self._by_path.setdefault(_path_key(key, method, url), []).append(
+            (_query_params(url), entry)
+        )
+
+
+class ArchiveTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records through ``wrapped`` or replays from a ``NetworkArchive``."""
+
+    def __init__(
+        self, archive: NetworkArchive, wrapped: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        self._archive = archive
+        self._wrapped = wrapped or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url, range_header = str(request.url), request.headers.get("range")
+        content = await request.aread()
+        if self._archive.replaying:
+            entry = self._archive.find(request.method, url, range_header, content)
+            if entry is None:
+                self._archive.stats["archive_misses"] += 1
+                raise httpx.ConnectError(f"{request.url} is not in the archive", request=request)
+            self._archive.stats["archive_replayed"] += 1
+            return httpx.Response(
+                entry.status,
+                headers=entry.headers,
+                content=await self._archive.body(entry),
+                request=request,
+            )
+        response = await self._wrapped.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        headers = await self._archive.add(
+            archive_key(request.method, url, range_header, content),
+            request.method,
+            url,
+            response.status_code,
+            list(response.headers.multi_items()),
+            body,
+        )
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self._wrapped.aclose()
+
+
+def _path_key(key: str, method: str, url: str) -> str:
+    """``key`` with the query removed from its URL; the ``Range`` and body parts are kept."""
+    prefix = archive_key(method, url)
+    suffix = key[len(prefix):] if key.startswith(prefix) else ""
+    return archive_key(method, urlsplit(url)._replace(query="", fragment="").geturl()) + suffix
+
+
+def _query_params(url: str) -> Set[Tuple[str, str]]:
+    return set(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+
+
+def _har_entry(
+    key: str, method: str, url: str, status: int, headers: Headers, file: str, size: int
+) -> Dict[str, Any]:
+    header_list = [{"name": name, "value": value} for name, value in headers]
+    location = header_dict(headers).get("location", "")
+    return {
+        "_key": key,
+        "startedDateTime": datetime.now(timezone.utc).isoformat(),
+        "time": 0,
+        "request": {
+            "method": method,
+            "url": url,
+            "httpVersion": "HTTP/1.1",
+            "headers": [],
+            "queryString": [],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": -1,
+        },
+        "response": {
+            "status": status,
+            "statusText": "",
+            "httpVersion": "HTTP/1.1",
+            "headers": header_list,
+            "cookies": [],
+            "content": {
+                "size": size,
+                "mimeType": header_dict(headers).get("content-type", ""),
+                "_file": file,
+            },
+            "redirectURL": location,
+            "headersSize": -1,
+            "bodySize": size,
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": 0, "receive": 0},
+    }
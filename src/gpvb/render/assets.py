@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from playwright.async_api import Error as PlaywrightError
+
+
+# Subresources worth keeping between renders; documents, XHR and media are always fetched.
+STATIC_RESOURCE_TYPES = ("stylesheet", "script", "font", "image")
+# Share of (Date - Last-Modified) a response without explicit freshness stays fresh (RFC 9111).
+HEURISTIC_FRESHNESS = 0.1
+# Headers describing the transfer rather than the (already decoded) body we replay.
+_TRANSFER_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "set-cookie")
+
+_DIRECTIVE = re.compile(r"([a-z-]+)\s*(?:=\s*\"?([^\",]*)\"?)?")
+
+
+def cache_directives(cache_control: str) -> Dict[str, str]:
+    return dict(_DIRECTIVE.findall(cache_control.lower()))
+
+
+def freshness_lifetime(headers: Dict[str, str], now: Optional[float] = None) -> float:
+    """Seconds a response may be reused without revalidation; 0 when it must not be stored.
+
+    Follows what a private browser cache does: ``no-store``, ``no-cache`` and a ``Vary`` on
+    anything but ``Accept-Encoding`` disable reuse, ``max-age`` wins over ``Expires``, and
+    ``Last-Modified`` alone gives a heuristic lifetime.
+    """
+    now = time.time() if now is None else now
+    headers = {name.lower(): value for name, value in headers.items()}
+    directives = cache_directives(headers.get("cache-control", ""))
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    vary = {part.strip().lower() for part in headers.get("vary", "").split(",") if part.strip()}
+    if vary - {"accept-encoding"}:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(directives["max-age"]) - _age(headers))
+        except ValueError:
+            return 0.0
+    date = _http_date(headers.get("date")) or now
+    expires = headers.get("expires")
+    if expires is not None:
+        expires_at = _http_date(expires)
+        return max(0.0, expires_at - date) if expires_at else 0.0
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified:
+        return max(0.0, (date - last_modified) * HEURISTIC_FRESHNESS)
+    return 0.0
+
+
+def _age(headers: Dict[str, str]) -> float:
+    try:
+        return float(headers.get("age", 0))
+    except ValueError:
+        return 0.0
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CachedAsset:
+    status: int
+    headers: Dict[str, str]
+    size: int
+    expires_at: float
+    body: Optional[bytes] = None
+
+
+class AssetCache:
+    """Static subresources shared by every browser context of a ``BrowserPool``.
+
+    Each render gets a fresh context, so without this Chromium downloads the site's CSS, JS
+    bundles, fonts and ad scripts again for every page (twice, counting the mobile pass).
+    ``handler`` returns a ``context.route`` callback that answers repeat ``GET``s for fresh
+    cached assets from memory, or from files in a private directory under ``directory`` when
+    given, and lets everything else through. Least recently used assets are evicted beyond
+    ``max_bytes``; ``close`` removes the files.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        directory: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.directory: Optional[Path] = None
+        if directory is not None:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            self.directory = Path(tempfile.mkdtemp(prefix="gpvb-assets-", dir=directory))
+        self.stats: Counter = Counter()
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._bytes = 0
+
+    def handler(self, page_stats: Optional[Counter] = None) -> Callable[[Any], Any]:
+        """A route handler that also counts hits and bytes saved into ``page_stats``."""
+
+        async def handle(route: Any) -> None:
+            request = route.request
+            if request.method != "GET" or request.resource_type not in STATIC_RESOURCE_TYPES:
+                await route.fallback()
+                return
+            cached = self.lookup(request.url)
+            if cached is not None:
+                body = await self._read(request.url, cached)
+                if body is not None:
+                    await route.fulfill(status=cached.status, headers=cached.headers, body=body)
+                    self._count(page_stats, "asset_cache_hits")
+                    self._count(page_stats, "asset_cache_bytes_saved", len(body))
+                    return
+            self._count(page_stats, "asset_cache_misses")
+            try:
+                response = await route.fetch()
+                body = await response.body()
+            except PlaywrightError:
+                # Let the browser make the request itself and see the failure.
+                await route.fallback()
+                return
+            await route.fulfill(response=response, body=body)
+            await self.store(request.url, response.status, response.headers, body)
+
+        return handle
+
+    def lookup(self, url: str) -> Optional[CachedAsset]:
+        cached = self._entries.get(url)
+        if cached is None:
+            return None
+        if cached.expires_at <= self._clock():
+            self._evict(url)
+            return None
+        self._entries.move_to_end(url)
+        return cached
+
+    async def store(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        now = self._clock()
+        lifetime = freshness_lifetime(headers, now)
+        lowered = {name.lower(): value for name, value in headers.items()}
+        if status != 200 or lifetime <= 0 or "set-cookie" in lowered or len(body) > self.max_bytes:
+            return False
+        self._evict(url)
+        kept = {name: value for name, value in lowered.items() if name not in _TRANSFER_HEADERS}
+        entry = CachedAsset(status, kept, len(body), now + lifetime)
+        if self.directory is None:
+            entry.body = body
+        else:
+            await asyncio.to_thread(self._path(url).write_bytes, body)
+        self._entries[url] = entry
+        self._bytes += entry.size
+        self.stats["stored"] += 1
+        while self._bytes > self.max_bytes and self._entries:
+            self._evict(next(iter(self._entries)))
+            self.stats["evicted"] += 1
+        return True
+
+    def close(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _read(self, url: str, cached: CachedAsset) -> Optional[bytes]:
+        if cached.body is not None:
+            return cached.body
+        try:
+            return await asyncio.to_thread(self._path(url).read_bytes)
+        except OSError:
+            self._evict(url)
+            return None
+
+    def _evict(self, url: str) -> None:
+        entry = self._entries.pop(url, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        if self.directory is not None:
+            self._path(url).unlink(missing_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return (self.directory or Path()) / hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _count(self, page_stats: Optional[Counter], name: str, amount: int = 1) -> None:
+        self.stats[name] += amount
+        if page_stats is not None:
+            page_stats[name] += amount
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+import time
 from collections import Counter
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from playwright.async_api import Error as PlaywrightError
 
+from gpvb.metrics import MetricsRecorder
 from gpvb.models import AdElement
+from gpvb.render.adstub import AdStubber
+from gpvb.render.archive import NetworkArchive
+from gpvb.render.assets import AssetCache
+from gpvb.render.procinfo import find_pid, pid_tree_rss_bytes
 
 
 AD_SELECTORS = [
@@ -19,32 +30,258 @@ AD_SELECTORS = [
 ]
 
 
+class RenderError(RuntimeError):
+    """Raised when a page could not be rendered (navigation error, timeout, ...)."""
+
+    def __init__(self, url: str, reason: str) -> None:
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+class BrowserCrashedError(RenderError):
+    """Raised when the browser serving a render disconnected while the page was in flight."""
+
+
+@dataclass
+class _BrowserSlot:
+    index: int
+    browser: Optional[Browser] = None
+    marker: str = ""
+    root_pid: Optional[int] = None
+    generation: int = 0
+    active: int = 0
+    pages: int = 0
+    retiring: bool = False
+    crashed: bool = False
+    launching: bool = False
+
+
+@dataclass
+class _Lease:
+    slot: _BrowserSlot
+    browser: Browser
+    generation: int
+
+    def crashed(self) -> bool:
+        return self.slot.generation != self.generation or self.slot.crashed or (
+            not self.browser.is_connected()
+        )
+
+
 class BrowserPool:
-    def __init__(self, concurrency: int, user_agent: str) -> None:
+    """Shards renders over ``browsers`` Chromium processes.
+
+    Each render leases the least-loaded browser. A browser is recycled once it has served
+    ``recycle_after_pages`` pages or its process tree exceeds ``recycle_rss_mb``; a browser that
+    disconnects is relaunched and the renders it was serving raise ``BrowserCrashedError`` so the
+    caller can re-queue them. With an ``asset_cache`` every context routes its static
+    subresources through it, so they are downloaded once per run rather than once per page.
+    With an ``archive`` every request is recorded into it, or answered from it when replaying.
+    With ``ad_stubs`` ad-network requests get local placeholder creatives instead.
+    """
+
+    # Reading /proc is cheap but not free, so RSS is sampled every few pages per browser.
+    RSS_CHECK_EVERY_PAGES = 10
+
+    def __init__(
+        self,
+        concurrency: int,
+        user_agent: str,
+        browsers: int = 1,
+        recycle_after_pages: int = 0,
+        recycle_rss_mb: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        asset_cache: Optional[AssetCache] = None,
+        archive: Optional[NetworkArchive] = None,
+        ad_stubs: Optional[AdStubber] = None,
+    ) -> None:
         self._concurrency = concurrency
+        self._metrics = metrics
+        self._asset_cache = asset_cache
+        self._archive = archive
+        self._ad_stubs = ad_stubs
         self._user_agent = user_agent
-        self._browser: Optional[Browser] = None
+        self._recycle_after_pages = recycle_after_pages
+        self._recycle_rss_mb = recycle_rss_mb
         self._playwright = None
         self._semaphore = asyncio.Semaphore(concurrency)
+        self._slots = [_BrowserSlot(index=i) for i in range(max(1, browsers))]
+        self._slots_changed = asyncio.Condition()
+        self.stats: Dict[str, int] = {"launches": 0, "recycles": 0, "crashes": 0}
 
     async def __aenter__(self) -> "BrowserPool":
         self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch()
+        for slot in self._slots:
+            await self._launch(slot)
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        if self._browser:
-            await self._browser.close()
+        for slot in self._slots:
+            await self._close(slot)
         if self._playwright:
             await self._playwright.stop()
 
-    async def new_context(self, viewport: Dict[str, int]) -> BrowserContext:
-        if not self._browser:
+    async def _launch(self, slot: _BrowserSlot) -> None:
+        if not self._playwright:
             raise RuntimeError("Browser not started")
-        return await self._browser.new_context(
+        slot.generation += 1
+        # Chromium ignores unknown switches, which lets us find the process tree in /proc.
+        slot.marker = f"--gpvb-shard={os.getpid()}-{slot.index}-{slot.generation}"
+        slot.browser = await self._playwright.chromium.launch(args=[slot.marker])
+        slot.active = 0
+        slot.pages = 0
+        slot.retiring = False
+        slot.crashed = False
+        slot.root_pid = None
+        if self._recycle_rss_mb:
+            slot.root_pid = await asyncio.to_thread(find_pid, slot.marker)
+        generation = slot.generation
+        slot.browser.on("disconnected", lambda _browser: self._on_disconnected(slot, generation))
+        self.stats["launches"] += 1
+
+    async def _close(self, slot: _BrowserSlot) -> None:
+        browser, slot.browser = slot.browser, None
+        if browser and browser.is_connected():
+            slot.retiring = True
+            try:
+                await browser.close()
+            except PlaywrightError:
+                pass
+
+    def _on_disconnected(self, slot: _BrowserSlot, generation: int) -> None:
+        if slot.generation == generation and not slot.retiring:
+            slot.crashed = True
+            self.stats["crashes"] += 1
+            logging.getLogger("gpvb").warning("Browser shard %s disconnected", slot.index)
+
+    def _needs_relaunch(self, slot: _BrowserSlot) -> bool:
+        if slot.launching:
+            return False
+        return slot.browser is None or slot.crashed or (slot.retiring and slot.active == 0)
+
+    async def _acquire(self, url: str) -> _Lease:
+        while True:
+            async with self._slots_changed:
+                stale = [slot for slot in self._slots if self._needs_relaunch(slot)]
+                for slot in stale:
+                    slot.launching = True
+                if not stale:
+                    candidates = [
+                        slot
+                        for slot in self._slots
+                        if slot.browser and not (slot.retiring or slot.launching or slot.crashed)
+                    ]
+                    if candidates:
+                        slot = min(candidates, key=lambda candidate: candidate.active)
+                        slot.active += 1
+                        return _Lease(slot=slot, browser=slot.browser, generation=slot.generation)
+                    await self._slots_changed.wait()
+                    continue
+            # Relaunching takes a second or more; do it without blocking other leases.
+            await self._relaunch(stale, url)
+
+    async def _relaunch(self, slots: List[_BrowserSlot], url: str) -> None:
+        failure: Optional[Exception] = None
+        for slot in slots:
+            try:
+                await self._close(slot)
+                await self._launch(slot)
+            except PlaywrightError as exc:
+                slot.browser = None
+                failure = exc
+        async with self._slots_changed:
+            for slot in slots:
+                slot.launching = False
+            self._slots_changed.notify_all()
+        if failure is not None:
+            raise BrowserCrashedError(url, f"browser launch failed: {failure}") from failure
+
+    async def _release(self, lease: _Lease) -> None:
+        slot = lease.slot
+        check_rss = False
+        async with self._slots_changed:
+            if slot.generation == lease.generation:
+                slot.active -= 1
+                slot.pages += 1
+                if not slot.retiring and self._recycle_after_pages and (
+                    slot.pages >= self._recycle_after_pages
+                ):
+                    self._retire(slot, f"after {slot.pages} pages")
+                check_rss = bool(
+                    self._recycle_rss_mb
+                    and slot.root_pid
+                    and not slot.retiring
+                    and slot.pages % self.RSS_CHECK_EVERY_PAGES == 0
+                )
+            self._slots_changed.notify_all()
+        if check_rss:
+            rss = await asyncio.to_thread(pid_tree_rss_bytes, slot.root_pid)
+            if rss is not None and rss > self._recycle_rss_mb * 1024 * 1024:
+                async with self._slots_changed:
+                    if slot.generation == lease.generation and not slot.retiring:
+                        self._retire(slot, f"at {rss // (1024 * 1024)} MiB RSS")
+                    self._slots_changed.notify_all()
+
+    def _retire(self, slot: _BrowserSlot, reason: str) -> None:
+        slot.retiring = True
+        self.stats["recycles"] += 1
+        logging.getLogger("gpvb").info("Recycling browser shard %s %s", slot.index, reason)
+
+    def _span(self, stage: str, url: str):
+        if self._metrics is None:
+            return nullcontext()
+        return self._metrics.span(stage, url)
+
+    @asynccontextmanager
+    async def _page(
+        self,
+        url: str,
+        viewport: Dict[str, int],
+        prefix: str,
+        stats: Optional[Counter] = None,
+    ) -> AsyncIterator[Page]:
+        waited = time.perf_counter()
+        async with self._semaphore:
+            lease = await self._acquire(url)
+            if self._metrics is not None:
+                self._metrics.record(f"{prefix}.lease_wait", time.perf_counter() - waited, url)
+            context: Optional[BrowserContext] = None
+            try:
+                with self._span(f"{prefix}.context_setup", url):
+                    context = await self._new_context(lease.browser, viewport, stats)
+                    page = await context.new_page()
+                yield page
+            except PlaywrightError as exc:
+                if lease.crashed():
+                    raise BrowserCrashedError(url, "browser crashed") from exc
+                raise RenderError(url, str(exc).splitlines()[0] if str(exc) else "error") from exc
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except PlaywrightError:
+                        pass
+                await self._release(lease)
+
+    async def _new_context(
+        self, browser: Browser, viewport: Dict[str, int], stats: Optional[Counter] = None
+    ) -> BrowserContext:
+        # Service workers fetch outside context routing, so they are blocked while archiving.
+        options = {"service_workers": "block"} if self._archive is not None else {}
+        context = await browser.new_context(
             viewport=viewport,
             user_agent=self._user_agent,
+            **options,
         )
+        if self._asset_cache is not None:
+            await context.route("**/*", self._asset_cache.handler(stats))
+        # Handlers registered later see requests first: ad stubs, then the archive.
+        if self._archive is not None:
+            await context.route("**/*", self._archive.handler())
+        if self._ad_stubs is not None:
+            await context.route("**/*", self._ad_stubs.handler(stats))
+        return context
 
     async def render_page(
         self,
@@ -53,10 +290,10 @@ class BrowserPool:
         timeout_ms: int = 30000,
         screenshot_path: Optional[str] = None,
     ) -> Tuple[str, int, str, str, Dict[str, int], List[AdElement], Dict[str, Any]]:
-        async with self._semaphore:
-            context = await self.new_context(viewport)
-            page = await context.new_page()
-            requests = Counter()
+        # Requests per host; asset cache and ad stub counts go to ``extras["render_stats"]``.
+        requests: Counter = Counter()
+        stats: Counter = Counter()
+        async with self._page(url, viewport, "browser", stats) as page:
             def _track_request(request) -> None:
                 try:
                     host = urlparse(request.url).netloc
@@ -66,24 +303,27 @@ class BrowserPool:
                     return
 
             page.on("request", _track_request)
-            response = await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
+            with self._span("browser.navigation", url):
+                response = await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
             status = response.status if response else 0
             headers = response.headers if response else {}
             final_url = page.url
-            html = await page.content()
-            text = await page.inner_text("body")
+            with self._span("browser.content", url):
+                html = await page.content()
+                text = await page.inner_text("body")
             if screenshot_path:
-                await page.screenshot(path=screenshot_path, full_page=True)
-            ad_elements, extras = await self._collect_ads(page)
-            await context.close()
+                with self._span("browser.screenshot", url):
+                    await page.screenshot(path=screenshot_path, full_page=True)
+            with self._span("browser.collect_ads", url):
+                ad_elements, extras = await self._collect_ads(page)
             extras["headers"] = headers
+            extras["render_stats"] = dict(stats)
             return final_url, status, html, text, dict(requests), ad_elements, extras
 
     async def collect_mobile_flags(self, url: str, viewport: Dict[str, int]) -> Dict[str, bool]:
-        async with self._semaphore:
-            context = await self.new_context(viewport)
-            page = await context.new_page()
-            await page.goto(url, wait_until="networkidle", timeout=30000)
+        async with self._page(url, viewport, "mobile") as page:
+            with self._span("mobile.navigation", url):
+                await page.goto(url, wait_until="networkidle", timeout=30000)
             flags = await page.evaluate(
                 """
                 () => {
@@ -103,7 +343,6 @@ class BrowserPool:
                   return {\n                    autoplay_audio: autoplayAudio,\n                    sticky_elements: sticky,\n                    popup_on_load: popups,\n                  };\n                }
                 """
             )
-            await context.close()
             return flags
 
     async def _collect_ads(self, page: Page) -> Tuple[List[AdElement], Dict[str, Any]]:
@@ -176,6 +415,28 @@ class BrowserPool:
                 .filter(Boolean)
                 .slice(0, 300);
 
+              const mainScores = new Map();
+              document.querySelectorAll('p, pre, blockquote, li, td, h1, h2, h3, h4, h5, h6')
+                .forEach((el) => {
+                  const parent = el.parentElement;
+                  const length = (el.textContent || '').trim().length;
+                  if (!parent || length < 25 || el.closest('nav, header, footer, aside, form')) {
+                    return;
+                  }
+                  mainScores.set(parent, (mainScores.get(parent) || 0) + length);
+                  if (parent.parentElement) {
+                    const grandparent = parent.parentElement;
+                    mainScores.set(grandparent, (mainScores.get(grandparent) || 0) + length / 2);
+                  }
+                });
+              let mainElement = null;
+              mainScores.forEach((score, el) => {
+                if (!mainElement || score > mainScores.get(mainElement)) {
+                  mainElement = el;
+                }
+              });
+              const mainText = mainElement ? (mainElement.innerText || '') : '';
+
               const labelRegex = /advertisement|sponsored|adchoices|ads by google/i;
               const labelBlocks = textBlocks
                 .filter((block) => labelRegex.test(block.text))
@@ -196,6 +457,7 @@ class BrowserPool:
                 overlays,
                 text_blocks: textBlocks,
                 label_blocks: labelBlocks,
+                main_text: mainText,
               };
             }
             """ % AD_SELECTORS
@@ -207,5 +469,6 @@ class BrowserPool:
             "overlays": data["overlays"],
             "text_blocks": data.get("text_blocks", []),
             "label_blocks": data.get("label_blocks", []),
+            "main_text": data.get("main_text", ""),
         }
         return ads, extras
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Optional, Tuple
+
+from gpvb.metrics import MetricsRecorder, percentile
+from gpvb.render.procinfo import cpu_load_ratio, memory_available_ratio
+
+
+OUTCOMES = ("ok", "error", "timeout", "rate_limited")
+
+WINDOW = 8
+LATENCY_TOLERANCE = 1.5
+ERROR_TOLERANCE = 0.05
+BACKOFF = 0.75
+# Host headroom thresholds: below/above these no slots are added, past the hard ones they shrink.
+MEMORY_LOW = 0.20
+MEMORY_CRITICAL = 0.10
+CPU_BUSY = 0.90
+CPU_OVERLOADED = 1.50
+
+
+@dataclass(frozen=True)
+class Headroom:
+    """Host resources as fractions; None when the platform does not report them."""
+
+    memory_available: Optional[float] = None
+    cpu_load: Optional[float] = None
+
+
+def host_headroom() -> Headroom:
+    return Headroom(memory_available_ratio(), cpu_load_ratio())
+
+
+def outcome_for_status(status: int) -> str:
+    if status == 429:
+        return "rate_limited"
+    if status >= 500:
+        return "error"
+    return "ok"
+
+
+def outcome_for_error(reason: str) -> str:
+    return "timeout" if "timeout" in reason.lower() else "error"
+
+
+class AdaptiveLimiter:
+    """Adjusts how many renders may run at once from their latency, failures and host load.
+
+    Every ``window`` completed renders the limiter compares the window's p95 latency and error
+    rate with the best window since it last stepped down. It adds a slot while both stay flat
+    and the host has memory and CPU headroom, and gives one back when latency climbs, errors rise
+    or the CPU is overloaded. Timeouts, 429 responses and memory pressure shrink the limit
+    straight away by ``BACKOFF``, at most once per window so a burst of failures from one
+    generation of in-flight renders counts once. Each decision is logged as a ``concurrency``
+    metrics event.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: Optional[int] = None,
+        window: int = WINDOW,
+        metrics: Optional[MetricsRecorder] = None,
+        headroom: Callable[[], Headroom] = host_headroom,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum if maximum is not None else initial)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.window = max(2, window)
+        self.active = 0
+        self._metrics = metrics
+        self._headroom = headroom
+        self._samples: Deque[Tuple[float, str]] = deque(maxlen=self.window)
+        self._since_decision = 0
+        self._since_backoff = self.window
+        self._reference: Optional[Tuple[float, float]] = None
+        self._changed = asyncio.Condition()
+        self._report_limit()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        waited = time.perf_counter()
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        if self._metrics is not None:
+            self._metrics.record("render_slot_wait", time.perf_counter() - waited)
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self.active -= 1
+                self._changed.notify_all()
+
+    async def observe(self, seconds: float, outcome: str) -> None:
+        """Record one finished render and rescale if it completes a window or signals overload."""
+        self._samples.append((seconds, outcome))
+        self._since_decision += 1
+        self._since_backoff += 1
+        if outcome in ("timeout", "rate_limited") and self._since_backoff >= self.window:
+            await self._shed(outcome, self._headroom())
+            return
+        if self._since_decision < self.window:
+            return
+        headroom = self._headroom()
+        if headroom.memory_available is not None and headroom.memory_available < MEMORY_CRITICAL:
+            if self._since_backoff >= self.window:
+                await self._shed("memory_pressure", headroom)
+            return
+        await self._decide(headroom)
+
+    def _window_stats(self) -> Tuple[float, float]:
+        latencies = [seconds for seconds, outcome in self._samples if outcome == "ok"]
+        errors = sum(1 for _, outcome in self._samples if outcome != "ok")
+        return percentile(latencies, 95), errors / max(len(self._samples), 1)
+
+    async def _shed(self, reason: str, headroom: Headroom) -> None:
+        p95, error_rate = self._window_stats()
+        limit = max(self.minimum, min(self.limit - 1, int(self.limit * BACKOFF)))
+        # The next window should measure the smaller limit only.
+        self._samples.clear()
+        self._since_backoff = 0
+        await self._set_limit(limit, reason, headroom, p95, error_rate)
+
+    async def _decide(self, headroom: Headroom) -> None:
+        p95, error_rate = self._window_stats()
+        reference = self._reference or (p95, error_rate)
+        latency_up = reference[0] > 0 and p95 > reference[0] * LATENCY_TOLERANCE
+        errors_up = error_rate > reference[1] + ERROR_TOLERANCE
+        cpu = headroom.cpu_load
+        if latency_up or errors_up or (cpu is not None and cpu > CPU_OVERLOADED):
+            reason = "latency" if latency_up else "errors" if errors_up else "cpu"
+            await self._set_limit(self.limit - 1, reason, headroom, p95, error_rate)
+            # Judge the smaller limit on its own numbers rather than the ones that got us here.
+            self._reference = (p95, error_rate)
+            return
+        if (cpu is not None and cpu > CPU_BUSY) or (
+            headroom.memory_available is not None and headroom.memory_available < MEMORY_LOW
+        ):
+            await self._set_limit(self.limit, "no_headroom", headroom, p95, error_rate)
+        else:
+            await self._set_limit(self.limit + 1, "healthy", headroom, p95, error_rate)
+        # Keep the best window seen so latency cannot creep up a little per step unnoticed.
+        self._reference = (min(reference[0], p95), min(reference[1], error_rate))
+
+    async def _set_limit(
+        self,
+        limit: int,
+        reason: str,
+        headroom: Headroom,
+        p95: float,
+        error_rate: float,
+    ) -> None:
+        previous = self.limit
+        limit = min(self.maximum, max(self.minimum, limit))
+        self._since_decision = 0
+        async with self._changed:
+            self.limit = limit
+            self._changed.notify_all()
+        action = "increase" if limit > previous else "decrease" if limit < previous else "hold"
+        if action != "hold":
+            logging.getLogger("gpvb").info(
+                "Render concurrency %s -> %s (%s)", previous, limit, reason
+            )
+        if self._metrics is not None:
+            self._metrics.incr(f"concurrency_{action}")
+            self._metrics.event(
+                "concurrency",
+                action=action,
+                reason=reason,
+                previous=previous,
+                limit=limit,
+                p95_ms=round(p95 * 1000, 1),
+                error_rate=round(error_rate, 3),
+                memory_available=_rounded(headroom.memory_available),
+                cpu_load=_rounded(headroom.cpu_load),
+            )
+        self._report_limit()
+
+    def _report_limit(self) -> None:
+        if self._metrics is not None:
+            self._metrics.set_gauge("render_slots", self.limit)
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
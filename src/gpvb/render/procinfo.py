@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+PROC_ROOT = Path("/proc")
+
+
+@dataclass
+class ProcessSample:
+    pid: int
+    ppid: int
+    rss_bytes: int
+    cpu_seconds: float
+    cmdline: str
+
+
+def proc_available() -> bool:
+    return PROC_ROOT.is_dir() and (PROC_ROOT / "self" / "stat").exists()
+
+
+def snapshot_processes() -> Dict[int, ProcessSample]:
+    """Read pid, parent, RSS and CPU time for every visible process (Linux only)."""
+    if not proc_available():
+        return {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    samples: Dict[int, ProcessSample] = {}
+    for entry in PROC_ROOT.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            cmdline = (entry / "cmdline").read_bytes().replace(b"\0", b" ").decode(errors="ignore")
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses, so split after the last ")".
+        fields = stat[stat.rfind(")") + 2 :].split()
+        if len(fields) < 22:
+            continue
+        samples[int(entry.name)] = ProcessSample(
+            pid=int(entry.name),
+            ppid=int(fields[1]),
+            rss_bytes=int(fields[21]) * page_size,
+            cpu_seconds=(int(fields[11]) + int(fields[12])) / ticks,
+            cmdline=cmdline,
+        )
+    return samples
+
+
+def descendants(root_pid: int, samples: Dict[int, ProcessSample]) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for sample in samples.values():
+        children.setdefault(sample.ppid, []).append(sample.pid)
+    tree: List[int] = []
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        if pid not in samples:
+            continue
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def find_pids(marker: str, samples: Dict[int, ProcessSample]) -> List[int]:
+    return [pid for pid, sample in samples.items() if marker in sample.cmdline]
+
+
+def find_pid(marker: str) -> Optional[int]:
+    """Return the oldest process whose command line carries ``marker`` (one full /proc scan)."""
+    pids = find_pids(marker, snapshot_processes())
+    return min(pids) if pids else None
+
+
+def _child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    try:
+        tasks = list((PROC_ROOT / str(pid) / "task").iterdir())
+    except OSError:
+        return children
+    for task in tasks:
+        try:
+            children.extend(int(child) for child in (task / "children").read_text().split())
+        except OSError:
+            continue
+    return children
+
+
+def pid_tree_rss_bytes(root_pid: int) -> Optional[int]:
+    """Sum RSS of ``root_pid`` and its descendants, reading only that process tree."""
+    if not proc_available():
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    found = False
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            resident = int((PROC_ROOT / str(pid) / "statm").read_text().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        found = True
+        total += resident * page_size
+        stack.extend(_child_pids(pid))
+    return total if found else None
+
+
+def memory_available_ratio() -> Optional[float]:
+    """``MemAvailable / MemTotal`` from /proc/meminfo, or None where it cannot be read."""
+    try:
+        lines = (PROC_ROOT / "meminfo").read_text().splitlines()
+    except OSError:
+        return None
+    values: Dict[str, int] = {}
+    for line in lines:
+        name, _, rest = line.partition(":")
+        fields = rest.split()
+        if fields and fields[0].isdigit():
+            values[name] = int(fields[0])
+    if not values.get("MemTotal") or "MemAvailable" not in values:
+        return None
+    return values["MemAvailable"] / values["MemTotal"]
+
+
+def cpu_load_ratio() -> Optional[float]:
+    """One-minute load average per CPU, or None where the platform has no load average."""
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+    return load / (os.cpu_count() or 1)
+
+
+def total_rss_bytes(pids: Iterable[int], samples: Dict[int, ProcessSample]) -> int:
+    return sum(samples[pid].rss_bytes for pid in pids if pid in samples)
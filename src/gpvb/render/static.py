@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from gpvb.models import AdElement
+
+
+AD_MARKERS = ("adsbygoogle", "data-ad-client", "googlesyndication")
+
+SHELL_PATTERN = re.compile(
+    r"<div[^>]+id=['\"](?:root|app|__next|__nuxt|svelte)['\"][^>]*>\s*</div>"
+    r"|\sng-app\b|data-reactroot|enable javascript",
+    re.IGNORECASE,
+)
+
+SUSPICIOUS_SCRIPT_PATTERNS = [
+    re.compile(r"location\.reload", re.IGNORECASE),
+    re.compile(r"set(?:interval|timeout)\([^)]*(?:reload|adsbygoogle|googlesyndication)", re.I),
+    re.compile(r"window\.location(?:\.href)?\s*=", re.IGNORECASE),
+    re.compile(r"\beval\(\s*(?:atob|unescape)\(", re.IGNORECASE),
+    re.compile(r"document\.write\(", re.IGNORECASE),
+]
+
+_NON_TEXT = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+_NOINDEX_META = re.compile(
+    r"<meta[^>]+name=['\"]?robots['\"]?[^>]+content=['\"][^'\"]*noindex", re.IGNORECASE
+)
+
+SHELL_MAX_WORDS = 80
+
+
+@dataclass
+class StaticFetch:
+    url: str
+    final_url: str
+    status: int
+    html: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    escalation_reason: Optional[str] = None
+
+    def as_rendered(
+        self,
+    ) -> Tuple[str, int, str, str, Dict[str, int], List[AdElement], Dict[str, Any]]:
+        """Shape the fetch like ``BrowserPool.render_page`` output; there is no layout data."""
+        extras = {
+            "has_google_ad_client": False,
+            "has_noindex_meta": bool(_NOINDEX_META.search(self.html)),
+            "overlays": [],
+            "text_blocks": [],
+            "label_blocks": [],
+            "headers": self.headers,
+        }
+        return self.final_url, self.status, self.html, "", {}, [], extras
+
+
+def rough_word_count(html: str) -> int:
+    return len(_TAG.sub(" ", _NON_TEXT.sub(" ", html)).split())
+
+
+def escalation_reason(html: str) -> Optional[str]:
+    """Why a statically fetched page still needs a browser render, or None if it does not."""
+    if any(marker in html for marker in AD_MARKERS):
+        return "ad_markers"
+    if SHELL_PATTERN.search(html) and rough_word_count(html) < SHELL_MAX_WORDS:
+        return "client_rendered"
+    if "<script" in html.lower() and rough_word_count(html) < SHELL_MAX_WORDS // 4:
+        return "client_rendered"
+    if any(pattern.search(html) for pattern in SUSPICIOUS_SCRIPT_PATTERNS):
+        return "suspicious_script"
+    return None
+
+
+async def fetch_static(client: httpx.AsyncClient, url: str) -> StaticFetch:
+    try:
+        response = await client.get(url, follow_redirects=True)
+    except httpx.HTTPError:
+        return StaticFetch(url, url, 0, "", escalation_reason="fetch_error")
+    html = response.text
+    return StaticFetch(
+        url=url,
+        final_url=str(response.url),
+        status=response.status_code,
+        html=html,
+        headers={key.lower(): value for key, value in response.headers.items()},
+        escalation_reason=escalation_reason(html),
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from gpvb.crawl.patterns import PatternSampler
+from gpvb.models import Finding, PageResult, TemplateFinding
+
+
+_SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+def finding_signature(finding: Finding) -> Tuple[str, str]:
+    return finding.detector, json.dumps(finding.evidence, sort_keys=True, default=str)
+
+
+def collapse_template_findings(pages: List[PageResult], min_pages: int) -> List[TemplateFinding]:
+    """Replace findings repeated on ``min_pages`` or more pages with template-level findings.
+
+    Findings are grouped by detector and evidence. Each group that spans enough pages is
+    removed from those pages and returned once, with every affected URL and their URL patterns
+    (most common first), so page cards keep only what is specific to the page and
+    ``findings.json`` still says which pages each finding was on.
+    """
+    if min_pages < 2:
+        return []
+    groups: Dict[Tuple[str, str], List[PageResult]] = {}
+    first: Dict[Tuple[str, str], Finding] = {}
+    signatures: List[List[Tuple[str, str]]] = []
+    for page in pages:
+        page_signatures = [finding_signature(finding) for finding in page.findings]
+        signatures.append(page_signatures)
+        for finding, signature in zip(page.findings, page_signatures):
+            affected = groups.setdefault(signature, [])
+            if not affected or affected[-1] is not page:
+                affected.append(page)
+            first.setdefault(signature, finding)
+    collapsed = {signature for signature, affected in groups.items() if len(affected) >= min_pages}
+    if not collapsed:
+        return []
+    for page, page_signatures in zip(pages, signatures):
+        if any(signature in collapsed for signature in page_signatures):
+            page.findings = [
+                finding
+                for finding, signature in zip(page.findings, page_signatures)
+                if signature not in collapsed
+            ]
+    sampler = PatternSampler(per_pattern=0)
+    results = []
+    for signature in collapsed:
+        affected = groups[signature]
+        urls = sorted(page.url for page in affected)
+        patterns = Counter(page.url_pattern or sampler.pattern(page.url) for page in affected)
+        results.append(
+            TemplateFinding(
+                finding=first[signature],
+                pages=len(urls),
+                urls=urls,
+                patterns=[pattern for pattern, _ in patterns.most_common()],
+            )
+        )
+    results.sort(
+        key=lambda item: (
+            _SEVERITY_ORDER.get(item.finding.severity.value, 99),
+            -item.pages,
+            item.finding.detector,
+        )
+    )
+    return results
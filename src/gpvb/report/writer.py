@@ -2,9 +2,20 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
 
-from gpvb.models import FindingsReport, PageResult
+from gpvb.models import (
+    DetectorInfo,
+    Finding,
+    FindingsReport,
+    PageResult,
+    PatternEstimate,
+    TemplateFinding,
+)
+
+# Template-level findings list this many of their URLs, and their patterns only when few.
+TEMPLATE_SAMPLE_URLS = 10
+TEMPLATE_MAX_PATTERNS = 5
 
 
 def write_json(report: FindingsReport, out_dir: Path) -> None:
@@ -16,8 +27,21 @@ def write_json(report: FindingsReport, out_dir: Path) -> None:
 def write_html(report: FindingsReport, out_dir: Path) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
     duplicates = [cluster.__dict__ for cluster in report.duplicates]
+    aliases = [alias.__dict__ for alias in report.aliases]
     html = _render_html(
-        report.pages, report.summary, report.program_policy_summary, duplicates, report.account_risk
+        report.pages,
+        report.summary,
+        report.program_policy_summary,
+        duplicates,
+        report.account_risk,
+        report.metrics,
+        aliases,
+        report.url_patterns,
+        report.coverage,
+        report.catalog,
+        report.early_termination,
+        report.template_findings,
+        report.ad_stubs,
     )
     (out_dir / "report.html").write_text(html, encoding="utf-8")
 
@@ -28,11 +52,24 @@ def _render_html(
     program_policy_summary: Dict[str, Dict[str, int]],
     duplicates: List[Dict],
     account_risk: Dict[str, int | str],
+    metrics: Dict[str, Any] | None = None,
+    aliases: List[Dict] | None = None,
+    url_patterns: List[PatternEstimate] | None = None,
+    coverage: Dict[str, Any] | None = None,
+    catalog: Dict[str, Dict[str, DetectorInfo]] | None = None,
+    early_termination: Dict[str, Any] | None = None,
+    template_findings: List[TemplateFinding] | None = None,
+    ad_stubs: Dict[str, Any] | None = None,
 ) -> str:
+    catalog = catalog or {}
+    template_section = _render_template_findings(template_findings or [], catalog)
+    program_policy_template_section = _render_template_findings(
+        template_findings or [], catalog, category_filter="program_policy"
+    )
     sorted_pages = _sort_pages_by_severity(pages)
-    page_cards = "\n".join(_render_page_card(page) for page in sorted_pages)
+    page_cards = "\n".join(_render_page_card(page, catalog) for page in sorted_pages)
     program_policy_cards = "\n".join(
-        _render_page_card(page, category_filter="program_policy") for page in sorted_pages
+        _render_page_card(page, catalog, category_filter="program_policy") for page in sorted_pages
     )
     summary_rows = "\n".join(
         f"<tr><td>{detector}</td><td>{_format_counts(counts)}</td></tr>"
@@ -45,6 +82,17 @@ def _render_html(
     dup_sections = "\n".join(
         f"<li>{', '.join(cluster['urls'])} (sim {cluster['similarity']})</li>" for cluster in duplicates
     )
+    alias_rows = "\n".join(
+        f"<tr><td>{alias['url']}</td><td>{alias['target']}</td><td>{alias['reason']}</td></tr>"
+        for alias in aliases or []
+    )
+    patterns = _render_patterns(url_patterns or [])
+    coverage_note = (
+        _render_coverage(coverage or {})
+        + _render_early_termination(early_termination or {})
+        + _render_ad_stubs(ad_stubs or {})
+    )
+    performance = _render_performance(metrics or {})
     risk_score = int(account_risk.get("score", 0)) if account_risk else 0
     risk_label = account_risk.get("label", "Unknown") if account_risk else "Unknown"
     template = """
@@ -92,6 +140,7 @@ def _render_html(
       <strong>Likely Account Risk:</strong> {risk_score} ({risk_label})
       <div class="risk-bar"><div class="risk-fill" style="width: {risk_score}%"></div></div>
     </div>
+    {coverage_note}
     <h2>Summary</h2>
     <table>
       <tr><th>Detector</th><th>Counts</th></tr>
@@ -101,6 +150,15 @@ def _render_html(
     <ul>
       {dup_sections}
     </ul>
+    {patterns}
+    <h2>URL Aliases</h2>
+    <p>Crawled URLs that redirect to, or declare as canonical, a page audited under another URL.</p>
+    <table>
+      <tr><th>URL</th><th>Audited as</th><th>Reason</th></tr>
+      {alias_rows}
+    </table>
+    {performance}
+    {template_section}
     <h2>Pages</h2>
     {page_cards}
   </div>
@@ -110,6 +168,7 @@ def _render_html(
       <tr><th>Detector</th><th>Counts</th></tr>
       {program_policy_rows}
     </table>
+    {program_policy_template_section}
     <h2>Program Policy Findings</h2>
     {program_policy_cards}
   </div>
@@ -149,46 +208,244 @@ def _render_html(
         summary_rows=summary_rows,
         program_policy_rows=program_policy_rows,
         dup_sections=dup_sections,
+        alias_rows=alias_rows,
+        patterns=patterns,
+        template_section=template_section,
+        program_policy_template_section=program_policy_template_section,
         page_cards=page_cards,
         program_policy_cards=program_policy_cards,
         risk_score=risk_score,
         risk_label=risk_label,
+        performance=performance,
+        coverage_note=coverage_note,
     )
 
 
-def _render_page_card(page: PageResult, category_filter: str | None = None) -> str:
+def _render_coverage(coverage: Dict[str, Any]) -> str:
+    if not coverage:
+        return ""
+    if coverage.get("complete"):
+        detail = "every discovered URL was audited"
+    else:
+        detail = (
+            f"{coverage.get('unvisited', 0)} discovered URLs were not visited and "
+            f"{coverage.get('cut_off', 0)} were cut off mid-audit; the most important URLs "
+            "(sitemap priority, freshness, inbound links, likely ads) were audited first"
+        )
+    return (
+        f"<p><strong>Time budget:</strong> {coverage.get('time_budget_s')}s, "
+        f"{coverage.get('pages', 0)} pages audited; {detail}.</p>"
+    )
+
+
+def _render_early_termination(info: Dict[str, Any]) -> str:
+    if not info:
+        return ""
+    critical = ", ".join(info.get("critical_detectors", [])) or "none"
+    return (
+        f"<p><strong>Stopped early:</strong> <code>{info.get('reason')}</code> was met after "
+        f"{info.get('pages', 0)} pages (risk score {info.get('score', 0)}, critical detectors: "
+        f"{critical}). {info.get('cancelled', 0)} pages in flight were cancelled and "
+        f"{info.get('dropped', 0)} queued URLs were not audited, so this report is partial.</p>"
+    )
+
+
+def _render_ad_stubs(info: Dict[str, Any]) -> str:
+    if not info:
+        return ""
+    return (
+        "<p><strong>Ads stubbed:</strong> ad-network requests were answered with placeholder "
+        f"creatives sized from the page's ad slots ({info.get('requests', 0)} requests). Ad "
+        "placement and layout findings reflect slot geometry; ad content was not loaded.</p>"
+    )
+
+
+def _render_patterns(estimates: List[PatternEstimate]) -> str:
+    if not estimates:
+        return ""
+    rows = []
+    for estimate in estimates:
+        findings = "<br>".join(
+            f"{detector}: {rate.pages}/{estimate.sampled} sampled, ~{rate.estimated_pages} pages "
+            f"({rate.estimated_low}&ndash;{rate.estimated_high}, 95% CI)"
+            for detector, rate in estimate.findings.items()
+        )
+        cohesion = "n/a" if estimate.cohesion is None else f"{estimate.cohesion:.2f}"
+        rows.append(
+            f"<tr><td>{estimate.pattern}</td><td>{estimate.discovered}</td>"
+            f"<td>{estimate.sampled}</td><td>{cohesion}</td><td>{findings or 'none'}</td></tr>"
+        )
+    return f"""
+    <h2>URL Patterns</h2>
+    <p>Pages were sampled per URL pattern; finding counts are extrapolated from the sample with
+      Wilson 95% intervals. Low cohesion means the sampled pages do not share one template.</p>
+    <table>
+      <tr><th>Pattern</th><th>Discovered</th><th>Sampled</th><th>Cohesion</th><th>Findings</th></tr>
+      {"".join(rows)}
+    </table>
+"""
+
+
+def _render_performance(metrics: Dict[str, Any]) -> str:
+    if not metrics:
+        return ""
+    rows = []
+    for family in ("stages", "detectors"):
+        for name, stats in metrics.get(family, {}).items():
+            if "skipped" in stats:
+                name = f"{name} ({stats.get('cost', 'n/a')}, {stats['skipped']} gated)"
+            rows.append(
+                f"<tr><td>{family[:-1]}</td><td>{name}</td><td>{stats['count']}</td>"
+                f"<td>{stats['p50_ms']}</td><td>{stats['p95_ms']}</td>"
+                f"<td>{stats['total_s']}</td></tr>"
+            )
+    lag = metrics.get("event_loop_lag", {})
+    queue_depth = metrics.get("gauges", {}).get("queue_depth", {})
+    slowest = "\n".join(
+        f"<li>{entry['url']} ({entry['total_ms']} ms): "
+        + ", ".join(f"{stage} {ms} ms" for stage, ms in entry["stages_ms"].items())
+        + "</li>"
+        for entry in metrics.get("slowest_urls", [])
+    )
+    slowest_section = f"<h3>Slowest URLs</h3><ul>{slowest}</ul>" if slowest else ""
+    counters = metrics.get("counters", {})
+    tiers = ""
+    if counters.get("pages_static") or counters.get("pages_escalated"):
+        static = int(counters.get("pages_static", 0))
+        escalated = int(counters.get("pages_escalated", 0))
+        tiers = (
+            f"<p>Tiered rendering: {static} static, {escalated} escalated to Chromium "
+            f"({escalated / (static + escalated):.0%} escalation rate)</p>"
+        )
+    fragment_hits = sum(
+        value
+        for name, value in counters.items()
+        if name.startswith("fragment_") and name.endswith("_hits")
+    )
+    fragment_misses = sum(
+        value
+        for name, value in counters.items()
+        if name.startswith("fragment_") and name.endswith("_misses")
+    )
+    fragments = ""
+    if fragment_hits + fragment_misses:
+        fragments = (
+            f"<p>Fragment cache: {fragment_hits / (fragment_hits + fragment_misses):.0%} of "
+            f"{int(fragment_hits + fragment_misses)} shared scripts and template blocks "
+            "reused from earlier pages</p>"
+        )
+    asset_hits = counters.get("asset_cache_hits", 0)
+    asset_misses = counters.get("asset_cache_misses", 0)
+    assets = ""
+    if asset_hits + asset_misses:
+        assets = (
+            f"<p>Asset cache: {asset_hits / (asset_hits + asset_misses):.0%} of "
+            f"{int(asset_hits + asset_misses)} static subresources served from the shared cache, "
+            f"{counters.get('asset_cache_bytes_saved', 0) / 1048576:.1f} MB not downloaded "
+            "again</p>"
+        )
+    return f"""
+    <h2>Performance</h2>
+    <p>Wall time: {metrics.get('wall_s', 0)}s, worker utilization:
+      {metrics.get('worker_utilization', 0):.0%}, max queue depth: {queue_depth.get('max', 0)},
+      event-loop lag p95: {lag.get('p95_ms', 0)} ms</p>
+    {tiers}
+    {fragments}
+    {assets}
+    <table>
+      <tr><th>Kind</th><th>Name</th><th>Count</th><th>p50 ms</th><th>p95 ms</th>
+        <th>Total s</th></tr>
+      {"".join(rows)}
+    </table>
+    {slowest_section}
+"""
+
+
+def _render_template_findings(
+    template_findings: List[TemplateFinding],
+    catalog: Dict[str, Dict[str, DetectorInfo]],
+    category_filter: str | None = None,
+) -> str:
+    items = []
+    for template in template_findings:
+        info = _info(catalog, template.finding)
+        if category_filter and info.category.value != category_filter:
+            continue
+        scope = f"{template.pages} pages"
+        if template.patterns and len(template.patterns) <= TEMPLATE_MAX_PATTERNS:
+            scope += f" matching {', '.join(template.patterns)}"
+        sample = template.urls[:TEMPLATE_SAMPLE_URLS]
+        more = template.pages - len(sample)
+        urls = ", ".join(sample) + (f" and {more} more" if more > 0 else "")
+        items.append(
+            _render_finding(template.finding, info, f"<div><em>On {scope}:</em> {urls}</div>")
+        )
+    if not items:
+        return ""
+    return f"""
+    <h2>Template-level Findings</h2>
+    <p>Findings with the same detector and evidence on many pages, usually from shared markup
+      such as a header script or an ad slot in the layout. They are listed once here instead of
+      on every page card.</p>
+    <ul class="findings">{"".join(items)}</ul>
+"""
+
+
+def _render_page_card(
+    page: PageResult,
+    catalog: Dict[str, Dict[str, DetectorInfo]],
+    category_filter: str | None = None,
+) -> str:
     findings_list = page.findings
     if category_filter:
-        findings_list = [finding for finding in page.findings if finding.category.value == category_filter]
+        findings_list = [
+            finding
+            for finding in page.findings
+            if _info(catalog, finding).category.value == category_filter
+        ]
     findings_list = _sort_findings(findings_list)
     if not findings_list:
         return ""
-    findings = "\n".join(_render_finding(finding) for finding in findings_list)
+    findings = "\n".join(
+        _render_finding(finding, _info(catalog, finding)) for finding in findings_list
+    )
     screenshot_html = (
         f"<img class='screenshot' src='{page.screenshot_path}' />" if page.screenshot_path else ""
     )
+    duplicate_html = (
+        f"<p>Identical to {page.duplicate_of}; findings reused</p>" if page.duplicate_of else ""
+    )
     detectors = ",".join({finding.detector for finding in findings_list}) or "none"
     severities = ",".join({finding.severity.value for finding in findings_list}) or "none"
     return f"""
   <div class="card" data-detectors="{detectors}" data-severities="{severities}">
     <h3>{page.url}</h3>
-    <p>Status: {page.status} Final URL: {page.final_url}</p>
+    <p>Status: {page.status} Final URL: {page.final_url} Tier: {page.render_tier}</p>
+    {duplicate_html}
     {screenshot_html}
     <ul class="findings">{findings}</ul>
   </div>
 """
 
 
-def _render_finding(finding) -> str:
-    remediation = "".join(f"<li>{item}</li>" for item in finding.remediation) or "<li>None</li>"
-    policy_links = "".join(f"<li>{link}</li>" for link in finding.policy_links) or "<li>None</li>"
+def _info(catalog: Dict[str, Dict[str, DetectorInfo]], finding: Finding) -> DetectorInfo:
+    """The catalog entry behind ``finding``; ids missing from the catalog show just their id."""
+    info = catalog.get(finding.detector, {}).get(finding.version)
+    if info is None:
+        return DetectorInfo(finding.detector, finding.detector, finding.severity)
+    return info
+
+
+def _render_finding(finding: Finding, info: DetectorInfo, detail: str = "") -> str:
+    remediation = "".join(f"<li>{item}</li>" for item in info.remediation) or "<li>None</li>"
+    policy_links = "".join(f"<li>{link}</li>" for link in info.policy_links) or "<li>None</li>"
     return (
         "<li>"
-        f"<strong>{finding.detector}</strong> ({finding.severity.value}): {finding.message}"
+        f"<strong>{finding.detector}</strong> ({finding.severity.value}): {info.message}"
         f"<div><em>Confidence:</em> {finding.confidence:.2f}</div>"
         f"<div><em>Remediation:</em><ul>{remediation}</ul></div>"
         f"<div><em>Policy references:</em><ul>{policy_links}</ul></div>"
-        "</li>"
+        f"{detail}</li>"
     )
 
 
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from gpvb.models import Finding, PageResult
+
+
+SNAPSHOT_FILE = "snapshots.sqlite"
+
+
+class PageSnapshot(BaseModel):
+    """Everything detectors saw for one page, plus the findings each detector produced."""
+
+    page: PageResult
+    extras: Dict[str, Any] = Field(default_factory=dict)
+    mobile_flags: Dict[str, bool] = Field(default_factory=dict)
+    findings: Dict[str, List[Finding]] = Field(default_factory=dict)
+
+    @classmethod
+    def capture(
+        cls,
+        page: PageResult,
+        extras: Optional[Dict[str, Any]] = None,
+        mobile_flags: Optional[Dict[str, bool]] = None,
+        findings: Optional[Dict[str, List[Finding]]] = None,
+    ) -> "PageSnapshot":
+        return cls(
+            page=page.model_copy(update={"findings": []}),
+            extras=extras or {},
+            mobile_flags=mobile_flags or {},
+            findings=findings or {},
+        )
+
+    def to_page(self, detector_ids: Iterable[str]) -> PageResult:
+        """Rebuild the page with findings from ``detector_ids``, in that order."""
+        page = self.page.model_copy(update={"findings": []})
+        for detector_id in detector_ids:
+            page.findings.extend(self.findings.get(detector_id, []))
+        return page
+
+
+class RunInfo(BaseModel):
+    id: str
+    site: str
+    created: str
+    config: Dict[str, Any] = Field(default_factory=dict)
+    detector_versions: Dict[str, str] = Field(default_factory=dict)
+    site_facts: Dict[str, Any] = Field(default_factory=dict)
+
+
+class SnapshotStore:
+    """Per-run render snapshots in SQLite, so detectors can be re-run without a browser."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    id TEXT PRIMARY KEY,
+                    created TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    run_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (run_id, url)
+                )
+                """
+            )
+
+    def save_run(self, run: RunInfo) -> None:
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (id, created, data) VALUES (?, ?, ?)",
+                (run.id, run.created, run.model_dump_json()),
+            )
+
+    def save_snapshots(self, run_id: str, snapshots: Iterable[PageSnapshot]) -> None:
+        with sqlite3.connect(self.path) as conn:
+            offset = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM snapshots WHERE run_id = ?", (run_id,)
+            ).fetchone()[0]
+            for position, snapshot in enumerate(snapshots, start=offset):
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (run_id, position, url, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (run_id, position, snapshot.page.url, snapshot.model_dump_json()),
+                )
+
+    def update_snapshots(self, run_id: str, snapshots: Iterable[PageSnapshot]) -> None:
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany(
+                "UPDATE snapshots SET data = ? WHERE run_id = ? AND url = ?",
+                [(snapshot.model_dump_json(), run_id, snapshot.page.url) for snapshot in snapshots],
+            )
+
+    def load_run(self, run_id: str = "latest") -> RunInfo:
+        with sqlite3.connect(self.path) as conn:
+            if run_id == "latest":
+                row = conn.execute(
+                    "SELECT data FROM runs ORDER BY created DESC LIMIT 1"
+                ).fetchone()
+            else:
+                row = conn.execute("SELECT data FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if not row:
+            raise KeyError(f"No snapshot run {run_id!r} in {self.path}")
+        return RunInfo.model_validate_json(row[0])
+
+    def list_runs(self) -> List[RunInfo]:
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute("SELECT data FROM runs ORDER BY created").fetchall()
+        return [RunInfo.model_validate_json(row[0]) for row in rows]
+
+    def iter_snapshots(self, run_id: str) -> Iterator[str]:
+        """Yield raw snapshot JSON in crawl order; callers decide where to parse it."""
+        with sqlite3.connect(self.path) as conn:
+            for (data,) in conn.execute(
+                "SELECT data FROM snapshots WHERE run_id = ? ORDER BY position", (run_id,)
+            ):
+                yield data
+
+
+def new_run(site: str, config: Dict[str, Any]) -> RunInfo:
+    now = datetime.now(timezone.utc)
+    run_id = f"{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    return RunInfo(id=run_id, site=site, created=now.isoformat(), config=config)
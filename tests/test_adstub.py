@@ -0,0 +1,141 @@
+from collections import Counter
+
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.models import CrawlConfig
+from gpvb.render.adstub import STUB_RUNTIME, AdStubber, is_ad_request, stub_response
+from gpvb.render.assets import AssetCache
+from gpvb.render.browser import BrowserPool
+from gpvb.report.writer import _render_ad_stubs
+
+
+def test_ad_network_hosts_and_subdomains_are_recognised():
+    assert is_ad_request("https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js")
+    assert is_ad_request("https://securepubads.g.doubleclick.net/tag/js/gpt.js")
+    assert is_ad_request("https://adservice.google.com/adsid/integrator.js")
+    assert not is_ad_request("https://www.google.com/search")
+    assert not is_ad_request("https://notdoubleclick.net/a.js")
+
+
+def test_loaders_get_the_runtime_and_other_requests_placeholders():
+    loader = "https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js"
+    assert stub_response(loader, "script")["body"] == STUB_RUNTIME
+    assert stub_response("https://c.amazon-adsystem.com/aax2/apstag.js", "script")["body"] == ""
+    creative = stub_response("https://googleads.g.doubleclick.net/pagead/ads?x=1", "document")
+    assert creative["content_type"] == "text/html" and "Ad" in creative["body"]
+    assert stub_response("https://ib.adnxs.com/ut/v3/prebid", "fetch")["status"] == 204
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type) -> None:
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="script") -> None:
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def fulfill(self, **kwargs):
+        self.outcome = kwargs["status"]
+
+
+@pytest.mark.asyncio
+async def test_only_ad_requests_are_stubbed():
+    stubber = AdStubber()
+    page_stats = Counter()
+    routes = [
+        FakeRoute("https://example.test/app.js"),
+        FakeRoute("https://tpc.googlesyndication.com/simgad/1", "image"),
+    ]
+    for route in routes:
+        await stubber.handler(page_stats)(route)
+    assert [route.outcome for route in routes] == ["fallback", 200]
+    assert page_stats == stubber.stats == {"ad_requests_stubbed": 1}
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.handlers = []
+
+    async def route(self, pattern, handler):
+        self.handlers.append(handler.__qualname__.split(".")[0])
+
+
+class FakeBrowser:
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+
+@pytest.mark.asyncio
+async def test_ad_stubs_see_requests_before_the_other_handlers():
+    pool = BrowserPool(1, "GPVB/1.0", asset_cache=AssetCache(1024), ad_stubs=AdStubber())
+    context = await pool._new_context(FakeBrowser(), {})
+    # Playwright runs the most recently registered handler first.
+    assert context.handlers == ["AssetCache", "AdStubber"]
+    assert _render_ad_stubs({}) == ""
+    assert "12 requests" in _render_ad_stubs({"requests": 12})
+
+
+class StubbingPool:
+    def __init__(self, concurrency, user_agent, ad_stubs=None, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.ad_stubs = ad_stubs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        stats = Counter()
+        loader = FakeRoute("https://securepubads.g.doubleclick.net/tag/js/gpt.js")
+        await self.ad_stubs.handler(stats)(loader)
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        extras["render_stats"] = dict(stats)
+        html = "<html><body><p>Rendered</p></body></html>"
+        network = {"example.test": 1, "securepubads.g.doubleclick.net": 1}
+        return url, 200, html, "", network, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_report_is_marked_when_ads_are_stubbed(tmp_path, monkeypatch):
+    sitemap = "<urlset><url><loc>https://example.test/a</loc></url></urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(404)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    monkeypatch.setattr(audit, "BrowserPool", StubbingPool)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        pre_resolve=False,
+        concurrency=1,
+        stub_ads=True,
+    )
+    report = await audit.audit_site(config)
+    assert report.ad_stubs == {"requests": 1}
+    assert report.pages[0].render_stats == {"ad_requests_stubbed": 1}
+    assert "ad_requests_stubbed" not in report.pages[0].network_summary
+    assert report.metrics["counters"]["ad_requests_stubbed"] == 1
+    assert "Ads stubbed:" in (tmp_path / "report.html").read_text()
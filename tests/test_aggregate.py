@@ -0,0 +1,52 @@
+from gpvb.detect.program_policy.invalid_traffic_signals import INVALID_TRAFFIC_RELOAD_PATTERNS
+from gpvb.detect.program_policy.malware_risk import MALWARE_FORCED_DOWNLOAD
+from gpvb.detect.registry import default_catalog
+from gpvb.models import PageResult
+from gpvb.report.aggregate import collapse_template_findings
+from gpvb.report.writer import _render_template_findings
+
+
+def _page(url, *findings):
+    page = PageResult(url=url, final_url=url, status=200, html="", text="")
+    page.findings.extend(findings)
+    return page
+
+
+def test_identical_findings_collapse_into_one_template_finding():
+    evidence = {"meta_refresh": False, "js_reload": True}
+    pages = [
+        _page(f"https://x.test/post/{index}", INVALID_TRAFFIC_RELOAD_PATTERNS.finding(evidence))
+        for index in range(12)
+    ]
+    pages[0].findings.append(MALWARE_FORCED_DOWNLOAD.finding({"download_links": ["a.exe"]}))
+    pages[1].findings.append(MALWARE_FORCED_DOWNLOAD.finding({"download_links": ["b.exe"]}))
+
+    templates = collapse_template_findings(pages, min_pages=3)
+
+    assert len(templates) == 1
+    template = templates[0]
+    assert template.finding.detector == "invalid_traffic_reload_patterns"
+    assert template.pages == 12 and len(template.urls) == 12
+    assert template.patterns == ["/post/{id}"]
+    assert [finding.detector for finding in pages[0].findings] == ["malware_forced_download"]
+    assert pages[5].findings == []
+    html = _render_template_findings(templates, default_catalog().for_findings([template.finding]))
+    assert "On 12 pages matching /post/{id}" in html and "and 2 more" in html
+
+
+def test_findings_below_the_threshold_stay_on_their_pages():
+    finding = INVALID_TRAFFIC_RELOAD_PATTERNS.finding({"meta_refresh": True, "js_reload": False})
+    pages = [_page("https://x.test/a", finding), _page("https://x.test/b", finding)]
+    assert collapse_template_findings(pages, min_pages=3) == []
+    assert collapse_template_findings(pages, min_pages=0) == []
+    assert all(page.findings for page in pages)
+
+
+def test_report_keeps_every_affected_url_and_pattern_and_the_html_samples_them():
+    finding = INVALID_TRAFFIC_RELOAD_PATTERNS.finding({"meta_refresh": True, "js_reload": False})
+    pages = [_page(f"https://x.test/section{index}/page", finding) for index in range(7)]
+    template = collapse_template_findings(pages, min_pages=3)[0]
+    assert template.urls == sorted(page.url for page in pages)
+    assert len(template.patterns) == 7
+    html = _render_template_findings([template], default_catalog().for_findings([finding]))
+    assert "On 7 pages:" in html and "matching" not in html
@@ -0,0 +1,233 @@
+import json
+
+import httpx
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from gpvb import audit
+from gpvb.models import CrawlConfig
+from gpvb.render import archive as archive_module
+from gpvb.render.archive import HAR_FILE, NetworkArchive, archive_key, header_dict
+
+
+def test_archive_key_separates_ranges_and_bodies():
+    assert archive_key("get", "https://x.test/a#top") == "GET https://x.test/a"
+    assert archive_key("GET", "https://x.test/a", "bytes=0-99") != archive_key(
+        "GET", "https://x.test/a"
+    )
+    assert archive_key("POST", "https://x.test/a", body=b"1") != archive_key(
+        "POST", "https://x.test/a", body=b"2"
+    )
+
+
+def test_header_dict_keeps_one_cookie_per_line():
+    headers = [("Set-Cookie", "a=1"), ("set-cookie", "b=2"), ("Vary", "A"), ("vary", "B")]
+    assert header_dict(headers) == {"set-cookie": "a=1\nb=2", "vary": "A, B"}
+
+
+def _site(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/old":
+        return httpx.Response(301, headers={"Location": "/new"})
+    return httpx.Response(200, text="same body", headers={"Content-Type": "text/plain"})
+
+
+def _offline(request: httpx.Request) -> httpx.Response:
+    raise AssertionError(f"network access during replay: {request.url}")
+
+
+@pytest.mark.asyncio
+async def test_httpx_responses_replay_without_network(tmp_path):
+    recording = NetworkArchive.record(tmp_path)
+    transport = recording.transport(httpx.MockTransport(_site))
+    async with httpx.AsyncClient(transport=transport) as client:
+        recorded = await client.get("https://x.test/old", follow_redirects=True)
+        await client.get("https://x.test/other")
+    recording.close()
+    assert recorded.text == "same body"
+    # Two responses share a body, so only two distinct bodies are stored.
+    assert len(recording) == 3 and len(list(tmp_path.iterdir())) == 3
+
+    replay = NetworkArchive.replay(tmp_path)
+    transport = replay.transport(httpx.MockTransport(_offline))
+    async with httpx.AsyncClient(transport=transport) as client:
+        replayed = await client.get("https://x.test/old", follow_redirects=True)
+        with pytest.raises(httpx.ConnectError):
+            await client.get("https://x.test/missing")
+    assert (str(replayed.url), replayed.status_code, replayed.text) == (
+        "https://x.test/new",
+        200,
+        "same body",
+    )
+    assert [response.status_code for response in replayed.history] == [301]
+    assert replay.stats == {"archive_replayed": 2, "archive_misses": 1}
+
+
+def test_replay_requires_a_recording(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        NetworkArchive.replay(tmp_path)
+
+
+def test_replay_reads_inline_har_content(tmp_path):
+    har = {
+        "log": {
+            "entries": [
+                {
+                    "request": {"method": "GET", "url": "https://x.test/a.js", "headers": []},
+                    "response": {
+                        "status": 200,
+                        "headers": [{"name": "Content-Type", "value": "text/javascript"}],
+                        "content": {"text": "Ly8gb2s=", "encoding": "base64"},
+                    },
+                }
+            ]
+        }
+    }
+    (tmp_path / HAR_FILE).write_text(json.dumps(har))
+    entry = NetworkArchive.replay(tmp_path).lookup("GET https://x.test/a.js")
+    assert entry.body == b"// ok"
+
+
+class FakeRequest:
+    def __init__(self, url, method="GET") -> None:
+        self.url = url
+        self.method = method
+        self.headers = {}
+        self.post_data_buffer = None
+
+
+class FakeResponse:
+    status = 200
+    headers_array = [
+        {"name": "Content-Type", "value": "text/css"},
+        {"name": "Content-Encoding", "value": "gzip"},
+    ]
+
+    async def body(self):
+        return b"body{}"
+
+
+class FakeRoute:
+    def __init__(self, url, online=True) -> None:
+        self.request = FakeRequest(url)
+        self.online = online
+        self.outcome = None
+
+    async def fetch(self, max_redirects=None):
+        if not self.online:
+            raise PlaywrightError("net::ERR_NAME_NOT_RESOLVED")
+        return FakeResponse()
+
+    async def fulfill(self, status=None, headers=None, body=None):
+        self.outcome = (status, headers, body)
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def abort(self, error_code=None):
+        self.outcome = error_code
+
+
+@pytest.mark.asyncio
+async def test_browser_requests_are_recorded_and_replayed(tmp_path):
+    recording = NetworkArchive.record(tmp_path)
+    routes = [FakeRoute("https://x.test/a.css"), FakeRoute("https://gone.test/", online=False)]
+    for route in routes:
+        await recording.handler()(route)
+    recording.close()
+    assert routes[0].outcome == (200, {"content-type": "text/css"}, b"body{}")
+    assert routes[1].outcome == "fallback"
+
+    replay = NetworkArchive.replay(tmp_path)
+    routes = [FakeRoute("https://x.test/a.css", online=False), FakeRoute("https://gone.test/")]
+    for route in routes:
+        await replay.handler()(route)
+    assert routes[0].outcome == (200, {"content-type": "text/css"}, b"body{}")
+    assert routes[1].outcome == "internetdisconnected"
+
+
+@pytest.mark.asyncio
+async def test_randomized_query_parameters_replay_the_nearest_recording(tmp_path):
+    recording = NetworkArchive.record(tmp_path)
+    recorded = [
+        "https://ads.test/gampad/ads?iu=/1/top&correlator=4821",
+        "https://ads.test/gampad/ads?iu=/1/side&correlator=4821",
+    ]
+    for url in recorded:
+        await recording.handler()(FakeRoute(url))
+    recording.close()
+
+    replay = NetworkArchive.replay(tmp_path)
+    assert replay.find("GET", "https://ads.test/gampad/ads?correlator=9173&iu=/1/side") is (
+        replay.lookup(archive_key("GET", recorded[1]))
+    )
+    route = FakeRoute("https://ads.test/gampad/ads?iu=/1/top&correlator=7730", online=False)
+    await replay.handler()(route)
+    assert route.outcome == (200, {"content-type": "text/css"}, b"body{}")
+    other_path = FakeRoute("https://ads.test/gampad/other?correlator=7730", online=False)
+    await replay.handler()(other_path)
+    assert other_path.outcome == "internetdisconnected"
+    assert replay.find("POST", recorded[0]) is None
+    assert replay.stats == {
+        "archive_nearest_matches": 2,
+        "archive_replayed": 1,
+        "archive_misses": 1,
+    }
+
+
+class RecordingPool:
+    archives = []
+
+    def __init__(self, concurrency, user_agent, archive=None, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.archives.append(archive)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, "<html><body><p>Rendered</p></body></html>", "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_replayed_audit_makes_no_requests(tmp_path, monkeypatch):
+    sitemap = "<urlset><url><loc>https://example.test/a</loc></url></urlset>"
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        if request.url.path == "/a":
+            return httpx.Response(200, html="<html><body><p>Article</p></body></html>")
+        return httpx.Response(404)
+
+    monkeypatch.setattr(
+        archive_module.httpx, "AsyncHTTPTransport", lambda: httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(audit, "BrowserPool", RecordingPool)
+
+    def config(**kwargs):
+        return CrawlConfig(
+            site="https://example.test",
+            out_dir=str(tmp_path / "out"),
+            rate_limit_ms=0,
+            list_skipped=False,
+            concurrency=1,
+            **kwargs,
+        )
+
+    recorded = await audit.audit_site(config(record_har_dir=str(tmp_path / "archive")))
+    assert calls and recorded.metrics["counters"]["archive_recorded"] > 0
+    calls.clear()
+    replayed = await audit.audit_site(config(replay_dir=str(tmp_path / "archive")))
+    assert calls == []
+    assert [page.url for page in replayed.pages] == [page.url for page in recorded.pages]
+    assert replayed.metrics["counters"]["archive_misses"] == 0
+    assert [archive.replaying for archive in RecordingPool.archives] == [False, True]
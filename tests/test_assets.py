@@ -0,0 +1,178 @@
+from collections import Counter
+from email.utils import formatdate
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from gpvb.metrics import MetricsRecorder
+from gpvb.render.assets import AssetCache, freshness_lifetime
+from gpvb.render.browser import BrowserPool
+from gpvb.report.writer import _render_performance
+
+NOW = 1_700_000_000.0
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="script", method="GET") -> None:
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, body, headers, status=200) -> None:
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, request, response=None) -> None:
+        self.request = request
+        self.response = response
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def fetch(self):
+        if self.response is None:
+            raise PlaywrightError("net::ERR_CONNECTION_RESET")
+        return self.response
+
+    async def fulfill(self, status=None, headers=None, body=None, response=None):
+        self.outcome = ("fulfill", "network" if response is not None else "cache", body)
+
+
+def _headers(**headers):
+    return {name.replace("_", "-"): value for name, value in headers.items()}
+
+
+def test_freshness_follows_cache_headers():
+    assert freshness_lifetime(_headers(cache_control="public, max-age=600", age="100"), NOW) == 500
+    assert freshness_lifetime(_headers(cache_control="max-age=600, no-store"), NOW) == 0
+    assert freshness_lifetime(_headers(cache_control="no-cache"), NOW) == 0
+    assert freshness_lifetime(_headers(cache_control="max-age=600", vary="Cookie"), NOW) == 0
+    encoded = _headers(cache_control="max-age=60", vary="Accept-Encoding")
+    assert freshness_lifetime(encoded, NOW) == 60
+    expires = _headers(
+        date=formatdate(NOW, usegmt=True), expires=formatdate(NOW + 300, usegmt=True)
+    )
+    assert freshness_lifetime(expires, NOW) == 300
+    modified = _headers(last_modified=formatdate(NOW - 1000, usegmt=True))
+    assert freshness_lifetime(modified, NOW) == pytest.approx(100)
+    assert freshness_lifetime({}, NOW) == 0
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_are_served_until_they_expire():
+    clock = [NOW]
+    cache = AssetCache(1024, clock=lambda: clock[0])
+    handle = cache.handler()
+    response = FakeResponse(b"x" * 100, {"cache-control": "max-age=60", "content-length": "100"})
+
+    first = FakeRoute(FakeRequest("https://cdn.test/app.js"), response)
+    await handle(first)
+    assert first.outcome == ("fulfill", "network", b"x" * 100)
+    assert cache.lookup("https://cdn.test/app.js").headers == {"cache-control": "max-age=60"}
+
+    page_stats = Counter()
+    second = FakeRoute(FakeRequest("https://cdn.test/app.js"))
+    await cache.handler(page_stats)(second)
+    assert second.outcome == ("fulfill", "cache", b"x" * 100)
+    assert page_stats == {"asset_cache_hits": 1, "asset_cache_bytes_saved": 100}
+
+    clock[0] += 61
+    assert cache.lookup("https://cdn.test/app.js") is None
+    assert cache.size_bytes == 0
+    assert cache.stats["asset_cache_misses"] == 1 and cache.stats["asset_cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_documents_posts_and_failed_fetches_fall_back_to_the_browser():
+    cache = AssetCache(1024)
+    handle = cache.handler()
+    routes = [
+        FakeRoute(FakeRequest("https://x.test/", resource_type="document")),
+        FakeRoute(FakeRequest("https://x.test/a.js", method="POST")),
+        FakeRoute(FakeRequest("https://x.test/b.js")),
+    ]
+    for route in routes:
+        await handle(route)
+    assert [route.outcome for route in routes] == ["fallback"] * 3
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_and_oversized_responses_are_not_stored():
+    cache = AssetCache(100, clock=lambda: NOW)
+    assert not await cache.store("https://x.test/a.css", 200, {"cache-control": "no-store"}, b"a")
+    assert not await cache.store(
+        "https://x.test/b.css", 200, {"cache-control": "max-age=60", "set-cookie": "id=1"}, b"b"
+    )
+    fresh = {"cache-control": "max-age=60"}
+    assert not await cache.store("https://x.test/c.css", 404, fresh, b"")
+    assert not await cache.store("https://x.test/d.png", 200, fresh, b"d" * 101)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_assets_are_evicted_beyond_the_size_cap(tmp_path):
+    cache = AssetCache(100, directory=tmp_path, clock=lambda: NOW)
+    headers = {"cache-control": "max-age=60"}
+    for name in ("a", "b"):
+        await cache.store(f"https://x.test/{name}.woff2", 200, headers, name.encode() * 40)
+    assert cache.lookup("https://x.test/a.woff2") is not None
+    await cache.store("https://x.test/c.woff2", 200, headers, b"c" * 40)
+    assert cache.lookup("https://x.test/b.woff2") is None
+    assert len(cache) == 2 and cache.size_bytes == 80
+    assert len(list(cache.directory.iterdir())) == 2
+
+    route = FakeRoute(FakeRequest("https://x.test/a.woff2", resource_type="font"))
+    await cache.handler()(route)
+    assert route.outcome == ("fulfill", "cache", b"a" * 40)
+    cache.close()
+    assert not cache.directory.exists()
+    assert tmp_path.exists()
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.routes = []
+        self.handlers = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+        self.handlers.append(handler)
+
+
+class FakeBrowser:
+    async def new_context(self, viewport=None, user_agent=None):
+        return FakeContext()
+
+
+@pytest.mark.asyncio
+async def test_pool_routes_contexts_through_the_shared_cache():
+    plain = await BrowserPool(1, "GPVB/1.0")._new_context(FakeBrowser(), {})
+    assert plain.routes == []
+    cache = AssetCache(1024, clock=lambda: NOW)
+    await cache.store("https://x.test/a.css", 200, {"cache-control": "max-age=60"}, b"a{}")
+    pool = BrowserPool(1, "GPVB/1.0", asset_cache=cache)
+    # Cache counts go to the page's render stats, never among its per-host request counts.
+    render_stats = Counter()
+    cached = await pool._new_context(FakeBrowser(), {}, render_stats)
+    assert cached.routes == ["**/*"]
+    await cached.handlers[0](FakeRoute(FakeRequest("https://x.test/a.css", "stylesheet")))
+    assert render_stats == {"asset_cache_hits": 1, "asset_cache_bytes_saved": 3}
+
+
+def test_performance_section_reports_asset_cache_savings():
+    metrics = MetricsRecorder()
+    metrics.incr("asset_cache_hits", 9)
+    metrics.incr("asset_cache_misses", 1)
+    metrics.incr("asset_cache_bytes_saved", 3 * 1048576)
+    assert "Asset cache: 90% of 10 static subresources" in _render_performance(metrics.summary())
+    assert "3.0 MB not downloaded" in _render_performance(metrics.summary())
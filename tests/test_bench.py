@@ -0,0 +1,27 @@
+from gpvb.bench.corpus import CorpusSpec, generate_corpus
+from gpvb.bench.micro import compare_to_baseline, run_micro_benchmarks
+
+
+def test_generate_corpus_is_deterministic_and_sized():
+    spec = CorpusSpec(pages=6, words=200, ad_count=2, script_kb=1, duplicate_rate=0.5, seed=7)
+    first = generate_corpus(spec)
+    second = generate_corpus(spec)
+    assert [page.html for page in first] == [page.html for page in second]
+    assert len(first) == 6
+    assert all(len(page.ad_elements) == 2 for page in first)
+    assert all(page.html.count("adsbygoogle") >= 2 for page in first)
+
+
+def test_micro_benchmarks_cover_targets_and_compare():
+    spec = CorpusSpec(pages=3, words=120, ad_count=1, text_blocks=5, script_kb=1, seed=3)
+    results = run_micro_benchmarks(spec, repeat=1)
+    assert "detectors.detect_language_issue" in results["results"]
+    assert "program_policy.apply_autogenerated_findings" in results["results"]
+    assert results["results"]["text.simhash"]["pages"] == 3
+
+    slower = {"results": {"text.simhash": dict(results["results"]["text.simhash"])}}
+    slower["results"]["text.simhash"]["per_page_ms"] = results["results"]["text.simhash"][
+        "per_page_ms"
+    ] * 10
+    rows = compare_to_baseline(slower, results)
+    assert rows[0]["regression"]
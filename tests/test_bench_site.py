@@ -0,0 +1,106 @@
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.bench.e2e import ResourceSampler, format_crawl_report, run_crawl_benchmark
+from gpvb.bench.site import SiteSpec, SyntheticSite, _render_page
+from gpvb.crawl.sitemap import expand_sitemaps
+from gpvb.render.procinfo import proc_available
+
+
+def test_synthetic_site_routes_are_deterministic():
+    spec = SiteSpec(pages=30, sitemap_chunk=10, ad_rate=1.0, seed=5)
+    site = SyntheticSite(spec)
+    try:
+        status, content_type, body = site.respond("/page/3")
+        assert status == 200 and content_type == "text/html"
+        assert b"adsbygoogle" in body and b"google_ad_client" in body
+        assert body.decode() == _render_page(spec, 3)
+        assert site.respond("/page/30")[0] == 404
+        assert site.respond("/ads.txt")[0] == 200
+        assert b"sitemap-2.xml" in site.respond("/sitemap.xml")[2]
+        assert b"Sitemap:" in site.respond("/robots.txt")[2]
+    finally:
+        site.stop()
+
+
+def test_synthetic_site_without_sitemap_omits_robots_reference():
+    site = SyntheticSite(SiteSpec(pages=5, sitemap=False))
+    try:
+        assert b"Sitemap:" not in site.respond("/robots.txt")[2]
+        assert site.respond("/sitemap.xml")[0] == 404
+    finally:
+        site.stop()
+
+
+@pytest.mark.asyncio
+async def test_synthetic_site_serves_sitemaps_and_injects_errors():
+    spec = SiteSpec(pages=25, sitemap_chunk=10, error_rate=0.5, seed=9)
+    with SyntheticSite(spec) as site:
+        async with httpx.AsyncClient(timeout=5) as client:
+            urls = await expand_sitemaps(client, site.url + "/")
+            statuses = [(await client.get(url)).status_code for url in urls]
+    assert len(urls) == 25
+    assert 500 in statuses and 200 in statuses
+    assert site.stats()["errors"] == statuses.count(500)
+
+
+@pytest.mark.skipif(not proc_available(), reason="needs /proc")
+def test_resource_sampler_tracks_rss_and_chromium_cpu():
+    busy = "import time\nend = time.process_time() + 0.3\nwhile time.process_time() < end: pass"
+    with ResourceSampler(interval_s=0.02) as sampler:
+        child = subprocess.Popen([sys.executable, "-c", busy, "chromium-stub"])
+        child.wait(timeout=10)
+    assert sampler.peak_rss_bytes > 0
+    assert sampler.peak_chromium_rss_bytes > 0
+    assert sampler.chromium_cpu_seconds > 0
+
+
+class HttpRenderPool:
+    """Renders by plain HTTP fetch so the crawl harness can run without Chromium."""
+
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(timeout=5)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._client.aclose()
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        response = await self._client.get(url)
+        if response.status_code >= 500:
+            raise audit.RenderError(url, f"HTTP {response.status_code}")
+        extras = {
+            "headers": dict(response.headers),
+            "overlays": [],
+            "text_blocks": [],
+            "label_blocks": [],
+        }
+        return url, response.status_code, response.text, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+def test_run_crawl_benchmark_reports_throughput_and_stages(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit, "BrowserPool", HttpRenderPool)
+    spec = SiteSpec(pages=8, words=120, sitemap_chunk=5, error_rate=0.25, seed=3)
+    result = run_crawl_benchmark(spec, concurrency=2, out_dir=str(tmp_path))
+
+    assert result["pages"] == 8
+    assert 0 < result["rendered_pages"] < result["pages"]
+    assert result["pages_per_min"] < result["attempted_pages_per_min"]
+    assert result["stages"]["render"]["count"] == result["pages"]
+    assert "dead_end" in result["detectors"]
+    assert result["stages"]["resolve"]["count"] == result["pages"]
+    # Failing pages error once during pre-resolution and again when rendered.
+    assert result["server"]["errors"] == 2 * (result["pages"] - result["rendered_pages"])
+    assert "children_max_rss_mb" not in result
+    assert "rendered pages/min" in format_crawl_report(result)
+    assert (tmp_path / "metrics.json").exists()
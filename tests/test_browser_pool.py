@@ -0,0 +1,221 @@
+import httpx
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from gpvb import audit
+from gpvb.models import CrawlConfig
+from gpvb.render.browser import BrowserCrashedError, BrowserPool, RenderError
+from gpvb.snapshots import SNAPSHOT_FILE, SnapshotStore
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.handlers = []
+
+    def on(self, event, handler) -> None:
+        self.handlers.append(handler)
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def close(self) -> None:
+        self.connected = False
+        for handler in self.handlers:
+            handler(self)
+
+    def crash(self) -> None:
+        self.connected = False
+        for handler in self.handlers:
+            handler(self)
+
+
+class FakeChromium:
+    def __init__(self) -> None:
+        self.launched = []
+
+    async def launch(self, args=None):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self) -> None:
+        self.chromium = FakeChromium()
+
+
+async def _started_pool(**kwargs) -> BrowserPool:
+    pool = BrowserPool(4, "GPVB/1.0", **kwargs)
+    pool._playwright = FakePlaywright()
+    for slot in pool._slots:
+        await pool._launch(slot)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_pool_dispatches_to_least_loaded_browser():
+    pool = await _started_pool(browsers=2)
+    first = await pool._acquire("https://example.com")
+    second = await pool._acquire("https://example.com")
+    assert first.slot is not second.slot
+    await pool._release(first)
+    third = await pool._acquire("https://example.com")
+    assert third.slot is first.slot
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_after_page_limit():
+    pool = await _started_pool(browsers=1, recycle_after_pages=2)
+    original = pool._slots[0].browser
+    for _ in range(2):
+        await pool._release(await pool._acquire("https://example.com"))
+    lease = await pool._acquire("https://example.com")
+    assert lease.browser is not original
+    assert not original.is_connected()
+    assert pool.stats["recycles"] == 1
+    assert pool.stats["crashes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_crashed_browser():
+    pool = await _started_pool(browsers=1)
+    lease = await pool._acquire("https://example.com")
+    lease.browser.crash()
+    assert lease.crashed()
+    replacement = await pool._acquire("https://example.com")
+    assert replacement.browser is not lease.browser
+    await pool._release(lease)
+    assert replacement.slot.active == 1
+    assert pool.stats["crashes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_turns_launch_failure_into_crash_error():
+    pool = await _started_pool(browsers=1)
+    lease = await pool._acquire("https://example.com/a")
+    lease.browser.crash()
+    await pool._release(lease)
+
+    async def failing_launch(args=None):
+        raise PlaywrightError("launch failed")
+
+    pool._playwright.chromium.launch = failing_launch
+    with pytest.raises(BrowserCrashedError):
+        await pool._acquire("https://example.com/b")
+    assert not pool._slots[0].launching
+
+
+class FakeRenderPool:
+    """Stands in for BrowserPool inside audit_site."""
+
+    crash_once = {"https://example.test/crash"}
+    broken = {"https://example.test/broken"}
+    mobile_broken = {"https://example.test/mobile"}
+
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.render_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        self.render_calls.append(url)
+        if url in self.crash_once and self.render_calls.count(url) == 1:
+            raise BrowserCrashedError(url, "browser crashed")
+        if url in self.broken:
+            raise RenderError(url, "net::ERR_CONNECTION_REFUSED")
+        html = "<html lang='en'><body><p>Hello world privacy policy</p></body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "Hello world", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        if url in self.mobile_broken:
+            raise RenderError(url, "Timeout 30000ms exceeded")
+        return {"autoplay_audio": False}
+
+
+@pytest.mark.asyncio
+async def test_audit_requeues_crashes_and_records_render_failures(tmp_path, monkeypatch):
+    urls = [
+        "https://example.test/crash",
+        "https://example.test/broken",
+        "https://example.test/mobile",
+    ]
+    sitemap = "<urlset>" + "".join(f"<url><loc>{url}</loc></url>" for url in urls) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(404, text="")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    monkeypatch.setattr(audit, "BrowserPool", FakeRenderPool)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        concurrency=2,
+        rate_limit_ms=0,
+        list_skipped=False,
+    )
+    report = await audit.audit_site(config)
+    by_url = {page.url: page for page in report.pages}
+
+    assert set(by_url) == set(urls)
+    assert by_url["https://example.test/crash"].skipped_reason is None
+    assert by_url["https://example.test/crash"].status == 200
+    assert by_url["https://example.test/broken"].skipped_reason.startswith("render_failed")
+    assert by_url["https://example.test/mobile"].skipped_reason is None
+    assert by_url["https://example.test/mobile"].html
+    assert report.metrics["counters"]["render_requeues"] == 1
+    assert report.metrics["stages"]["render"]["count"] == 4
+    assert (tmp_path / "metrics.prom").read_text().endswith("# EOF\n")
+    store = SnapshotStore(tmp_path / SNAPSHOT_FILE)
+    assert store.load_run().id == report.run_id
+    assert len(list(store.iter_snapshots(report.run_id))) == len(urls)
+
+
+@pytest.mark.asyncio
+async def test_audit_gives_up_after_max_render_retries(tmp_path, monkeypatch):
+    class AlwaysCrashing(FakeRenderPool):
+        async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+            self.render_calls.append(url)
+            raise BrowserCrashedError(url, "browser crashed")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, text="")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    pools = []
+
+    def factory(*args, **kwargs):
+        pools.append(AlwaysCrashing(*args, **kwargs))
+        return pools[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test/",
+        out_dir=str(tmp_path),
+        concurrency=1,
+        rate_limit_ms=0,
+        max_render_retries=2,
+        list_skipped=False,
+    )
+    report = await audit.audit_site(config)
+    assert len(pools[0].render_calls) == 3
+    assert len(report.pages) == 1
+    assert report.pages[0].skipped_reason == "render_failed: browser crashed"
@@ -1,4 +1,9 @@
-from gpvb.crawl.canonicalize import canonicalize_url
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.crawl.canonicalize import URLNormalizer, canonicalize_url
+from gpvb.models import CrawlConfig
 
 
 def test_canonicalize_removes_fragment():
@@ -9,3 +14,104 @@ def test_canonicalize_removes_fragment():
 def test_canonicalize_ignores_querystrings():
     url = "https://example.com/page?x=1&y=2"
     assert canonicalize_url(url, ignore_querystrings=True) == "https://example.com/page"
+
+
+def test_normalizer_collapses_equivalent_spellings():
+    normalizer = URLNormalizer()
+    expected = "https://example.com/a?a=2&b=1"
+    assert normalizer.normalize("HTTPS://Example.com:443/a?utm_source=x&b=1&a=2") == expected
+    assert normalizer.normalize("https://example.com/a?a=2&fbclid=z&b=1#top") == expected
+    assert normalizer.normalize("http://example.com:8080/%7euser/a%2fb%c3%a9") == (
+        "http://example.com:8080/~user/a%2Fb%C3%A9"
+    )
+    assert normalizer.normalize("https://example.com/café menu") == (
+        "https://example.com/caf%C3%A9%20menu"
+    )
+
+
+def test_normalizer_policies_and_site_overrides():
+    normalizer = URLNormalizer.from_dict(
+        {
+            "trailing_slash": "strip",
+            "index_files": ["index.html"],
+            "sites": {"shop.example.com": {"keep_params": ["utm_campaign"], "sort_query": False}},
+        }
+    )
+    assert normalizer.normalize("https://example.com/blog/index.html") == "https://example.com/blog"
+    assert normalizer.normalize("https://example.com/blog/") == "https://example.com/blog"
+    assert normalizer.normalize("https://example.com/") == "https://example.com/"
+    assert normalizer.normalize("https://shop.example.com/p?z=1&utm_campaign=s&utm_medium=m") == (
+        "https://shop.example.com/p?z=1&utm_campaign=s"
+    )
+    with pytest.raises(ValueError):
+        URLNormalizer.from_dict({"trailing_slash": "sometimes"})
+    with pytest.raises(ValueError):
+        URLNormalizer.from_dict({"strip_everything": True})
+
+
+def test_normalizer_memoizes_results():
+    normalizer = URLNormalizer(cache_size=2)
+    for _ in range(3):
+        normalizer.normalize("https://example.com/a")
+    assert normalizer.cache_info().hits == 2
+    assert normalizer.cache_info().misses == 1
+
+
+class RecordingPool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.render_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        self.render_calls.append(url)
+        html = "<html><body><a href='/search?amp&q=a+b'>Search</a><p>Page</p></body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_audit_fetches_urls_as_written_and_dedupes_them_normalized(tmp_path, monkeypatch):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    created = []
+
+    def factory(*args, **kwargs):
+        created.append(RecordingPool(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="http://example.test:80/",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        pre_resolve=False,
+        template_min_pages=0,
+    )
+    report = await audit.audit_site(config)
+    # The default port does not make every link look external, and the query is fetched as
+    # written: ``?amp`` and ``+`` mean something different to some servers than ``amp=``/``%20``.
+    assert created[0].render_calls == [
+        "http://example.test:80/",
+        "http://example.test:80/search?amp&q=a+b",
+    ]
+    assert [page.url for page in report.pages] == [
+        "http://example.test/",
+        "http://example.test/search?amp=&q=a%20b",
+    ]
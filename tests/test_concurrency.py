@@ -0,0 +1,218 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import CrawlConfig
+from gpvb.render.browser import RenderError
+from gpvb.render.concurrency import AdaptiveLimiter, Headroom, outcome_for_error
+
+
+ROOMY = Headroom(memory_available=0.8, cpu_load=0.2)
+
+
+async def _feed(limiter: AdaptiveLimiter, count: int, seconds: float, outcome: str = "ok"):
+    for _ in range(count):
+        await limiter.observe(seconds, outcome)
+
+
+@pytest.mark.asyncio
+async def test_limiter_scales_up_while_healthy_and_respects_maximum():
+    metrics = MetricsRecorder()
+    limiter = AdaptiveLimiter(2, 1, 4, window=4, metrics=metrics, headroom=lambda: ROOMY)
+    await _feed(limiter, 4 * 5, 0.5)
+    assert limiter.limit == 4
+    actions = [event["action"] for event in metrics.events]
+    assert actions == ["increase", "increase", "hold", "hold", "hold"]
+    assert metrics.events[0]["reason"] == "healthy"
+    assert metrics.gauges["render_slots"].last == 4
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_on_latency_timeouts_and_429s():
+    metrics = MetricsRecorder()
+    limiter = AdaptiveLimiter(6, 2, 8, window=4, metrics=metrics, headroom=lambda: ROOMY)
+    await _feed(limiter, 4, 0.5)
+    assert limiter.limit == 7
+    await _feed(limiter, 4, 2.0)
+    assert limiter.limit == 6 and metrics.events[-1]["reason"] == "latency"
+
+    await limiter.observe(30.0, "timeout")
+    assert limiter.limit == 4
+    # A burst from the same in-flight generation only counts once.
+    await _feed(limiter, 2, 30.0, "timeout")
+    assert limiter.limit == 4
+    await _feed(limiter, 2, 0.5)
+    assert limiter.limit == 3 and metrics.events[-1]["reason"] == "errors"
+    await limiter.observe(0.1, "rate_limited")
+    assert limiter.limit == 2
+    reasons = [event["reason"] for event in metrics.events]
+    assert reasons == ["healthy", "latency", "timeout", "errors", "rate_limited"]
+    for _ in range(10):
+        await limiter.observe(0.1, "rate_limited")
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_holds_without_headroom_and_sheds_under_memory_pressure():
+    headroom = {"value": Headroom(memory_available=0.15, cpu_load=0.2)}
+    limiter = AdaptiveLimiter(4, 1, 8, window=4, headroom=lambda: headroom["value"])
+    await _feed(limiter, 4, 0.5)
+    assert limiter.limit == 4
+    headroom["value"] = Headroom(memory_available=0.5, cpu_load=1.2)
+    await _feed(limiter, 4, 0.5)
+    assert limiter.limit == 4
+    headroom["value"] = Headroom(memory_available=0.05, cpu_load=0.2)
+    await _feed(limiter, 4, 0.5)
+    assert limiter.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_slots_block_at_the_current_limit():
+    limiter = AdaptiveLimiter(2, 1, 4, headroom=lambda: ROOMY)
+    running = 0
+    peak = 0
+
+    async def job():
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(job() for _ in range(8)))
+    assert peak == 2 and limiter.active == 0
+
+
+def test_timeouts_are_told_apart_from_other_render_errors():
+    assert outcome_for_error("Timeout 30000ms exceeded.") == "timeout"
+    assert outcome_for_error("net::ERR_CONNECTION_REFUSED") == "error"
+
+
+class ThrottledPool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.concurrency = concurrency
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        if url.endswith("/slow"):
+            raise RenderError(url, "Timeout 30000ms exceeded.")
+        html = "<html lang='en'><body><p>Some page text.</p></body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 429 if url.endswith("/busy") else 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_audit_logs_concurrency_decisions(tmp_path, monkeypatch):
+    paths = ["/slow"] + [f"/page/{index}" for index in range(10)] + ["/busy"]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(200, html="<html><body><p>Some page text.</p></body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    pools = []
+
+    def factory(*args, **kwargs):
+        pools.append(ThrottledPool(*args, **kwargs))
+        return pools[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        concurrency=3,
+        adaptive_concurrency=True,
+        min_concurrency=2,
+        max_concurrency=5,
+    )
+    await audit.audit_site(config)
+
+    assert pools[0].concurrency == 5
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["workers"] == 5
+    decisions = [event for event in metrics["events"] if event["kind"] == "concurrency"]
+    assert {"timeout", "rate_limited"} <= {event["reason"] for event in decisions}
+    assert all(2 <= event["limit"] <= 5 for event in decisions)
+    assert metrics["gauges"]["render_slots"]["max"] <= 5
+
+
+class SteadyPool(ThrottledPool):
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        await asyncio.sleep(0.02)
+        return await super().render_page(url, viewport, timeout_ms, screenshot_path)
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_a_slot_is_not_counted_as_render_latency(tmp_path, monkeypatch):
+    paths = [f"/page/{index}" for index in range(24)]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(200, html="<html><body><p>Some page text.</p></body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    monkeypatch.setattr(audit, "BrowserPool", SteadyPool)
+    limiters = []
+
+    class RecordingLimiter(AdaptiveLimiter):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, headroom=lambda: ROOMY, **kwargs)
+            self.latencies = []
+            limiters.append(self)
+
+        async def observe(self, seconds, outcome):
+            self.latencies.append(seconds)
+            await super().observe(seconds, outcome)
+
+    monkeypatch.setattr(audit, "AdaptiveLimiter", RecordingLimiter)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        concurrency=1,
+        adaptive_concurrency=True,
+        min_concurrency=1,
+        max_concurrency=4,
+    )
+    await audit.audit_site(config)
+
+    # Four workers share one slot at first, so most of them queue for it.
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["stages"]["render_slot_wait"]["max_ms"] >= 20
+    assert max(limiters[0].latencies) < 0.1
+    assert limiters[0].limit > 1
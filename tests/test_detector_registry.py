@@ -0,0 +1,198 @@
+import json
+
+import pytest
+
+from gpvb.audit import build_report
+from gpvb.detect import registry as registry_module
+from gpvb.detect.catalog import DetectorCatalog
+from gpvb.detect.program_policy.malware_risk import MALWARE_FORCED_DOWNLOAD
+from gpvb.detect.registry import (
+    DetectionInputs,
+    DetectorRegistry,
+    DetectorSpec,
+    default_registry,
+    run_detectors,
+)
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import CrawlConfig, DetectorInfo, Finding, PageResult, Severity
+from gpvb.report.writer import _render_page_card, write_html, write_json
+
+
+def _page(html: str = "<html><body></body></html>", text: str = "") -> PageResult:
+    return PageResult(
+        url="https://example.com", final_url="https://example.com", status=200, html=html, text=text
+    )
+
+
+def _finding(detector: str) -> Finding:
+    return Finding(detector=detector, severity=Severity.low, message="hit")
+
+
+def test_select_supports_include_and_exclude():
+    registry = default_registry()
+    assert [spec.id for spec in registry.select(["ugc_risk", "thin_content"])] == [
+        "thin_content",
+        "ugc_risk",
+    ]
+    remaining = {spec.id for spec in registry.select(["-language_issue"], groups=["general"])}
+    assert "language_issue" not in remaining and "thin_content" in remaining
+    assert all(spec.group == "general" for spec in registry.select(groups=["general"]))
+    with pytest.raises(ValueError, match="no_such_detector"):
+        registry.select(["no_such_detector"])
+
+
+def test_gated_detector_skips_without_computing_inputs():
+    calls = []
+    registry = DetectorRegistry()
+    registry.register_input("expensive", lambda inputs: calls.append("expensive") or "parsed")
+    registry.register(
+        DetectorSpec(
+            "gated",
+            lambda page, value: [_finding("gated")],
+            inputs=("page", "expensive"),
+            prefilter=lambda page: "comment" in page.html,
+            cost="expensive",
+        )
+    )
+    registry.register(
+        DetectorSpec("shared", lambda value: [_finding(value)], inputs=("expensive",))
+    )
+    metrics = MetricsRecorder()
+
+    inputs = DetectionInputs(_page(), providers=registry.inputs)
+    findings = run_detectors(list(registry), inputs, metrics)
+    assert [finding.detector for finding in findings] == ["parsed"]
+    assert metrics.detector_skips["gated"] == 1
+
+    inputs = DetectionInputs(_page("<div class='comment'></div>"), providers=registry.inputs)
+    findings = run_detectors(list(registry), inputs, metrics)
+    assert [finding.detector for finding in findings] == ["gated", "parsed"]
+    assert calls == ["expensive", "expensive"]
+    assert metrics.summary()["detectors"]["gated"]["cost"] == "expensive"
+
+
+def test_register_rejects_duplicates_and_unknown_inputs():
+    registry = DetectorRegistry()
+    registry.register(DetectorSpec("one", lambda page: []))
+    with pytest.raises(ValueError):
+        registry.register(DetectorSpec("one", lambda page: []))
+    with pytest.raises(ValueError, match="missing"):
+        registry.register(DetectorSpec("two", lambda value: [], inputs=("missing",)))
+    with pytest.raises(ValueError):
+        DetectorSpec("three", lambda page: [], cost="free")
+
+
+def test_entry_point_plugins_are_loaded_and_broken_ones_skipped(monkeypatch):
+    plugin = DetectorSpec("plugin_check", lambda page: [_finding("plugin_check")])
+
+    class FakeEntryPoint:
+        def __init__(self, name, target):
+            self.name = name
+            self.target = target
+
+        def load(self):
+            if isinstance(self.target, Exception):
+                raise self.target
+            return self.target
+
+    entries = [FakeEntryPoint("good", plugin), FakeEntryPoint("broken", ImportError("boom"))]
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: entries)
+    registry = DetectorRegistry()
+    registry.load_entry_points()
+    assert [spec.id for spec in registry] == ["plugin_check"]
+
+
+def test_builtin_prefilters_match_detector_results():
+    registry = default_registry()
+    page = _page(text="An honest recipe blog with no comments.")
+    for spec in registry:
+        if spec.prefilter is None or spec.prefilter(page):
+            continue
+        inputs = DetectionInputs(page)
+        assert spec.func(*[inputs.get(name) for name in spec.inputs]) == []
+
+
+def test_catalog_entries_take_the_version_of_their_detector():
+    hit = DetectorInfo("hit", "Something was hit.", Severity.high, remediation=("Fix it.",))
+    registry = DetectorRegistry()
+    registry.register(
+        DetectorSpec("hits", lambda page: [hit.finding()], version="3", findings=(hit,))
+    )
+    assert registry.catalog.get("hit").version == "3"
+    assert registry.catalog.get("hit").remediation == ("Fix it.",)
+    other = DetectorInfo("hit", "Something else.", Severity.low)
+    with pytest.raises(ValueError, match="hit"):
+        registry.register(DetectorSpec("other", lambda page: [], version="3", findings=(other,)))
+    assert registry.catalog.get("unregistered").message == "unregistered"
+    assert set(hit.finding({"count": 2}).model_dump()) == {
+        "detector",
+        "version",
+        "severity",
+        "confidence",
+        "evidence",
+    }
+    findings = run_detectors(list(registry), DetectionInputs(_page(text="page")))
+    assert [finding.version for finding in findings] == ["3"]
+
+    catalog = default_registry().catalog
+    for detector in ("missing_ads_txt", "replicated_content", "autogenerated_cluster_content"):
+        assert detector in catalog
+    assert catalog.get("language_issue").version == "2"
+
+
+def test_report_emits_the_catalog_once_and_resolves_it_when_rendering(tmp_path):
+    pages = [_page(text="page") for _ in range(3)]
+    for page in pages:
+        page.findings.append(MALWARE_FORCED_DOWNLOAD.finding({"download_links": ["a.exe"]}))
+    config = CrawlConfig(
+        site="https://example.com",
+        out_dir=str(tmp_path),
+        enable_program_policy_checks=False,
+        template_min_pages=0,
+    )
+    site_facts = {"ads_txt_status": 200, "ads_txt_lines": 1, "privacy_found": True}
+    report = build_report(config, pages, site_facts, MetricsRecorder())
+    assert report.program_policy_summary == {"malware_forced_download": {"critical": 3}}
+
+    write_json(report, tmp_path)
+    write_html(report, tmp_path)
+    data = json.loads((tmp_path / "findings.json").read_text())
+    assert list(data["catalog"]) == ["malware_forced_download"]
+    entry = data["catalog"]["malware_forced_download"]["1"]
+    assert entry["message"] == "Forced download behavior detected."
+    assert entry["policy_links"] == list(MALWARE_FORCED_DOWNLOAD.policy_links)
+    forced = [
+        finding
+        for finding in data["pages"][0]["findings"]
+        if finding["detector"] == "malware_forced_download"
+    ]
+    assert forced[0] == {
+        "detector": "malware_forced_download",
+        "version": "1",
+        "severity": "critical",
+        "confidence": 0.84,
+        "evidence": {"download_links": ["a.exe"]},
+    }
+    html = (tmp_path / "report.html").read_text()
+    assert html.count(MALWARE_FORCED_DOWNLOAD.remediation[0]) == 6
+
+
+def test_findings_resolve_the_catalog_entry_of_their_detector_version():
+    old = DetectorInfo("hit", "Old wording.", Severity.low)
+    new = DetectorInfo("hit", "New wording.", Severity.high, version="2")
+    catalog = DetectorCatalog()
+    catalog.add(old)
+    catalog.add(new)
+    assert ("hit", "1") in catalog and "hit" in catalog
+    assert catalog.get("hit", "1").message == "Old wording."
+    assert catalog.get("hit").message == catalog.get("hit", "9").message == "New wording."
+
+    page = _page(text="page")
+    page.findings = [old.finding(), new.finding()]
+    entries = catalog.for_findings(page.findings)
+    assert {version: info.message for version, info in entries["hit"].items()} == {
+        "1": "Old wording.",
+        "2": "New wording.",
+    }
+    html = _render_page_card(page, entries)
+    assert "Old wording." in html and "New wording." in html
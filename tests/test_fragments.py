@@ -0,0 +1,63 @@
+from gpvb.detect.fragments import FragmentCache, split_boilerplate
+from gpvb.detect.program_policy.context import ProgramPolicyContext
+from gpvb.detect.program_policy.malware_risk import detect_malware_risk
+from gpvb.detect.scripts import scan_scripts
+from gpvb.metrics import MetricsRecorder
+from gpvb.models import PageResult
+from gpvb.report.writer import _render_performance
+
+TEMPLATE = (
+    "<html><head><script>setTimeout(function(){location.reload()},60000)</script></head><body>"
+    "<header><nav><a href='/'>Home</a><a href='https://bit.ly/x'>Deal</a></nav></header>"
+    "<main>{body}</main><footer><a href='/files/app.APK?a=1&amp;b=2'>App</a></footer>"
+    "</body></html>"
+)
+
+
+def _html(body):
+    return TEMPLATE.replace("{body}", body)
+
+
+def test_split_boilerplate_covers_the_markup_in_order():
+    markup = "<body><nav>a</nav><p>b</p><footer>c</footer><aside>unclosed"
+    pieces = list(split_boilerplate(markup))
+    assert "".join(piece for _, piece in pieces) == markup
+    assert [piece for boilerplate, piece in pieces if boilerplate] == [
+        "<nav>a</nav>",
+        "<footer>c</footer>",
+    ]
+
+
+def test_shared_fragments_are_scanned_once_per_cache():
+    cache = FragmentCache()
+    first = scan_scripts(_html("<p>one <a href='/a'>a</a></p>"), cache)
+    second = scan_scripts(_html("<p>two <a href='/b'>b</a></p>"), cache)
+    assert first.timer_reload and second.timer_reload
+    assert second.links == ["/", "https://bit.ly/x", "/b", "/files/app.apk?a=1&b=2"]
+    assert cache.counts() == {"boilerplate": (2, 2), "script": (1, 1)}
+
+
+def test_cache_evicts_least_recently_used_entries():
+    cache = FragmentCache(max_entries=2)
+    calls = []
+    for content in ("a", "b", "a", "c", "b"):
+        cache.get_or_compute("script", content, lambda text: calls.append(text) or text)
+    assert calls == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_malware_links_come_from_cached_fragments():
+    page = PageResult(
+        url="https://x.test/", final_url="https://x.test/", status=200, html=_html(""), text=""
+    )
+    context = ProgramPolicyContext([], [], {"width": 1366, "height": 768})
+    assert [finding.evidence for finding in detect_malware_risk(page, context)] == [
+        {"shortener_links": ["https://bit.ly/x"]}
+    ]
+
+
+def test_performance_section_reports_fragment_hit_rate():
+    metrics = MetricsRecorder()
+    metrics.incr("fragment_script_hits", 3)
+    metrics.incr("fragment_script_misses", 1)
+    assert "Fragment cache: 75% of 4" in _render_performance(metrics.summary())
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.crawl.frontier import CostModel, PriorityFrontier, freshness, url_section
+from gpvb.crawl.sitemap import SitemapEntry
+from gpvb.models import CrawlConfig
+
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+async def _drain(frontier: PriorityFrontier):
+    items = []
+    while not frontier.empty():
+        items.append(await frontier.get())
+        frontier.task_done()
+    return items
+
+
+def test_freshness_and_sections():
+    assert freshness("2024-06-01", NOW) == 1.0
+    assert freshness("2024-05-02T00:00:00Z", NOW) == pytest.approx(0.5)
+    assert freshness(None, NOW) == 0.0 and freshness("last week", NOW) == 0.0
+    assert url_section("https://x.test/blog/post-1?a=1") == "/blog"
+    assert url_section("https://x.test/") == "/"
+
+
+@pytest.mark.asyncio
+async def test_frontier_orders_by_sitemap_priority_freshness_and_depth():
+    frontier = PriorityFrontier(
+        [
+            SitemapEntry("https://x.test/low", priority=0.1),
+            SitemapEntry("https://x.test/high", priority=0.9),
+            SitemapEntry("https://x.test/fresh", priority=0.3, lastmod="2024-06-01"),
+        ],
+        now=NOW,
+    )
+    for url in ["https://x.test/low", "https://x.test/high", "https://x.test/fresh"]:
+        await frontier.put((url, 0))
+    await frontier.put(("https://x.test/deep", 4))
+    await frontier.put(("https://x.test/shallow", 1))
+    order = [url for url, _ in await _drain(frontier)]
+    assert order == [
+        "https://x.test/high",
+        "https://x.test/fresh",
+        "https://x.test/shallow",
+        "https://x.test/low",
+        "https://x.test/deep",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_frontier_learns_in_degree_and_ad_bearing_sections():
+    frontier = PriorityFrontier(now=NOW)
+    for url in ["https://x.test/about/a", "https://x.test/news/b", "https://x.test/news/c"]:
+        await frontier.put((url, 1))
+    frontier.record_page("https://x.test/news/first", True)
+    frontier.record_page("https://x.test/about/first", False)
+    assert frontier.ad_likelihood("https://x.test/news/z") > 0.5
+    assert frontier.ad_likelihood("https://x.test/about/z") < 0.5
+    frontier.record_page(
+        "https://x.test/", False, ["https://x.test/news/c", "https://x.test/news/c"]
+    )
+    frontier.record_page("https://x.test/other", False, ["https://x.test/news/c"])
+    order = [url for url, _ in await _drain(frontier)]
+    assert order == ["https://x.test/news/c", "https://x.test/news/b", "https://x.test/about/a"]
+
+
+@pytest.mark.asyncio
+async def test_frontier_keeps_queue_protocol_for_duplicates_and_sentinels():
+    frontier = PriorityFrontier(key=lambda url: url.rstrip("/"))
+    await frontier.put(("https://x.test/a/", 2))
+    await frontier.put(("https://x.test/a", 1))
+    await frontier.put(None)
+    assert frontier.qsize() == 3
+    assert await frontier.get() == ("https://x.test/a", 1)
+    assert await frontier.get() == ("https://x.test/a", 2)
+    assert await frontier.get() is None
+    for _ in range(3):
+        frontier.task_done()
+    await asyncio.wait_for(frontier.join(), 1)
+
+
+def test_cost_model_prefers_section_estimates():
+    costs = CostModel(alpha=0.5)
+    assert costs.expected("https://x.test/a/1") == 0.0
+    costs.observe("https://x.test/a/1", 2.0)
+    costs.observe("https://x.test/a/2", 4.0)
+    costs.observe("https://x.test/b/1", 1.0)
+    assert costs.expected("https://x.test/a/3") == 3.0
+    assert costs.expected("https://x.test/b/3") == 1.0
+    assert costs.expected("https://x.test/c/1") == 2.0
+
+
+class SlowPool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.render_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        self.render_calls.append(url)
+        await asyncio.sleep(0.2)
+        html = "<html lang='en'><body><p>Plenty of page text here.</p></body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_time_budget_audits_most_important_pages_first(tmp_path, monkeypatch):
+    priorities = [0.1 * index for index in range(10)]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test/p{index}</loc><priority>{priority:.1f}</priority></url>"
+        for index, priority in enumerate(priorities)
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(200, html="<html><body><p>Plenty of page text.</p></body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    pools = []
+
+    def factory(*args, **kwargs):
+        pools.append(SlowPool(*args, **kwargs))
+        return pools[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        concurrency=1,
+        time_budget_s=0.7,
+    )
+    report = await audit.audit_site(config)
+
+    rendered = pools[0].render_calls
+    assert 1 <= len(rendered) < 10
+    expected = [f"https://example.test/p{index}" for index in range(9, -1, -1)]
+    assert rendered == expected[: len(rendered)]
+    coverage = report.coverage
+    assert coverage["complete"] is False
+    assert coverage["pages"] + coverage["unvisited"] + coverage["cut_off"] == 10
+    assert "Time budget" in (tmp_path / "report.html").read_text()
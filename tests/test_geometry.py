@@ -0,0 +1,72 @@
+from gpvb.bench.models import run_model_benchmark
+from gpvb.detect.geometry import (
+    OVERLAPS_CLICKABLE,
+    OVERLAPS_CONTENT,
+    OVERLAPS_NAV,
+    AdRects,
+    YIndex,
+    ad_rects,
+)
+from gpvb.detect.program_policy.context import ProgramPolicyContext, TextBlock
+from gpvb.models import AdElement, PageResult
+
+
+def _ad(x, y, width=300.0, height=250.0, **flags):
+    return AdElement(selector="ins", x=x, y=y, width=width, height=height, **flags)
+
+
+def test_ad_rects_answer_area_overlap_and_viewport_queries():
+    rects = AdRects.from_elements(
+        [
+            _ad(0, 0, overlaps_clickable=True),
+            _ad(1200, 100, overlaps_nav=True),
+            _ad(10, 2000, 100, 100, overlaps_content=True, overlaps_nav=True),
+        ]
+    )
+    assert len(rects) == 3
+    assert rects.area() == 2 * 300 * 250 + 100 * 100
+    assert rects.flagged(OVERLAPS_CLICKABLE | OVERLAPS_CONTENT) == 2
+    assert rects.flagged(OVERLAPS_NAV) == 2
+    assert rects.within(1366, 768) == 1
+    assert list(rects.y) == [0.0, 100.0, 2000.0]
+
+
+def test_ad_rects_are_cached_per_page_and_follow_appended_ads():
+    page = PageResult(
+        url="https://x.test/", final_url="https://x.test/", status=200, html="", text=""
+    )
+    page.ad_elements.append(_ad(0, 0))
+    first = ad_rects(page)
+    assert ad_rects(page) is first
+    page.ad_elements.append(_ad(0, 500))
+    assert len(ad_rects(page)) == 2
+    assert "_ad_rects" not in page.model_dump()
+
+
+def test_y_index_returns_neighbours_in_original_order():
+    index = YIndex([500.0, 0.0, 480.0, 900.0, 520.0])
+    assert index.near(500, 25) == [0, 2, 4]
+    assert index.near(100, 50) == []
+    context = ProgramPolicyContext(
+        text_blocks=[TextBlock(f"b{y}", 0, y, 10, 10) for y in (700.0, 100.0, 300.0)],
+        label_blocks=[],
+        viewport={"width": 1366, "height": 768},
+    )
+    assert [block.text for block in context.texts_near(250, 200)] == ["b100.0", "b300.0"]
+
+
+def test_model_benchmark_reports_every_case():
+    results = run_model_benchmark(pages=20, ads_per_page=3, blocks_per_page=20, repeat=1)
+    assert set(results["results"]) == {
+        "ad_element.validated",
+        "ad_element.model_construct",
+        "ad_rects.from_elements",
+        "geometry.models",
+        "geometry.ad_rects",
+        "nearby_text.scan",
+        "nearby_text.y_index",
+    }
+    rows = results["results"]
+    assert rows["ad_rects.from_elements"]["bytes_per_item"] < (
+        rows["ad_element.validated"]["bytes_per_item"]
+    )
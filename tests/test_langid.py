@@ -0,0 +1,48 @@
+from gpvb.detect.detectors import detect_language_issue
+from gpvb.detect.langid import LanguageGuess, LanguageIdentifier, language_sample
+from gpvb.models import PageResult
+
+ENGLISH = "The quick brown fox jumps over the lazy dog while the farmer watches. " * 40
+FRENCH = "Le renard brun rapide saute par-dessus le chien paresseux pendant que. " * 40
+
+
+def test_language_sample_is_bounded_and_spans_the_text():
+    text = "start " * 400 + "middle " * 400 + "finish " * 400
+    sample = language_sample(text, max_chars=600)
+    assert len(sample) <= 600
+    assert "start" in sample and "middle" in sample and "finish" in sample
+    assert language_sample("short text", max_chars=600) == "short text"
+
+
+def test_identify_is_deterministic_and_cached():
+    first = LanguageIdentifier()
+    second = LanguageIdentifier()
+    guess = first.identify(ENGLISH)
+    assert guess.language == "en" and guess.confidence > 0.9
+    assert second.identify(ENGLISH) == guess
+    assert first.identify(ENGLISH) == guess
+    assert first.hits == 1
+    assert first.identify("") == LanguageGuess("", 0.0)
+
+
+def test_identify_many_classifies_each_distinct_sample_once():
+    identifier = LanguageIdentifier()
+    guesses = identifier.identify_many([ENGLISH, FRENCH, ENGLISH, ""])
+    assert [guess.language for guess in guesses] == ["en", "fr", "en", ""]
+    assert identifier.misses == 2
+    assert identifier.identify(FRENCH).language == "fr"
+    assert identifier.hits == 1
+
+
+def test_language_issue_ignores_low_confidence_mismatch():
+    page = PageResult(
+        url="https://example.test/",
+        final_url="https://example.test/",
+        status=200,
+        html="<html lang='de'></html>",
+        text=ENGLISH,
+    )
+    weak = detect_language_issue(page, language=LanguageGuess("en", 0.4))
+    assert weak == []
+    strong = detect_language_issue(page, language=LanguageGuess("en", 0.99))
+    assert strong[0].evidence == {"html_lang": "de", "detected": "en", "confidence": 0.99}
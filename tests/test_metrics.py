@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+from gpvb.metrics import Histogram, MetricsRecorder, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = [0.1 * step for step in range(1, 11)]
+    assert percentile(values, 50) == pytest.approx(0.5)
+    assert percentile(values, 95) == pytest.approx(1.0)
+    assert percentile([], 95) == 0.0
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 0.5, 3.0):
+        hist.observe(value)
+    assert hist.cumulative() == [("0.01", 1), ("0.1", 3), ("1.0", 4), ("+Inf", 5)]
+    assert hist.summary()["count"] == 5
+    assert hist.summary()["max_ms"] == 3000.0
+
+
+def test_histogram_memory_is_bounded_by_the_reservoir():
+    hist = Histogram(reservoir_size=100)
+    for step in range(10_000):
+        hist.observe(step / 10_000)
+    assert len(hist.samples) == 100
+    assert hist.count == 10_000 and hist.summary()["max_ms"] == pytest.approx(999.9)
+    assert hist.summary()["p50_ms"] == pytest.approx(500, abs=150)
+
+    other = Histogram(reservoir_size=100)
+    for _ in range(30_000):
+        other.observe(2.0)
+    hist.merge(other)
+    assert len(hist.samples) == 100 and hist.count == 40_000
+    # Three quarters of the observations are 2s, so the median comes from ``other``.
+    assert hist.summary()["p50_ms"] == 2000.0
+
+
+def test_recorder_ranks_slowest_urls_with_stage_breakdown():
+    metrics = MetricsRecorder(workers=2)
+    metrics.record("render", 0.2, "https://a.test/")
+    metrics.record("page_total", 0.3, "https://a.test/")
+    metrics.record("render", 1.0, "https://b.test/")
+    metrics.record("page_total", 1.5, "https://b.test/")
+    slowest = metrics.slowest_urls(1)
+    assert slowest == [
+        {"url": "https://b.test/", "total_ms": 1500.0, "stages_ms": {"render": 1000.0}}
+    ]
+
+
+def test_detector_summary_includes_skips_and_cost_class():
+    metrics = MetricsRecorder()
+    with metrics.detector_span("thin_content", "cheap"):
+        pass
+    metrics.detector_skipped("ugc_risk", "cheap")
+    metrics.detector_skipped("ugc_risk")
+    detectors = metrics.summary()["detectors"]
+    assert detectors["thin_content"]["count"] == 1
+    assert detectors["ugc_risk"] == {**Histogram().summary(), "skipped": 2, "cost": "cheap"}
+    assert 'gpvb_detector_skipped_total{detector="ugc_risk"} 2' in metrics.to_openmetrics()
+
+
+@pytest.mark.asyncio
+async def test_monitor_samples_loop_lag_and_queue_depth():
+    metrics = MetricsRecorder()
+    task = asyncio.create_task(metrics.monitor(interval_s=0.01, queue_depth=lambda: 7))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert metrics.event_loop_lag.count >= 1
+    assert metrics.gauges["queue_depth"].max == 7
+
+
+def test_write_emits_json_and_openmetrics(tmp_path):
+    metrics = MetricsRecorder(workers=1)
+    with metrics.span("render", "https://a.test/"):
+        pass
+    with metrics.detector_span("dead_end"):
+        pass
+    metrics.incr("pages_rendered")
+    metrics.add_worker_busy(0.01)
+    metrics.finish()
+    metrics.write(tmp_path, slowest=5)
+
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["stages"]["render"]["count"] == 1
+    assert data["detectors"]["dead_end"]["count"] == 1
+    assert data["histograms"]["stages"]["render"]["buckets"]["+Inf"] == 1
+    assert data["slowest_urls"][0]["url"] == "https://a.test/"
+
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert prom.endswith("# EOF\n")
+    assert 'gpvb_stage_duration_seconds_bucket{stage="render",le="+Inf"} 1' in prom
+    assert "gpvb_detector_duration_seconds_count{detector=\"dead_end\"} 1" in prom
+    assert "gpvb_pages_rendered_total 1.0" in prom
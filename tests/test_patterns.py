@@ -0,0 +1,144 @@
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.crawl.patterns import PatternSampler, estimate_patterns, wilson_interval
+from gpvb.models import CrawlConfig, Finding, PageResult, Severity
+
+
+def test_sampler_groups_urls_into_patterns_and_admits_k_each():
+    sampler = PatternSampler(per_pattern=2, fan_out=5)
+    admitted = [
+        sampler.admit(url)
+        for url in [
+            "https://x.test/product/101",
+            "https://x.test/product/102",
+            "https://x.test/product/103",
+            "https://x.test/listing/red-bike-2019",
+            "https://x.test/search?q=a&page=2",
+            "https://x.test/search?page=3&q=b",
+            "https://x.test/search?q=c",
+        ]
+    ]
+    assert admitted == [
+        ("/product/{id}", True),
+        ("/product/{id}", True),
+        ("/product/{id}", False),
+        ("/listing/{slug}", True),
+        ("/search?page&q", True),
+        ("/search?page&q", True),
+        ("/search?q", True),
+    ]
+    assert sampler.admit("https://x.test/product/101") == ("/product/{id}", True)
+    assert sampler.discovered()["/product/{id}"] == 3
+
+    for name in ["red", "green", "blue", "black", "white"]:
+        sampler.admit(f"https://x.test/colour/{name}")
+    assert sampler.pattern("https://x.test/colour/purple") == "/colour/{slug}"
+
+
+def test_wilson_interval_bounds():
+    low, high = wilson_interval(0, 10)
+    assert low == 0.0 and 0.27 < high < 0.28
+    low, high = wilson_interval(5, 10)
+    assert round(low, 3) == 0.237 and round(high, 3) == 0.763
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def _page(url: str, pattern: str, detectors):
+    page = PageResult(
+        url=url,
+        final_url=url,
+        status=200,
+        html="<html><body><div><p>x</p></div></body></html>",
+        text="x",
+        url_pattern=pattern,
+    )
+    page.findings = [
+        Finding(detector=detector, severity=Severity.low, message="m") for detector in detectors
+    ]
+    return page
+
+
+def test_estimate_patterns_extrapolates_finding_rates():
+    pages = [
+        _page("https://x.test/p/1", "/p/{id}", ["thin_content"]),
+        _page("https://x.test/p/2", "/p/{id}", ["thin_content", "ugc_risk"]),
+        _page("https://x.test/p/3", "/p/{id}", []),
+        _page("https://x.test/p/4", "/p/{id}", []),
+    ]
+    [estimate] = estimate_patterns(pages, {"/p/{id}": 1000})
+    assert estimate.sampled == 4 and estimate.cohesion == 1.0
+    thin = estimate.findings["thin_content"]
+    assert thin.rate == 0.5 and thin.estimated_pages == 500
+    assert thin.estimated_low < 500 < thin.estimated_high <= 1000
+    assert estimate.findings["ugc_risk"].estimated_low >= 1
+
+
+class RecordingPool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.render_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        self.render_calls.append(url)
+        html = "<html lang='en'><body><p>Short product blurb.</p></body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_audit_samples_k_pages_per_pattern(tmp_path, monkeypatch):
+    paths = [f"/product/{index}" for index in range(20)] + ["/about", "/contact"]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        if request.url.path not in paths:
+            return httpx.Response(404, text="")
+        return httpx.Response(200, html="<html><body><p>Short product blurb.</p></body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    created = []
+
+    def factory(*args, **kwargs):
+        created.append(RecordingPool(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        sample_per_pattern=3,
+        max_pages=5,
+    )
+    report = await audit.audit_site(config)
+
+    rendered = sorted(page.url for page in report.pages)
+    assert len(rendered) == 5
+    assert {"https://example.test/about", "https://example.test/contact"} <= set(rendered)
+    estimates = {estimate.pattern: estimate for estimate in report.url_patterns}
+    product = estimates["/product/{id}"]
+    assert product.discovered == 20 and product.sampled == 3
+    assert product.findings["thin_content"].estimated_pages == 20
+    assert report.metrics["counters"]["pattern_sampled_out"] == 17
+    assert "URL Patterns" in (tmp_path / "report.html").read_text()
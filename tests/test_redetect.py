@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from gpvb.detect.registry import default_registry
+from gpvb.models import CrawlConfig, Finding, PageResult, Severity
+from gpvb.redetect import redetect_run
+from gpvb.snapshots import SNAPSHOT_FILE, PageSnapshot, SnapshotStore, new_run
+
+
+def _sentinel(detector: str) -> Finding:
+    return Finding(detector=detector, severity=Severity.low, message="from the original run")
+
+
+def _seed_run(tmp_path, stale: str = "thin_content") -> str:
+    config = CrawlConfig(
+        site="https://example.test/", out_dir=str(tmp_path), template_min_pages=0
+    )
+    run = new_run(config.site, config.model_dump(mode="json"))
+    run.detector_versions = {spec.id: spec.version for spec in default_registry()}
+    run.detector_versions[stale] = "0"
+    run.site_facts = {"privacy_found": True, "ads_txt_status": 200, "ads_txt_lines": 1}
+    snapshots = []
+    for index in range(4):
+        url = f"https://example.test/{index}"
+        page = PageResult(
+            url=url,
+            final_url=url,
+            status=200,
+            html="<html lang='en'><body><p>short page</p></body></html>",
+            text="short page",
+        )
+        findings = {
+            "thin_content": [_sentinel("stale_thin_content")],
+            "ads_vs_content": [_sentinel("kept_ads_vs_content")],
+        }
+        snapshots.append(PageSnapshot.capture(page, {"overlays": []}, {}, findings))
+    skipped = PageResult(
+        url="https://example.test/broken",
+        final_url="https://example.test/broken",
+        status=0,
+        html="",
+        text="",
+        skipped_reason="render_failed: timeout",
+    )
+    snapshots.append(PageSnapshot.capture(skipped))
+    store = SnapshotStore(tmp_path / SNAPSHOT_FILE)
+    store.save_run(run)
+    store.save_snapshots(run.id, snapshots)
+    return run.id
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_redetect_reruns_only_changed_detectors(tmp_path, workers):
+    run_id = _seed_run(tmp_path)
+    report = redetect_run(tmp_path, run_id=run_id, workers=workers)
+
+    assert report.run_id == run_id
+    assert [page.url for page in report.pages][-1] == "https://example.test/broken"
+    for page in report.pages[:4]:
+        detectors = [finding.detector for finding in page.findings]
+        assert "stale_thin_content" not in detectors
+        assert "thin_content" in detectors
+        assert "kept_ads_vs_content" in detectors
+    assert report.metrics["detectors"]["thin_content"]["count"] == 4
+    assert "ads_vs_content" not in report.metrics["detectors"]
+    assert json.loads((tmp_path / "findings.json").read_text())["run_id"] == run_id
+
+    store = SnapshotStore(tmp_path / SNAPSHOT_FILE)
+    assert store.load_run(run_id).detector_versions["thin_content"] == "1"
+    again = redetect_run(tmp_path, run_id="latest", workers=workers)
+    assert "thin_content" not in again.metrics["detectors"]
+
+
+def test_redetect_requires_snapshots(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        redetect_run(tmp_path)
+    SnapshotStore(tmp_path / SNAPSHOT_FILE)
+    with pytest.raises(KeyError):
+        redetect_run(tmp_path, run_id="missing")
@@ -0,0 +1,166 @@
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.crawl.resolve import canonical_link, resolve_url
+from gpvb.models import CrawlConfig
+
+BODY = "<p>" + " ".join(["plain article words"] * 60) + "</p>"
+
+
+def test_canonical_link_is_resolved_against_the_page():
+    head = "<head><link href='/a?x=1' rel=\"canonical\"><link rel=stylesheet href=s.css></head>"
+    assert canonical_link(head, "https://example.test/b/") == "https://example.test/a?x=1"
+    assert canonical_link("<link rel='icon' href='/f.ico'>", "https://example.test/") is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_url_follows_redirects_and_reads_only_the_head():
+    seen_ranges = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen_ranges.append(request.headers.get("range"))
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "/new"})
+        head = "<html><head><link rel='canonical' href='/new'></head>"
+        return httpx.Response(200, html=head + "<body>" + "x" * 100_000 + "</body></html>")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        resolved = await resolve_url(client, "https://example.test/old", max_bytes=1024)
+    assert resolved.final_url == "https://example.test/new"
+    assert resolved.redirects == ["https://example.test/old"]
+    assert resolved.canonical == "https://example.test/new"
+    assert resolved.is_html and resolved.alias_reason() == "redirect"
+    assert seen_ranges == ["bytes=0-1023", "bytes=0-1023"]
+
+
+class RecordingPool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.render_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        self.render_calls.append(url)
+        html = f"<html lang='en'><body>{BODY}</body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_audit_collapses_aliases_before_rendering(tmp_path, monkeypatch):
+    paths = ["/old", "/new", "/dup", "/file.pdf"]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        if path == "/old":
+            return httpx.Response(302, headers={"Location": "/new"})
+        if path == "/new":
+            return httpx.Response(200, html=f"<html><body>{BODY}</body></html>")
+        if path == "/dup":
+            head = "<head><link rel='canonical' href='https://example.test/new'></head>"
+            return httpx.Response(200, html=f"<html>{head}<body>{BODY}</body></html>")
+        if path == "/file.pdf":
+            pdf = {"Content-Type": "application/pdf"}
+            return httpx.Response(200, content=b"%PDF-1.4", headers=pdf)
+        return httpx.Response(404, text="")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    created = []
+
+    def factory(*args, **kwargs):
+        created.append(RecordingPool(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        concurrency=1,
+        rate_limit_ms=0,
+        list_skipped=False,
+    )
+    report = await audit.audit_site(config)
+
+    assert created[0].render_calls == ["https://example.test/new"]
+    by_url = {page.url: page for page in report.pages}
+    assert set(by_url) == {"https://example.test/new", "https://example.test/file.pdf"}
+    assert by_url["https://example.test/file.pdf"].skipped_reason == "non_html: application/pdf"
+    assert {(alias.url, alias.target, alias.reason) for alias in report.aliases} == {
+        ("https://example.test/old", "https://example.test/new", "redirect"),
+        ("https://example.test/dup", "https://example.test/new", "canonical"),
+    }
+    assert report.metrics["counters"]["resolve_aliases"] == 2
+    assert "URL Aliases" in (tmp_path / "report.html").read_text()
+
+
+@pytest.mark.asyncio
+async def test_alias_targets_pass_the_same_filters_as_crawled_urls(tmp_path, monkeypatch):
+    paths = ["/old", "/dup", "/go"]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        if path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /private\n")
+        if path == "/old":
+            return httpx.Response(302, headers={"Location": "/new"})
+        if path == "/go":
+            return httpx.Response(302, headers={"Location": "/private/page"})
+        if path == "/dup":
+            head = "<head><link rel='canonical' href='https://example.test/new'></head>"
+            return httpx.Response(200, html=f"<html>{head}<body>{BODY}</body></html>")
+        return httpx.Response(200, html=f"<html><body>{BODY}</body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    created = []
+
+    def factory(*args, **kwargs):
+        created.append(RecordingPool(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        concurrency=1,
+        rate_limit_ms=0,
+        list_skipped=False,
+        exclude_regex="/new$",
+    )
+    report = await audit.audit_site(config)
+
+    assert created[0].render_calls == []
+    assert {(alias.url, alias.target) for alias in report.aliases} == {
+        ("https://example.test/old", "https://example.test/new"),
+        ("https://example.test/dup", "https://example.test/new"),
+        ("https://example.test/go", "https://example.test/private/page"),
+    }
+    assert report.metrics["counters"]["resolve_targets_filtered"] == 3
@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.detect.program_policy.malware_risk import MALWARE_FORCED_DOWNLOAD
+from gpvb.detect.program_policy.risk import (
+    RiskTracker,
+    StopCondition,
+    calculate_account_risk_score,
+)
+from gpvb.detect.program_policy.traffic_source_abuse import TRAFFIC_SOURCE_INCENTIVIZED
+from gpvb.models import CrawlConfig, Finding, Severity
+
+
+def test_stop_conditions_parse_and_trigger_incrementally():
+    assert StopCondition.parse("score>=60") == StopCondition(min_score=60)
+    assert StopCondition.parse("severe, critical") == StopCondition(71, 1)
+    assert StopCondition.parse("critical>=2") == StopCondition(min_critical_detectors=2)
+    # Combined tokens keep the lowest threshold of each kind, whatever their order.
+    assert StopCondition.parse("score>=40,severe") == StopCondition(min_score=40)
+    assert StopCondition.parse("severe,score>=40") == StopCondition(min_score=40)
+    assert StopCondition.parse("critical,critical>=2") == StopCondition(min_critical_detectors=1)
+    for bad in ("", "score>=0", "score>50", "sometimes"):
+        with pytest.raises(ValueError):
+            StopCondition.parse(bad)
+
+    tracker = RiskTracker()
+    either = StopCondition.parse("score>=40,critical>=2")
+    tracker.add([Finding(detector="thin_content", severity=Severity.high)])
+    assert either.reason(tracker) is None
+    tracker.add([MALWARE_FORCED_DOWNLOAD.finding(), MALWARE_FORCED_DOWNLOAD.finding()])
+    assert tracker.score == 75 and tracker.critical_detectors == {"malware_forced_download"}
+    assert either.reason(tracker) == "score>=40"
+    assert StopCondition.parse("critical>=2").reason(tracker) is None
+    tracker.add([TRAFFIC_SOURCE_INCENTIVIZED.finding()])
+    assert StopCondition.parse("critical>=2").reason(tracker) == "critical>=2"
+    assert StopCondition.parse("critical").reason(tracker) == "critical"
+
+
+def test_account_risk_score_bands():
+    low = Finding(detector="x", severity=Severity.low)
+    assert calculate_account_risk_score([low] * 15) == {"score": 15, "label": "Low Risk"}
+    high = Finding(detector="x", severity=Severity.high)
+    assert calculate_account_risk_score([high] * 4)["label"] == "High Risk"
+    assert calculate_account_risk_score([high] * 5)["label"].startswith("Severe Risk")
+    assert calculate_account_risk_score([high] * 20)["score"] == 100
+
+
+class MalwarePool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.cancelled = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        html = "<html lang='en'><body><p>Plenty of page text here.</p></body></html>"
+        if url.endswith("/download"):
+            await asyncio.sleep(0.05)
+            html = "<html><script>window.location = 'https://x.test/setup.exe'</script></html>"
+        else:
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                self.cancelled.append(url)
+                raise
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_audit_stops_on_critical_finding_and_cancels_in_flight_renders(
+    tmp_path, monkeypatch
+):
+    paths = ["/slow/1", "/download", "/slow/2"] + [f"/later/{index}" for index in range(20)]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(200, html="<html><body><p>Some page text.</p></body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    pools = []
+
+    def factory(*args, **kwargs):
+        pools.append(MalwarePool(*args, **kwargs))
+        return pools[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        concurrency=3,
+        stop_when="critical",
+    )
+    report = await asyncio.wait_for(audit.audit_site(config), 10)
+
+    assert [page.url for page in report.pages] == ["https://example.test/download"]
+    assert sorted(pools[0].cancelled) == [
+        "https://example.test/slow/1",
+        "https://example.test/slow/2",
+    ]
+    stopped = report.early_termination
+    assert stopped["reason"] == "critical"
+    assert stopped["critical_detectors"] == ["malware_forced_download"]
+    assert stopped["cancelled"] == 2 and stopped["dropped"] == 20
+    assert "Stopped early" in (tmp_path / "report.html").read_text()
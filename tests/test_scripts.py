@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from gpvb.detect.program_policy.invalid_traffic_signals import detect_invalid_traffic_signals
+from gpvb.detect.program_policy.context import ProgramPolicyContext
+from gpvb.detect.program_policy.traffic_source_abuse import detect_traffic_source_abuse
+from gpvb.detect.scripts import MetaRefresh, scan_scripts, script_facts
+from gpvb.models import PageResult
+
+
+def _page(html):
+    return PageResult(
+        url="https://x.test/", final_url="https://x.test/", status=200, html=html, text=""
+    )
+
+
+def _context():
+    return ProgramPolicyContext([], [], {"width": 1366, "height": 768})
+
+
+def test_meta_refresh_tags_are_parsed_once():
+    facts = scan_scripts(
+        '<head><META HTTP-EQUIV="Refresh" content="3; url=https://x.test/app.apk">'
+        "<meta name=description content='refresh daily'></head>"
+    )
+    assert facts.meta_refresh == [MetaRefresh(3, "https://x.test/app.apk")]
+    assert facts.fast_refresh
+    assert facts.refresh_download
+
+
+def test_timer_reload_sees_callbacks_with_nested_calls():
+    def reloads(script):
+        return scan_scripts(f"<script>{script}</script>").timer_reload
+
+    assert reloads("setTimeout(function(){location.reload()},3000);")
+    assert reloads("setInterval(() => location.reload(), 1000)")
+    assert not reloads("setInterval(() => tick(), 1000); reload()")
+
+
+def test_triggers_do_not_pair_across_scripts():
+    facts = scan_scripts(
+        "<script>window.onload = init;</script><p>location</p>"
+        "<script>var location_hint = 1;</script>"
+    )
+    assert not facts.load_redirect
+    facts = scan_scripts(
+        "<script>window.addEventListener('load', function(){window.location='/x'})</script>"
+    )
+    assert facts.load_redirect
+    assert scan_scripts('<body onload="location.href=\'/go\'">').load_redirect
+
+
+def test_download_redirect_stays_inside_the_assigned_string():
+    assert scan_scripts(
+        "<script>window.location = 'https://x.test/setup.exe';</script>"
+    ).download_redirect
+    assert not scan_scripts(
+        "<script>window.location = '/home'; var file = 'setup.exe';</script>"
+    ).download_redirect
+
+
+def test_detectors_share_the_cached_scan():
+    page = _page("<script>setTimeout(function(){location.replace('/x')},100)</script>")
+    facts = script_facts(page)
+    assert script_facts(page) is facts
+    findings = detect_traffic_source_abuse(page)
+    assert [finding.evidence["location_replace"] for finding in findings] == [True]
+    assert detect_invalid_traffic_signals(page, _context()) == []
+    page.html = "<meta http-equiv=refresh content=0>"
+    assert script_facts(page) is not facts
+    assert detect_invalid_traffic_signals(page, _context())[0].evidence == {
+        "meta_refresh": True,
+        "js_reload": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<script>" + "setTimeout(" * 50000 + "</script>",
+        "<script>" + "setInterval(function(){" * 20000 + "</script>",
+        "<script>window.onload=" + "a" * 500000 + "</script>",
+        "<script>" + "onload=" * 50000 + "</script>",
+        "<script>" + 'window.location="' + "a" * 200000 + "</script>",
+        "<script>" + 'window.location="x' * 30000 + "</script>",
+        "<meta http-equiv=refresh " * 50000,
+        "<meta " + "content=" * 100000,
+        "<script>" * 50000,
+    ],
+    ids=lambda html: html[:24],
+)
+def test_adversarial_markup_scans_in_linear_time(html):
+    started = time.perf_counter()
+    scan_scripts(html)
+    assert time.perf_counter() - started < 2.0
@@ -1,4 +1,5 @@
-from gpvb.detect.text import cluster_simhash
+from gpvb.detect.text import cluster_simhash, simhash, text_profile
+from gpvb.models import PageResult
 
 
 def test_cluster_simhash_groups_similar():
@@ -13,3 +14,35 @@ def test_cluster_simhash_groups_similar():
     grouped_urls = clusters[0][0]
     assert "https://a" in grouped_urls
     assert "https://b" in grouped_urls
+
+
+def test_simhash_is_stable_across_processes():
+    import subprocess
+    import sys
+
+    code = "from gpvb.detect.text import simhash; print(simhash('stable fingerprint text'))"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        for _ in range(2)
+    }
+    assert len(outputs) == 1
+    assert int(outputs.pop()) == simhash("stable fingerprint text")
+
+
+def test_text_profile_is_built_once_and_refreshed_when_text_changes():
+    page = PageResult(
+        url="https://a", final_url="https://a", status=200, html="", text="One two. One two."
+    )
+    profile = text_profile(page)
+    assert profile.word_count == 4
+    assert profile.tokens == ("one", "two", "one", "two")
+    assert profile.frequencies == {"one": 2, "two": 2}
+    assert profile.entropy == 1.0
+    assert profile.sentence_count == 2 and profile.unique_sentence_ratio == 0.5
+    assert profile.fingerprint == simhash(page.text)
+    assert text_profile(page) is profile
+
+    page.text = "Something else entirely"
+    assert text_profile(page).lower == "something else entirely"
@@ -1,4 +1,4 @@
-from gpvb.crawl.sitemap import parse_sitemap
+from gpvb.crawl.sitemap import SitemapEntry, parse_sitemap, parse_sitemap_entries
 
 
 def test_parse_sitemap_urlset():
@@ -18,3 +18,17 @@ def test_parse_sitemap_index():
     </sitemapindex>
     """
     assert parse_sitemap(xml) == ["https://example.com/sitemap-1.xml"]
+
+
+def test_parse_sitemap_entries_keeps_priority_and_lastmod():
+    xml = """
+    <urlset>
+      <url><loc>https://example.com/a</loc><priority>0.9</priority>
+        <lastmod>2024-05-01</lastmod></url>
+      <url><loc>https://example.com/b</loc><priority>high</priority></url>
+    </urlset>
+    """
+    assert parse_sitemap_entries(xml) == [
+        SitemapEntry("https://example.com/a", priority=0.9, lastmod="2024-05-01"),
+        SitemapEntry("https://example.com/b"),
+    ]
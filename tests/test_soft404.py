@@ -0,0 +1,115 @@
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.crawl.soft404 import NotFoundProfile, content_key, not_found_reason, page_title
+from gpvb.models import CrawlConfig
+
+TEMPLATE = (
+    "<html><head><title>{title}</title></head><body><nav><a href='/'>Home</a>"
+    "<a href='/about'>About</a></nav><main>{body}</main><footer>Example site</footer>"
+    "</body></html>"
+)
+NOT_FOUND = TEMPLATE.format(
+    title="Oops | Example", body="<h1>Sorry, we could not find {path}</h1><p>Try the home page.</p>"
+)
+ARTICLE = TEMPLATE.format(
+    title="Article {n} | Example",
+    body="<h1>Article {n}</h1>" + "<p>Original reporting about gardens and rivers {n}.</p>" * 30,
+)
+
+
+def test_page_title_is_normalized():
+    assert page_title("<title>\n  Oops &amp; Co </title>") == "oops & co"
+    assert page_title("<p>untitled</p>") == ""
+
+
+def test_soft_404_matches_probe_status_title_and_template():
+    token = "gpvb-not-found-abc123"
+    profile = NotFoundProfile.from_response(200, NOT_FOUND.replace("{path}", f"/{token}"), token)
+    assert not_found_reason(200, NOT_FOUND.replace("{path}", "/old/post"), profile) == "soft_404"
+    assert not_found_reason(200, ARTICLE.replace("{n}", "1"), profile) is None
+    assert not_found_reason(301, NOT_FOUND, profile) is None
+    assert not_found_reason(404, "", None) == "not_found: 404"
+
+
+def test_content_key_ignores_the_page_url_and_whitespace():
+    first = content_key(
+        "<p>No results for /search/a</p>", "No results", ["https://x.test/search/a"]
+    )
+    second = content_key(
+        "<p>No results  for\n/search/b</p>", "No results", ["https://x.test/search/b"]
+    )
+    assert first == second
+    assert content_key("<p>a</p>", "a") != content_key("<p>b</p>", "b")
+
+
+class TemplatePool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        path = httpx.URL(url).path
+        if path.startswith("/gone"):
+            html = NOT_FOUND.replace("{path}", path)
+        elif path.startswith("/login"):
+            html = TEMPLATE.format(title="Sign in", body="<form>Please sign in</form>")
+        else:
+            html = ARTICLE.replace("{n}", path.rsplit("/", 1)[-1])
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_audit_skips_soft_404s_and_reuses_findings_for_identical_pages(
+    tmp_path, monkeypatch
+):
+    paths = ["/post/1", "/post/2", "/gone/a", "/gone/b", "/login/x", "/login/y", "/login/z"]
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in paths
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        return httpx.Response(200, html=NOT_FOUND.replace("{path}", request.url.path))
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    monkeypatch.setattr(audit, "BrowserPool", TemplatePool)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        pre_resolve=False,
+        concurrency=1,
+        template_min_pages=0,
+    )
+    report = await audit.audit_site(config)
+
+    pages = {page.url.rsplit("example.test", 1)[1]: page for page in report.pages}
+    assert pages["/gone/a"].skipped_reason == pages["/gone/b"].skipped_reason == "soft_404"
+    assert pages["/post/1"].skipped_reason is None
+    assert pages["/post/2"].duplicate_of is None
+    login = [pages[path] for path in ("/login/x", "/login/y", "/login/z")]
+    assert [page.duplicate_of for page in login] == [None] + ["https://example.test/login/x"] * 2
+    assert [page.findings for page in login[1:]] == [login[0].findings] * 2
+    assert login[0].findings
+    counters = report.metrics["counters"]
+    # /gone/b is a copy of /gone/a once the path is blanked, so it is not classified again.
+    assert counters["exact_duplicates"] == 3 and counters["not_found_skipped"] == 1
+    assert report.metrics["detectors"]["thin_content"]["count"] == 3
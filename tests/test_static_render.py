@@ -0,0 +1,90 @@
+import httpx
+import pytest
+
+from gpvb import audit
+from gpvb.models import CrawlConfig
+from gpvb.render.static import escalation_reason
+
+ARTICLE = "<p>" + " ".join(["plain article words"] * 60) + "</p>"
+
+
+def test_escalation_reasons():
+    assert escalation_reason(f"<html><body>{ARTICLE}</body></html>") is None
+    assert escalation_reason("<ins class='adsbygoogle'></ins>" + ARTICLE) == "ad_markers"
+    shell = "<html><body><div id='root'></div><script src='/app.js'></script></body></html>"
+    assert escalation_reason(shell) == "client_rendered"
+    reload = f"<body>{ARTICLE}<script>setTimeout(function(){{location.reload()}},3e4)</script>"
+    assert escalation_reason(reload) == "suspicious_script"
+
+
+class RecordingPool:
+    def __init__(self, concurrency, user_agent, **kwargs) -> None:
+        self.stats = {"launches": 1, "recycles": 0, "crashes": 0}
+        self.render_calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    async def render_page(self, url, viewport, timeout_ms=30000, screenshot_path=None):
+        self.render_calls.append(url)
+        html = f"<html lang='en'><body><ins class='adsbygoogle'></ins>{ARTICLE}</body></html>"
+        extras = {"headers": {}, "overlays": [], "text_blocks": [], "label_blocks": []}
+        return url, 200, html, "", {}, [], extras
+
+    async def collect_mobile_flags(self, url, viewport):
+        return {"sticky_elements": True}
+
+
+@pytest.mark.asyncio
+async def test_tiered_mode_escalates_only_pages_that_need_a_browser(tmp_path, monkeypatch):
+    pages = {
+        "/plain": f"<html lang='en'><body>{ARTICLE}</body></html>",
+        "/ads": f"<html lang='en'><body><ins class='adsbygoogle'></ins>{ARTICLE}</body></html>",
+    }
+    sitemap = "<urlset>" + "".join(
+        f"<url><loc>https://example.test{path}</loc></url>" for path in pages
+    ) + "</urlset>"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/sitemap.xml":
+            return httpx.Response(200, text=sitemap)
+        if request.url.path in pages:
+            return httpx.Response(200, html=pages[request.url.path])
+        return httpx.Response(404, text="")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        audit.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    created = []
+
+    def factory(*args, **kwargs):
+        created.append(RecordingPool(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(audit, "BrowserPool", factory)
+    config = CrawlConfig(
+        site="https://example.test",
+        out_dir=str(tmp_path),
+        rate_limit_ms=0,
+        list_skipped=False,
+        render_mode="tiered",
+    )
+    report = await audit.audit_site(config)
+    by_url = {page.url: page for page in report.pages}
+
+    assert created[0].render_calls == ["https://example.test/ads"]
+    assert by_url["https://example.test/plain"].render_tier == "static"
+    assert by_url["https://example.test/plain"].screenshot_path is None
+    assert by_url["https://example.test/ads"].render_tier == "browser"
+    detectors = {finding.detector for finding in by_url["https://example.test/ads"].findings}
+    assert "abusive_experience" in detectors
+    counters = report.metrics["counters"]
+    assert counters["pages_static"] == 1
+    assert counters["escalated_ad_markers"] == 1
+    assert "escalation rate" in (tmp_path / "report.html").read_text()
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from gpvb.bench.text_modes import load_fixture_documents, run_text_benchmark
+from gpvb.detect.text import extract_main_text, extract_text
+
+ARTICLE = " ".join(["Readers learn how the garden grows through every season."] * 5)
+PAGE = f"""
+<html><body>
+  <nav><a href="/">Home</a> <a href="/about">About the publisher and its many sections</a></nav>
+  <div id="wrap">
+    <article><h1>Garden notes</h1><p>{ARTICLE}</p><p>{ARTICLE}</p></article>
+    <aside><p>Related links and other sidebar promotions for readers to browse.</p></aside>
+  </div>
+  <footer><p>Copyright and contact details for the whole website footer.</p></footer>
+  <script>var tracking = "do not include";</script>
+</body></html>
+"""
+
+
+def test_main_text_keeps_the_article_and_drops_boilerplate():
+    text = extract_main_text(PAGE)
+    assert text.startswith("Garden notes Readers learn")
+    assert "sidebar" not in text and "Copyright" not in text and "tracking" not in text
+    assert extract_main_text("") == ""
+
+
+def test_extract_text_reuses_browser_text_and_falls_back_to_main():
+    assert extract_text(PAGE, "innertext", inner_text="Body\n  text ") == "Body text"
+    assert extract_text(PAGE, "browser_main", main_text="Main\ntext") == "Main text"
+    assert extract_text(PAGE, "innertext") == extract_main_text(PAGE)
+    assert "Garden notes" in extract_text(PAGE, "readability")
+
+
+def test_text_benchmark_scores_modes_against_readability():
+    documents = load_fixture_documents(Path("tests/fixtures"))
+    results = run_text_benchmark(documents, repeat=1)
+    assert set(results["results"]) == {"main", "readability"}
+    assert results["skipped"] == ["innertext", "browser_main"]
+    assert results["results"]["readability"]["agreement"] == 1.0
+    assert results["results"]["main"]["recall"] > 0.8